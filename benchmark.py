@@ -0,0 +1,135 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import simulacion
+
+TAMANOS = (100, 1000, 10000)
+# Subconjunto de TAMANOS: la suite corta se compara contra la misma base
+TAMANOS_RAPIDOS = (100, 1000)
+MAX_PROCESOS_TICKS = 100
+SEMILLA = 2024
+QUANTUM = 20
+TOLERANCIA = 0.25
+# Por debajo de esto el ruido del reloj domina y el caso no se compara
+MIN_SEGUNDOS_COMPARABLES = 0.05
+
+def casos(tamanos, algoritmos, motores):
+    for procesos in tamanos:
+        for motor in motores:
+            for algoritmo in algoritmos:
+                if motor == 'ticks' and (algoritmo not in ('FIFO', 'RR') or procesos > MAX_PROCESOS_TICKS):
+                    continue
+                yield {'algoritmo': algoritmo, 'motor': motor, 'procesos': procesos}
+
+def clave(caso):
+    return f"{caso['algoritmo']}/{caso['motor']}/{caso['procesos']}"
+
+def medir(caso, repeticiones=3):
+    # La carga se genera fuera del tiempo medido; siempre la misma semilla
+    definiciones = list(simulacion.generar_carga(caso['procesos'], semilla=SEMILLA))
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = simulacion.simular(caso['algoritmo'], definiciones, QUANTUM, motor=caso['motor'])
+        transcurrido = time.perf_counter() - inicio
+        mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+    # Corrida aparte para la memoria: tracemalloc ralentiza y no debe afectar al tiempo
+    tracemalloc.start()
+    simulacion.simular(caso['algoritmo'], definiciones, QUANTUM, motor=caso['motor'])
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tiempo_total = resultado.metricas['tiempo_total']
+    return dict(caso,
+                slots=resultado.linea_tiempo.longitud,
+                tiempo_simulado=tiempo_total,
+                eventos=len(resultado.eventos),
+                segundos=mejor,
+                unidades_por_segundo=tiempo_total / mejor if mejor > 0 else None,
+                eventos_por_segundo=len(resultado.eventos) / mejor if mejor > 0 else None,
+                memoria_pico=pico,
+                motivo_fin=resultado.motivo_fin)
+
+def ejecutar_suite(tamanos=TAMANOS, algoritmos=simulacion.ALGORITMOS, motores=('eventos', 'ticks'), repeticiones=3, progreso=None):
+    resultados = []
+    for caso in casos(tamanos, algoritmos, motores):
+        medicion = medir(caso, repeticiones)
+        resultados.append(medicion)
+        if progreso:
+            progreso(medicion)
+    return {
+        'maquina': {'python': platform.python_version(), 'implementacion': platform.python_implementation(),
+                    'sistema': platform.platform(), 'procesador': platform.processor() or platform.machine()},
+        'semilla': SEMILLA,
+        'quantum': QUANTUM,
+        'resultados': resultados,
+    }
+
+def comparar(actual, base, tolerancia=TOLERANCIA):
+    # Devuelve los (clave, segundos base, segundos actuales, cociente) de los casos
+    # más lentos que la base y cuántos casos se pudieron comparar
+    previos = {clave(r): r for r in base['resultados']}
+    regresiones = []
+    comparados = 0
+    for r in actual['resultados']:
+        anterior = previos.get(clave(r))
+        if anterior is None or anterior['segundos'] < MIN_SEGUNDOS_COMPARABLES:
+            continue
+        comparados += 1
+        cociente = r['segundos'] / anterior['segundos']
+        if cociente > 1 + tolerancia:
+            regresiones.append((clave(r), anterior['segundos'], r['segundos'], cociente))
+    return regresiones, comparados
+
+def imprimir_medicion(m):
+    print(f"{m['algoritmo']:>13} {m['motor']:>7} {m['procesos']:>7} {m['slots']:>10} {m['segundos']:>9.3f}s"
+          f" {m['unidades_por_segundo'] or 0:>14.0f} {m['eventos_por_segundo'] or 0:>12.0f} {m['memoria_pico'] / 1e6:>9.1f}MB",
+          file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de simulación")
+    parser.add_argument('--tamanos', help="cantidades de procesos separadas por comas (por defecto 100,1000,10000)")
+    parser.add_argument('--rapido', action='store_true', help="suite corta (100 y 1000 procesos)")
+    parser.add_argument('--algoritmos', default=','.join(simulacion.ALGORITMOS))
+    parser.add_argument('--motores', default='eventos,ticks')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados (por defecto la salida estándar)")
+    parser.add_argument('--base', help="resultados previos contra los que comparar")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA, help="lentitud relativa admitida frente a la base")
+    args = parser.parse_args(argv)
+    if args.tamanos:
+        tamanos = [int(t) for t in args.tamanos.split(',') if t.strip()]
+    else:
+        tamanos = TAMANOS_RAPIDOS if args.rapido else TAMANOS
+    algoritmos = [a.strip().upper() for a in args.algoritmos.split(',') if a.strip()]
+    motores = [m.strip() for m in args.motores.split(',') if m.strip()]
+    print(f"{'ALGORITMO':>13} {'MOTOR':>7} {'PROCESOS':>7} {'SLOTS':>10} {'TIEMPO':>10} {'UNIDADES/S':>14}"
+          f" {'EVENTOS/S':>12} {'MEMORIA':>11}", file=sys.stderr)
+    actual = ejecutar_suite(tamanos, algoritmos, motores, args.repeticiones, progreso=imprimir_medicion)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, indent=1)
+    else:
+        json.dump(actual, sys.stdout, indent=1)
+        print()
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones, comparados = comparar(actual, base, args.tolerancia)
+        for nombre, antes, ahora, cociente in regresiones:
+            print(f"REGRESIÓN: {nombre}: {antes:.3f}s → {ahora:.3f}s (x{cociente:.2f})", file=sys.stderr)
+        if regresiones:
+            return 1
+        if not comparados:
+            # Sin casos en común (o todos demasiado cortos) no hay nada verificado
+            print(f"ERROR: ningún caso de la suite se pudo comparar con {args.base}", file=sys.stderr)
+            return 1
+        print(f"Sin regresiones frente a {args.base} ({comparados} casos comparados, tolerancia {args.tolerancia:.0%})",
+              file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
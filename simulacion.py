@@ -1,23 +1,52 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from itertools import accumulate, chain, count, islice
+from operator import attrgetter
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class Estado:
     
     NUEVO = "nuevo"
-    LISTO = "listo
+    LISTO = "listo"
     EJECUCION = "ejecutando"
     BLOQUEADO = "bloqueado"
     TERMINADO = "terminado"
     EN_SO = "en_so"
 
 class Proceso:
-    def __init__(self, nombre, tiempo_llegada, secuencia_ejecucion):
+    # Con __slots__ y la secuencia como tupla inmutable (nunca se modifica, así
+    # que no hace falta copiarla) cada proceso ocupa alrededor de un tercio que
+    # con __dict__ y listas copiadas: unos 210 bytes contra 590 (tracemalloc,
+    # 100.000 procesos de generar_carga)
+    __slots__ = ('nombre', 'tiempo_llegada', 'prioridad', 'secuencia_ejecucion', 'total_cpu', 'total_es', 'indice_actual',
+                 'tiempo_restante_fase', 'tiempo_bloqueo_restante', 'estado', 'veces_en_so', 'tiempo_fin')
+
+    def __init__(self, nombre, tiempo_llegada, secuencia_ejecucion, prioridad=0):
         self.nombre = nombre
         self.tiempo_llegada = tiempo_llegada
-        self.secuencia_ejecucion = secuencia_ejecucion
-        self.secuencia_original = secuencia_ejecucion.copy()
+        self.prioridad = prioridad
+        self.secuencia_ejecucion = tuple(secuencia_ejecucion)
+        cpu = es = 0
+        for tipo, duracion in self.secuencia_ejecucion:
+            if tipo == 'CPU':
+                cpu += duracion
+            else:
+                es += duracion
+        self.total_cpu = cpu
+        self.total_es = es
         self.indice_actual = 0
         self.tiempo_restante_fase = 0
         self.tiempo_bloqueo_restante = 0
         self.estado = Estado.NUEVO
         self.veces_en_so = 0
+        self.tiempo_fin = None
 
     def obtener_fase_actual(self):
         if self.indice_actual < len(self.secuencia_ejecucion):
@@ -34,50 +63,991 @@ class Proceso:
     def esta_terminado(self):
         return self.indice_actual >= len(self.secuencia_ejecucion)
 
+    @property
+    def secuencia_original(self):
+        return self.secuencia_ejecucion
+
+    def copia(self):
+        # Proceso nuevo, sin simular, que comparte la secuencia (inmutable) y el nombre
+        return Proceso(self.nombre, self.tiempo_llegada, self.secuencia_ejecucion, self.prioridad)
+
     def calcular_tiempo_total_cpu(self):
-        return sum(t for tipo, t in self.secuencia_original if tipo == 'CPU')
+        return self.total_cpu
 
     def calcular_tiempo_total_es(self):
-        return sum(t for tipo, t in self.secuencia_original if tipo == 'ES')
+        return self.total_es
+
+    def estadisticas(self):
+        cpu = self.total_cpu
+        es = self.total_es
+        retorno = self.tiempo_fin - self.tiempo_llegada if self.tiempo_fin is not None else None
+        return {
+            'nombre': self.nombre,
+            'llegada': self.tiempo_llegada,
+            'prioridad': self.prioridad,
+            'fin': self.tiempo_fin,
+            'retorno': retorno,
+            'espera': retorno - cpu - es if retorno is not None else None,
+            'cpu': cpu,
+            'es': es,
+            'veces_en_so': self.veces_en_so,
+            'estado': self.estado,
+        }
+
+# Duración de un slot (en unidades de tiempo) del modo interactivo y de
+# crear_procesos; simular() la calcula de la carga si no se indica
+UNIDAD_TIEMPO = 10
+# La tabla interactiva muestra al menos este tiempo (solo en pantalla)
+MIN_TIEMPO_TABLA = 200
+MAX_NOMBRES_COLA = 8
+
+def _texto_cola(nombres, total=None):
+    if total is None:
+        total = len(nombres)
+    if total <= MAX_NOMBRES_COLA:
+        return ', '.join(nombres)
+    return ', '.join(nombres[:MAX_NOMBRES_COLA]) + f" (+{total - MAX_NOMBRES_COLA})"
+
+def dispositivo_de(tipo):
+    # 'ES' es E/S sin dispositivo (sin límite de paralelismo); 'ES:disco' se atiende en el dispositivo disco
+    return tipo[3:] if tipo.startswith('ES:') else None
+
+class Dispositivo:
+    # Dispositivo de E/S con `capacidad` atenciones simultáneas y una cola FIFO
+    # para el resto. Lleva el tiempo ocupado y la espera en cola.
+    def __init__(self, nombre, capacidad=1):
+        self.nombre = nombre
+        self.capacidad = capacidad
+        self.fila = f'BLOQ:{nombre}'
+        self.en_servicio = {}
+        self.cola = deque()
+        self.ocupado = 0
+        self.atendidos = 0
+        self.espera_total = 0
+        self.espera_max = 0
+        self.cola_max = 0
+        self._texto = None
+
+    def __len__(self):
+        return len(self.en_servicio) + len(self.cola)
+
+    def libre(self):
+        return len(self.en_servicio) < self.capacidad
+
+    def encolar(self, proceso, slot):
+        self.cola.append((proceso, slot))
+        self.cola_max = max(self.cola_max, len(self.cola))
+        self._texto = None
+
+    def atender(self, proceso, espera):
+        self.en_servicio[proceso] = None
+        self.atendidos += 1
+        self.espera_total += espera
+        self.espera_max = max(self.espera_max, espera)
+        self._texto = None
+
+    def liberar(self, proceso, slots_ocupado):
+        del self.en_servicio[proceso]
+        self.ocupado += slots_ocupado
+        self._texto = None
+
+    def texto(self):
+        # Primero los que se están atendiendo, después la cola en orden
+        if self._texto is None:
+            nombres = [p.nombre for p in islice(self.en_servicio, MAX_NOMBRES_COLA + 1)]
+            nombres += [p.nombre for p, _ in islice(self.cola, MAX_NOMBRES_COLA + 1 - len(nombres))]
+            self._texto = _texto_cola(nombres, len(self))
+        return self._texto
+
+    def reiniciar_medicion(self):
+        # Fin del calentamiento de una simulación abierta: lo que está en cola sigue ahí
+        self.ocupado = self.atendidos = self.espera_total = self.espera_max = 0
+        self.cola_max = len(self.cola)
+
+    def a_dict(self, slots_totales, unidad=UNIDAD_TIEMPO):
+        return {
+            'capacidad': self.capacidad,
+            'atendidos': self.atendidos,
+            'utilizacion': 100 * self.ocupado / (self.capacidad * slots_totales) if slots_totales else 0,
+            'espera_media': unidad * self.espera_total / self.atendidos if self.atendidos else None,
+            'espera_max': unidad * self.espera_max,
+            'cola_max': self.cola_max,
+            'en_cola': len(self.cola),
+        }
+
+# Marca en la fila SO de los slots en que el SO ocupa un núcleo
+MARCA_SO = '⚙'
+
+class CostosSO:
+    # Tiempo de CPU que consume el sistema operativo. Cada despacho cuesta
+    # `despacho`, más `cambio_contexto` si el núcleo venía de otro proceso y
+    # `por_listo` por cada proceso que queda en la cola de listos; cada fin de
+    # E/S cuesta `interrupcion_es` en un núcleo (uno ocioso si lo hay). Cada
+    # cargo se redondea a slots enteros, durante los que el núcleo no ejecuta
+    # ningún proceso ni descuenta quantum.
+    CAMPOS = ('despacho', 'cambio_contexto', 'interrupcion_es', 'por_listo')
+
+    def __init__(self, despacho=0, cambio_contexto=0, interrupcion_es=0, por_listo=0):
+        for campo, valor in zip(self.CAMPOS, (despacho, cambio_contexto, interrupcion_es, por_listo)):
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)) or valor < 0:
+                raise ValueError(f"Costo del SO '{campo}': debe ser un número mayor o igual a 0")
+            setattr(self, campo, valor)
+
+    def __repr__(self):
+        # Forma parte de la huella de la caché
+        return "CostosSO(" + ", ".join(f"{c}={getattr(self, c)!r}" for c in self.CAMPOS) + ")"
+
+    def despacho_para(self, cambia, listos):
+        return self.despacho + (self.cambio_contexto if cambia else 0) + self.por_listo * listos
+
+    def a_dict(self):
+        return {c: getattr(self, c) for c in self.CAMPOS}
+
+def leer_costos_so(texto):
+    # "despacho=10,cambio_contexto=20" -> CostosSO(despacho=10, cambio_contexto=20)
+    costos = {}
+    for parte in texto.split(','):
+        if parte.strip():
+            campo, _, valor = parte.partition('=')
+            campo = campo.strip()
+            if campo not in CostosSO.CAMPOS:
+                raise ValueError(f"Costo del SO desconocido '{campo}' (opciones: {', '.join(CostosSO.CAMPOS)})")
+            valor = valor.strip()
+            try:
+                costos[campo] = int(valor) if valor.lstrip('-').isdigit() else float(valor)
+            except ValueError:
+                raise ValueError(f"Costo del SO '{campo}': '{valor}' no es un número") from None
+    return CostosSO(**costos)
+
+def _en_cpu(proceso):
+    fase = proceso.obtener_fase_actual()
+    return fase is not None and fase[0] == 'CPU'
+
+def _sin_progreso(actuales, cola_listos, quantums_restantes):
+    if any(actual is not None and _en_cpu(actual) for actual in actuales):
+        return False
+    if all(actual is not None and (q is None or q > 0) for actual, q in zip(actuales, quantums_restantes)):
+        return True
+    return not any(_en_cpu(p) for p in cola_listos)
+
+class LineaTiempo:
+    # Cada fila guarda solo los tramos ocupados [inicio, fin) con su valor,
+    # en tres arreglos paralelos. Las escrituras avanzan en el tiempo, así que
+    # solo se toca la cola de la fila.
+    def __init__(self, filas, longitud=0):
+        self.longitud = longitud
+        self.filas = {fila: (array('q'), array('q'), []) for fila in filas}
+
+    def __contains__(self, fila):
+        return fila in self.filas
+
+    def extender_hasta(self, longitud):
+        if longitud > self.longitud:
+            self.longitud = longitud
+
+    def pintar(self, fila, desde, hasta, valor):
+        if desde >= hasta:
+            return
+        if hasta > self.longitud:
+            self.longitud = hasta
+        inicios, fines, valores = self.filas[fila]
+        # Casos comunes: escribir después del último tramo o repetir su valor
+        if not fines or fines[-1] <= desde:
+            if valor != '':
+                if fines and fines[-1] == desde and valores[-1] == valor:
+                    fines[-1] = hasta
+                else:
+                    inicios.append(desde); fines.append(hasta); valores.append(valor)
+            return
+        if inicios[-1] <= desde and fines[-1] >= hasta and valores[-1] == valor:
+            return
+        resto = None
+        while inicios and fines[-1] > desde:
+            if resto is None and fines[-1] > hasta:
+                resto = (hasta, fines[-1], valores[-1])
+            if inicios[-1] >= desde:
+                inicios.pop(); fines.pop(); valores.pop()
+            else:
+                fines[-1] = desde
+                break
+        for a, b, v in ((desde, hasta, valor), resto or (0, 0, '')):
+            if v == '' or a >= b:
+                continue
+            if inicios and fines[-1] == a and valores[-1] == v:
+                fines[-1] = b
+            else:
+                inicios.append(a); fines.append(b); valores.append(v)
+
+    def valor(self, fila, columna):
+        inicios, fines, valores = self.filas[fila]
+        i = bisect_right(inicios, columna) - 1
+        if i >= 0 and fines[i] > columna:
+            return valores[i]
+        return ''
+
+    def valores(self, fila, desde, hasta):
+        inicios, fines, valores = self.filas[fila]
+        hasta = min(hasta, self.longitud)
+        resultado = [''] * max(0, hasta - desde)
+        i = max(0, bisect_right(inicios, desde) - 1)
+        while i < len(inicios) and inicios[i] < hasta:
+            for j in range(max(inicios[i], desde), min(fines[i], hasta)):
+                resultado[j - desde] = valores[i]
+            i += 1
+        return resultado
+
+    def segmentos(self, fila):
+        return zip(*self.filas[fila])
+
+    def contar(self, fila, valor):
+        inicios, fines, valores = self.filas[fila]
+        return sum(fines[i] - inicios[i] for i in range(len(valores)) if valores[i] == valor)
+
+    def total_segmentos(self):
+        return sum(len(v) for _, _, v in self.filas.values())
+
+    def ocupado(self, fila):
+        inicios, fines, _ = self.filas[fila]
+        return _sumar_tramos(inicios, fines)
+
+    def primer_inicio(self, fila):
+        inicios = self.filas[fila][0]
+        return inicios[0] if inicios else None
+
+    def columnas(self):
+        # Todos los tramos en cuatro columnas (fila, inicio, fin, valor); filas y
+        # valores van como índices a las listas de nombres y de textos
+        fila, inicio, fin, valor = array('i'), array('q'), array('q'), array('i')
+        ids = {}
+        for i, (inicios, fines, valores) in enumerate(self.filas.values()):
+            fila.extend(array('i', [i]) * len(inicios))
+            inicio.extend(inicios)
+            fin.extend(fines)
+            valor.extend(ids.setdefault(v, len(ids)) for v in valores)
+        return {'fila': fila, 'inicio': inicio, 'fin': fin, 'valor': valor}, list(self.filas), list(ids)
+
+# Con pocos tramos el costo de convertir a NumPy supera la ganancia
+UMBRAL_NUMPY = 1024
+
+def _vector(arreglo):
+    return np.frombuffer(arreglo, dtype=np.int64) if len(arreglo) else np.zeros(0, dtype=np.int64)
+
+def _sumar_tramos(inicios, fines):
+    if np is not None and len(inicios) > UMBRAL_NUMPY:
+        return int(_vector(fines).sum() - _vector(inicios).sum())
+    return sum(fines) - sum(inicios)
+
+def _largo_cola(texto):
+    # Inversa de _texto_cola: "A, B (+3)" son 5 procesos
+    if not texto:
+        return 0
+    nombres, _, extra = texto.partition(' (+')
+    return nombres.count(', ') + 1 + (int(extra[:-1]) if extra else 0)
+
+def serie_cola_listos(linea_tiempo, fila='LISTO'):
+    # Tramos (inicio, fin, procesos en cola) a partir de la fila LISTO
+    inicios, fines, valores = linea_tiempo.filas[fila]
+    largos = array('q', [_largo_cola(v) if '(+' in v else (v.count(', ') + 1 if v else 0) for v in valores])
+    return inicios, fines, largos
+
+def tramos_filas(linea_tiempo, filas):
+    # Todos los tramos de esas filas en dos arreglos planos (sin ordenar)
+    inicios = array('q')
+    fines = array('q')
+    for fila in filas:
+        if fila in linea_tiempo:
+            tramo_inicios, tramo_fines, _ = linea_tiempo.filas[fila]
+            inicios.extend(tramo_inicios)
+            fines.extend(tramo_fines)
+    return inicios, fines
+
+def intervalos_ociosos(linea_tiempo, filas=None, tramos=None):
+    # Intervalos de slots [inicio, fin) en los que ninguna de las filas está ocupada
+    inicios, fines = tramos if tramos is not None else tramos_filas(linea_tiempo, filas)
+    intervalos = []
+    cierre = 0
+    if np is not None and len(inicios) > UMBRAL_NUMPY:
+        orden = np.argsort(_vector(inicios), kind='stable')
+        ordenados = _vector(inicios)[orden]
+        fin_maximo = np.maximum.accumulate(_vector(fines)[orden])
+        previos = np.concatenate((np.zeros(1, dtype=np.int64), fin_maximo[:-1]))
+        huecos = ordenados > previos
+        intervalos = list(zip(previos[huecos].tolist(), ordenados[huecos].tolist()))
+        cierre = int(fin_maximo[-1])
+    else:
+        for inicio, fin in sorted(zip(inicios, fines)):
+            if inicio > cierre:
+                intervalos.append((cierre, inicio))
+            if fin > cierre:
+                cierre = fin
+    if cierre < linea_tiempo.longitud:
+        intervalos.append((cierre, linea_tiempo.longitud))
+    return intervalos
+
+def estadisticas_procesos(procesos, linea_tiempo, unidad=UNIDAD_TIEMPO):
+    estadisticas = []
+    for p in procesos:
+        e = p.estadisticas()
+        primero = linea_tiempo.primer_inicio(p.nombre) if p.nombre in linea_tiempo else None
+        # El despacho que abre el slot s se registra en t=(s+1)*unidad
+        e['respuesta'] = (primero + 1) * unidad - p.tiempo_llegada if primero is not None else None
+        estadisticas.append(e)
+    return estadisticas
+
+def _sobrecarga(cpu_so, cpu_ocupado):
+    # Porcentaje del tiempo de CPU ocupado que se fue en el sistema operativo
+    return cpu_so / cpu_ocupado * 100 if cpu_ocupado else 0
+
+def _throughput(terminados, tiempo_total):
+    # Procesos cada UNIDAD_TIEMPO unidades de tiempo, no por slot: no cambia con la granularidad
+    return terminados / (tiempo_total / UNIDAD_TIEMPO) if tiempo_total > 0 else 0
+
+def _media(valores):
+    valores = [v for v in valores if v is not None]
+    return sum(valores) / len(valores) if valores else None
+
+class HistogramaLog:
+    # Cubetas exactas hasta 63 y, por encima, 32 cubetas por potencia de 2
+    # (error relativo menor al 2%). La cantidad de cubetas está acotada y el
+    # resultado no depende del orden de llegada de los valores.
+    BITS = 6
+
+    def __init__(self):
+        self.n = 0
+        self.cubetas = {}
+
+    def _cubeta(self, valor):
+        m = int(abs(valor))
+        if m < 1 << self.BITS:
+            cubeta = m
+        else:
+            e = m.bit_length() - self.BITS
+            cubeta = (e << self.BITS) | (m >> e)
+        return cubeta if valor >= 0 else -cubeta - 1
+
+    def _valor(self, cubeta):
+        if cubeta < 0:
+            return -self._valor(-cubeta - 1)
+        if cubeta < 1 << self.BITS:
+            return cubeta
+        e = cubeta >> self.BITS
+        inicio = (cubeta & ((1 << self.BITS) - 1)) << e
+        return inicio + ((1 << e) - 1) / 2
+
+    def agregar(self, valor):
+        cubeta = self._cubeta(valor)
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+        self.n += 1
+
+    def percentil(self, p):
+        if self.n == 0:
+            return None
+        objetivo = max(1, -(-p * self.n // 1))
+        acumulado = 0
+        for cubeta in sorted(self.cubetas):
+            acumulado += self.cubetas[cubeta]
+            if acumulado >= objetivo:
+                return self._valor(cubeta)
+
+PERCENTILES_ACUMULADOR = (0.5, 0.9, 0.99)
+
+class EstadisticaEnLinea:
+    # Cantidad, media, mínimo, máximo y percentiles aproximados en memoria constante
+    def __init__(self, percentiles=PERCENTILES_ACUMULADOR):
+        self.n = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+        self.percentiles = percentiles
+        self.histograma = HistogramaLog()
+
+    def agregar(self, x):
+        self.n += 1
+        self.suma += x
+        if self.minimo is None or x < self.minimo:
+            self.minimo = x
+        if self.maximo is None or x > self.maximo:
+            self.maximo = x
+        self.histograma.agregar(x)
+
+    @property
+    def media(self):
+        return self.suma / self.n if self.n else None
+
+    def a_dict(self):
+        resultado = {'n': self.n, 'media': self.media, 'min': self.minimo, 'max': self.maximo}
+        for p in self.percentiles:
+            valor = self.histograma.percentil(p)
+            # El centro de la cubeta puede quedar fuera de lo observado
+            if valor is not None:
+                valor = min(max(valor, self.minimo), self.maximo)
+            resultado[f"p{round(p * 100)}"] = valor
+        return resultado
+
+class AcumuladorMetricas:
+    # Se alimenta de las transiciones que registra TablaProcesos.log_evento y de
+    # los slots de CPU y de la cola de listos que pintan los motores (ocupado va
+    # en unidades de tiempo); no necesita la línea de tiempo.
+    # Por proceso solo recuerda si ya fue despachado alguna vez; con
+    # guardar_respuestas también guarda cada tiempo de respuesta exacto.
+    def __init__(self, guardar_respuestas=False):
+        self.guardar_respuestas = guardar_respuestas
+        # Con costo del SO el primer despacho no es la primera ejecución: la
+        # respuesta queda en diferida y el motor la registra con responder()
+        self.diferir_respuestas = False
+        self.diferida = None
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.inicio = 0
+        self.ocupado = 0
+        self.ocupado_so = 0
+        self.llegadas = 0
+        self.terminados = 0
+        self.despachos = 0
+        self.cambios_contexto = 0
+        self.expropiaciones = 0
+        self.bloqueos = 0
+        self.cola_max = 0
+        self.cola_area = 0
+        # Tramo de la fila LISTO pintado último (inicio, fin, largo): se suma
+        # cuando se pinta otro, porque un repintado del mismo slot lo reemplaza
+        self._tramo_cola = None
+        self.retorno = EstadisticaEnLinea()
+        self.espera = EstadisticaEnLinea()
+        self.respuesta = EstadisticaEnLinea()
+        self._despachados = set()
+        self._ultimo_expropiado = None
+        self.respuestas = [] if self.guardar_respuestas else None
+
+    def cola_listos(self, inicio, fin, largo):
+        # Mide lo mismo que la fila LISTO de la línea de tiempo: en cada slot
+        # cuenta el último largo pintado
+        tramo = self._tramo_cola
+        if tramo is not None and tramo[0] != inicio:
+            self._cerrar_tramo_cola(tramo)
+        self._tramo_cola = (inicio, fin, largo)
+
+    def _cerrar_tramo_cola(self, tramo):
+        inicio, fin, largo = tramo
+        self.cola_area += largo * (fin - inicio)
+        if largo > self.cola_max:
+            self.cola_max = largo
+
+    def transicion(self, tiempo, proceso, desde, hacia):
+        if hacia == EV_LISTO:
+            if desde == EV_EJECUCION:
+                self.expropiaciones += 1
+                self._ultimo_expropiado = (tiempo, proceso)
+        elif hacia == EV_EJECUCION:
+            self.despachos += 1
+            # Volver a despachar en el mismo instante al proceso recién expropiado no cambia de contexto
+            if self._ultimo_expropiado != (tiempo, proceso):
+                self.cambios_contexto += 1
+            # Un despacho en fase de E/S (secuencias inválidas) no ejecuta nada
+            if proceso.nombre not in self._despachados and _en_cpu(proceso):
+                self._despachados.add(proceso.nombre)
+                if self.diferir_respuestas:
+                    self.diferida = proceso
+                else:
+                    self.responder(proceso, tiempo)
+        elif hacia == EV_TERMINADO:
+            self.terminados += 1
+            self._despachados.discard(proceso.nombre)
+            e = proceso.estadisticas()
+            self.retorno.agregar(e['retorno'])
+            self.espera.agregar(e['espera'])
+        elif hacia == EV_BLOQUEADO:
+            self.bloqueos += 1
+        elif desde == EV_NUEVO:
+            self.llegadas += 1
+
+    def responder(self, proceso, tiempo):
+        self.respuesta.agregar(tiempo - proceso.tiempo_llegada)
+        if self.respuestas is not None:
+            self.respuestas.append(tiempo - proceso.tiempo_llegada)
+
+    def descartar_hasta(self, tiempo):
+        # Olvida lo medido hasta `tiempo` (el calentamiento de una simulación
+        # abierta) sin perder quién ya fue despachado. Los slots de la cola ya
+        # pintados son todos anteriores a `tiempo`
+        despachados = self._despachados
+        self.reiniciar()
+        self.inicio = tiempo
+        self._despachados = despachados
+
+    def resumen(self, tiempo_total, nucleos=1):
+        cola_area, cola_max = self.cola_area, self.cola_max
+        if self._tramo_cola is not None:
+            inicio, fin, largo = self._tramo_cola
+            cola_area += largo * (fin - inicio)
+            cola_max = max(cola_max, largo)
+        duracion = tiempo_total - self.inicio
+        capacidad = duracion * nucleos
+        return {
+            'tiempo_total': tiempo_total,
+            'nucleos': nucleos,
+            'cpu_ocupado': self.ocupado,
+            'cpu_libre': capacidad - self.ocupado,
+            'utilizacion': (self.ocupado / capacidad * 100) if capacidad > 0 else 0,
+            'cpu_so': self.ocupado_so,
+            'sobrecarga_so': _sobrecarga(self.ocupado_so, self.ocupado),
+            'terminados': self.terminados,
+            'throughput': _throughput(self.terminados, duracion),
+            'retorno_medio': self.retorno.media,
+            'espera_media': self.espera.media,
+            'respuesta_media': self.respuesta.media,
+            'cola_listos_media': cola_area / duracion if duracion else 0,
+            'cola_listos_max': cola_max,
+            'llegadas': self.llegadas,
+            'despachos': self.despachos,
+            'cambios_contexto': self.cambios_contexto,
+            'expropiaciones': self.expropiaciones,
+            'bloqueos': self.bloqueos,
+            'retorno': self.retorno.a_dict(),
+            'espera': self.espera.a_dict(),
+            'respuesta': self.respuesta.a_dict(),
+        }
+
+class PerfilSimulacion:
+    # Instrumentación opcional de los motores: cada paso (un slot en el motor por
+    # ticks, un slot con eventos en el de eventos) se divide en fases y el tiempo
+    # entre dos llamadas a fase() se carga a la fase abierta, como un cronómetro
+    # de vueltas. Sin perfil los motores solo pagan un `is not None` por fase.
+    # Las funciones registradas con al_paso() reciben (slot, {fase: segundos})
+    # al cerrar cada paso; con detalle=True esos pares también se guardan.
+    def __init__(self, detalle=False):
+        self.segundos = {}
+        self.entradas = {}
+        self.contadores = {}
+        self.pasos = 0
+        self.detalle = [] if detalle else None
+        self.hooks = []
+        self._slot = None
+        self._fase = None
+        self._inicio = 0.0
+        self._paso = {}
+
+    def __getstate__(self):
+        # Los puntos de control guardan el perfil acumulado, no las funciones registradas
+        estado = dict(self.__dict__)
+        estado['hooks'] = []
+        return estado
+
+    def al_paso(self, funcion):
+        self.hooks.append(funcion)
+        return funcion
+
+    def paso(self, slot):
+        self._cerrar_paso()
+        self._slot = slot
+
+    def fase(self, nombre):
+        ahora = perf_counter()
+        anterior = self._fase
+        if anterior is not None:
+            transcurrido = ahora - self._inicio
+            self.segundos[anterior] = self.segundos.get(anterior, 0.0) + transcurrido
+            self._paso[anterior] = self._paso.get(anterior, 0.0) + transcurrido
+        if nombre is not None:
+            self.entradas[nombre] = self.entradas.get(nombre, 0) + 1
+        self._fase = nombre
+        self._inicio = ahora
+
+    def _cerrar_paso(self):
+        self.fase(None)
+        if self._slot is None:
+            return
+        paso, self._paso = self._paso, {}
+        self.pasos += 1
+        if self.detalle is not None:
+            self.detalle.append((self._slot, paso))
+        for hook in self.hooks:
+            hook(self._slot, paso)
+        self._slot = None
+
+    def terminar(self, tabla):
+        self._cerrar_paso()
+        self.contadores = {'pasos': self.pasos, 'slots': tabla.linea_tiempo.longitud, 'eventos': tabla.eventos_log.total,
+                           'procesos': len(tabla.procesos)}
+
+    def informe(self):
+        total = sum(self.segundos.values())
+        fases = [{'fase': fase, 'segundos': s, 'porcentaje': s / total * 100 if total else 0, 'entradas': self.entradas[fase],
+                  'us_por_paso': s / self.pasos * 1e6 if self.pasos else 0}
+                 for fase, s in sorted(self.segundos.items(), key=lambda x: -x[1])]
+        return {'segundos': total, 'contadores': dict(self.contadores), 'fases': fases}
+
+    def texto(self):
+        informe = self.informe()
+        lineas = [f"PERFIL: {informe['segundos']:.3f}s | " + " | ".join(f"{c}: {v}" for c, v in informe['contadores'].items()),
+                  f"{'FASE':>18} {'SEGUNDOS':>10} {'%':>6} {'ENTRADAS':>10} {'µS/PASO':>9}"]
+        for f in informe['fases']:
+            lineas.append(f"{f['fase']:>18} {f['segundos']:>10.4f} {f['porcentaje']:>6.1f} {f['entradas']:>10} {f['us_por_paso']:>9.2f}")
+        return "\n".join(lineas)
+
+# Estados de las transiciones registradas; se guardan como índices en la bitácora
+EV_NUEVO, EV_SO, EV_LISTO, EV_EJECUCION, EV_BLOQUEADO, EV_TERMINADO = range(6)
+NOMBRES_ESTADO_EVENTO = ('NUEVO', 'SO', 'LISTO', 'EJECUCIÓN', 'BLOQUEADO', 'TERMINADO')
+
+TIPOS_EVENTO = ('LLEGADA', 'LISTO', 'DESPACHO', 'EXPROPIACION', 'BLOQUEO', 'FIN_ES', 'TERMINADO')
+_TIPO_TRANSICION = {
+    (EV_NUEVO, EV_SO): 'LLEGADA',
+    (EV_SO, EV_LISTO): 'LISTO',
+    (EV_LISTO, EV_EJECUCION): 'DESPACHO',
+    (EV_EJECUCION, EV_LISTO): 'EXPROPIACION',
+    (EV_EJECUCION, EV_BLOQUEADO): 'BLOQUEO',
+    (EV_BLOQUEADO, EV_SO): 'FIN_ES',
+    (EV_EJECUCION, EV_TERMINADO): 'TERMINADO',
+    (EV_BLOQUEADO, EV_TERMINADO): 'TERMINADO',
+}
+
+CAMPOS_EVENTO = ('tiempo', 'proceso', 'desde', 'hacia', 'motivo', 'valor')
+
+def formatear_evento(registro):
+    tiempo, nombre, desde, hacia, motivo, valor = registro
+    if hacia == 'SO':
+        texto = f"{nombre} {desde} → SO ({valor}{nombre})"
+    elif desde == 'EJECUCIÓN' and hacia == 'LISTO':
+        texto = f"{nombre} EXPROPIADO ({motivo}) → LISTO"
+    elif hacia == 'BLOQUEADO':
+        texto = f"{nombre} EJECUCIÓN → BLOQUEADO (E/S: {valor})"
+    else:
+        texto = f"{nombre} {desde} → {hacia}" + (f" {motivo}" if motivo else "")
+    return f"t={tiempo}: {texto}"
+
+class RegistroEventos:
+    # Bitácora columnar: un entero por campo y evento. Los nombres de proceso y los
+    # motivos se guardan una sola vez y el texto se arma solo al mostrarlo. Con
+    # capacidad se comporta como buffer circular y conserva los últimos eventos.
+    def __init__(self, capacidad=None):
+        if capacidad is not None and capacidad < 1:
+            raise ValueError("La capacidad de la bitácora debe ser mayor o igual a 1")
+        self.capacidad = capacidad
+        self.total = 0
+        self.tiempos = array('q')
+        self.procesos = array('l')
+        self.desde = array('b')
+        self.hacia = array('b')
+        self.motivos = array('l')
+        self.valores = array('q')
+        self.nombres = []
+        self._ids_nombre = {}
+        self.textos_motivo = []
+        self._ids_motivo = {}
+        self.indice = {tipo: array('q') for tipo in TIPOS_EVENTO}
+
+    def _interno(self, texto, textos, ids):
+        i = ids.get(texto)
+        if i is None:
+            i = ids[texto] = len(textos)
+            textos.append(texto)
+        return i
+
+    def registrar(self, tiempo, nombre, desde, hacia, motivo=None, valor=0):
+        # Se llama una vez por evento: los casos comunes van sin llamadas extra
+        proceso = self._ids_nombre.get(nombre)
+        if proceso is None:
+            proceso = self._interno(nombre, self.nombres, self._ids_nombre)
+        if motivo:
+            texto = motivo
+            motivo = self._ids_motivo.get(texto)
+            if motivo is None:
+                motivo = self._interno(texto, self.textos_motivo, self._ids_motivo)
+        else:
+            motivo = -1
+        secuencia = self.total
+        self.total = secuencia + 1
+        capacidad = self.capacidad
+        indice = self.indice[_TIPO_TRANSICION[desde, hacia]]
+        indice.append(secuencia)
+        if capacidad is None or secuencia < capacidad:
+            self.tiempos.append(tiempo)
+            self.procesos.append(proceso)
+            self.desde.append(desde)
+            self.hacia.append(hacia)
+            self.motivos.append(motivo)
+            self.valores.append(valor)
+            if capacidad is None:
+                return
+        else:
+            i = secuencia % capacidad
+            self.tiempos[i] = tiempo
+            self.procesos[i] = proceso
+            self.desde[i] = desde
+            self.hacia[i] = hacia
+            self.motivos[i] = motivo
+            self.valores[i] = valor
+        if len(indice) > 2 * capacidad:
+            del indice[:bisect_left(indice, self.primero)]
+        if len(self.nombres) > 2 * capacidad:
+            self._compactar_nombres()
+
+    def _compactar_nombres(self):
+        # Con capacidad solo se conservan los nombres de los eventos que siguen en
+        # el buffer: la memoria no crece con la cantidad de procesos distintos
+        ids = {}
+        nombres = []
+        for i, viejo in enumerate(self.procesos):
+            nuevo = ids.get(viejo)
+            if nuevo is None:
+                nuevo = ids[viejo] = len(nombres)
+                nombres.append(self.nombres[viejo])
+            self.procesos[i] = nuevo
+        self.nombres = nombres
+        self._ids_nombre = {nombre: i for i, nombre in enumerate(nombres)}
+
+    @property
+    def primero(self):
+        return self.total - len(self)
+
+    @property
+    def descartados(self):
+        return self.primero
+
+    def __len__(self):
+        return self.total if self.capacidad is None else min(self.total, self.capacidad)
+
+    def _posicion(self, secuencia):
+        return secuencia if self.capacidad is None else secuencia % self.capacidad
+
+    def registro(self, secuencia):
+        i = self._posicion(secuencia)
+        motivo = self.motivos[i]
+        return (self.tiempos[i], self.nombres[self.procesos[i]], NOMBRES_ESTADO_EVENTO[self.desde[i]],
+                NOMBRES_ESTADO_EVENTO[self.hacia[i]], self.textos_motivo[motivo] if motivo >= 0 else None, self.valores[i])
+
+    def columnas(self):
+        # Copia de cada campo en orden cronológico (el buffer circular se rota)
+        corte = self._posicion(self.primero) if len(self) else 0
+        campos = (self.tiempos, self.procesos, self.desde, self.hacia, self.motivos, self.valores)
+        return {campo: c[corte:] + c[:corte] for campo, c in zip(CAMPOS_EVENTO, campos)}
+
+    def formatear(self, secuencia):
+        return formatear_evento(self.registro(secuencia))
+
+    def secuencias(self, *tipos):
+        # Números de secuencia (en orden) de los eventos conservados de esos tipos
+        primero = self.primero
+        indices = [self.indice[t] for t in tipos]
+        desde = [islice(indice, bisect_left(indice, primero), None) for indice in indices]
+        return desde[0] if len(desde) == 1 else heapq.merge(*desde)
+
+    def filtrar(self, *tipos):
+        return (self.formatear(s) for s in self.secuencias(*tipos))
 
-def validar_multiplo_10(valor, mensaje):
+    def registros(self, *tipos):
+        secuencias = self.secuencias(*tipos) if tipos else range(self.primero, self.total)
+        return (self.registro(s) for s in secuencias)
+
+    def __iter__(self):
+        return (self.formatear(s) for s in range(self.primero, self.total))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.formatear(self.primero + j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("evento fuera de rango")
+        return self.formatear(self.primero + i)
+
+FIN_COMPLETA = 'completa'
+FIN_LIMITE = 'limite'
+FIN_SIN_PROGRESO = 'sin_progreso'
+FIN_TERMINADOS = 'terminados'
+FIN_INTERRUMPIDA = 'interrumpida'
+
+MENSAJES_FIN = {
+    FIN_LIMITE: "ADVERTENCIA: Simulación detenida: tiempo máximo alcanzado",
+    FIN_SIN_PROGRESO: "ADVERTENCIA: Simulación detenida: ningún proceso puede avanzar",
+    FIN_TERMINADOS: "ADVERTENCIA: Simulación detenida: se alcanzó la cantidad de procesos terminados pedida",
+    FIN_INTERRUMPIDA: "ADVERTENCIA: Simulación interrumpida antes de terminar",
+}
+
+# Eventos que conserva la bitácora de una simulación en flujo
+CAPACIDAD_EVENTOS_FLUJO = 1000
+
+ALGORITMOS = ('FIFO', 'RR', 'SJF', 'SRTF', 'PRIORIDAD', 'PRIORIDAD_EXP', 'MLFQ')
+ALGORITMOS_CON_QUANTUM = ('RR', 'MLFQ')
+ALGORITMOS_CON_PRIORIDAD = ('PRIORIDAD', 'PRIORIDAD_EXP')
+
+def es_multiplo(valor, unidad=UNIDAD_TIEMPO):
+    return isinstance(valor, int) and valor >= 0 and (unidad is None or valor % unidad == 0)
+
+def validar_multiplo_10(valor, mensaje, minimo=0):
     while True:
         try:
             v = int(valor)
-            if v >= 0 and v % 10 == 0:
+            if v >= minimo and v % 10 == 0:
                 return v
         except:
             pass
-        print(f"ERROR: {mensaje} debe ser múltiplo de 10 y mayor o igual a 0")
+        print(f"ERROR: {mensaje} debe ser múltiplo de 10 y mayor o igual a {minimo}")
         try:
             valor = int(input(f"Ingrese nuevamente {mensaje}: "))
         except:
             valor = -1
 
+class VistaTabla:
+    # Dibuja la línea de tiempo como tabla de ancho fijo. Cada valor distinto se
+    # formatea una sola vez y una fila se arma repitiendo la celda de cada tramo
+    # (celda * largo), así que dibujar una ventana cuesta según los tramos que
+    # toca y no según las columnas. secciones: listas de filas separadas por una línea.
+    # Con columnas_minimas la tabla se completa con columnas vacías hasta ese ancho.
+    def __init__(self, linea_tiempo, secciones, unidad=UNIDAD_TIEMPO, titulo="", ancho_fila=12, ancho_col=10,
+                 columnas_minimas=0):
+        self.linea_tiempo = linea_tiempo
+        self.columnas_minimas = columnas_minimas
+        self.secciones = [[f for f in seccion if f in linea_tiempo] for seccion in secciones]
+        self.secciones = [seccion for seccion in self.secciones if seccion]
+        self.unidad = unidad
+        self.titulo = titulo
+        self.ancho_fila = ancho_fila
+        self.ancho_col = ancho_col
+        self._celdas = {}
+        self._vacia = self._celda('')
+        self._guion = "─" * ancho_col
+
+    @property
+    def columnas(self):
+        return max(self.linea_tiempo.longitud, self.columnas_minimas)
+
+    def _celda(self, valor):
+        celda = self._celdas.get(valor)
+        if celda is None:
+            texto = 'x' if valor == 'X' else str(valor)
+            if len(texto) > self.ancho_col:
+                texto = texto[:self.ancho_col - 2] + ".."
+            celda = self._celdas[valor] = f"│{texto:^{self.ancho_col}}"
+        return celda
+
+    def fila(self, nombre, desde, hasta):
+        inicios, fines, valores = self.linea_tiempo.filas[nombre]
+        partes = [f"│{nombre:^{self.ancho_fila}}"]
+        columna = desde
+        i = max(0, bisect_right(inicios, desde) - 1)
+        while i < len(inicios) and inicios[i] < hasta:
+            a, b = max(inicios[i], desde), min(fines[i], hasta)
+            if b > a:
+                if a > columna:
+                    partes.append(self._vacia * (a - columna))
+                partes.append(self._celda(valores[i]) * (b - a))
+                columna = b
+            i += 1
+        if hasta > columna:
+            partes.append(self._vacia * (hasta - columna))
+        partes.append("│")
+        return ''.join(partes)
+
+    def _separador(self, n, izquierda="├", medio="┼", derecha="┤"):
+        return izquierda + "─" * self.ancho_fila + medio + medio.join([self._guion] * n) + derecha
+
+    def lineas(self, desde=0, hasta=None):
+        hasta = self.columnas if hasta is None else min(hasta, self.columnas)
+        n = hasta - desde
+        ancho_total = self.ancho_fila + (self.ancho_col + 1) * n + 1
+        yield "=" * ancho_total
+        yield f"{self.titulo:^{ancho_total}}"
+        yield "=" * ancho_total
+        for i, seccion in enumerate(self.secciones):
+            if i:
+                yield self._separador(n)
+            for nombre in seccion:
+                yield self.fila(nombre, desde, hasta)
+        yield self._separador(n)
+        yield f"│{'TIEMPO':^{self.ancho_fila}}" + ''.join(f"│{(c + 1) * self.unidad:^{self.ancho_col}}" for c in range(desde, hasta)) + "│"
+        yield self._separador(n, "└", "┴", "┘")
+
+    def ventana(self, desde, cantidad):
+        return "\n".join(self.lineas(desde, desde + cantidad))
+
+    def columna_de_tiempo(self, tiempo):
+        # Columna cuyo slot contiene el instante dado (la etiqueta t=(c+1)*unidad cierra el slot c)
+        return min(max(0, -(-tiempo // self.unidad) - 1), max(0, self.columnas - 1))
+
+    def escribir(self, ruta):
+        # La tabla entera, una línea por fila, en una sola pasada con escritura en bloques
+        with open(ruta, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for linea in self.lineas():
+                f.write(linea)
+                f.write("\n")
+
+def secciones_tabla(procesos, nucleos=1, dispositivos=()):
+    return [['BLOQUEADOS'] + [f'BLOQ:{d}' for d in dispositivos], [p.nombre for p in procesos],
+            [f'CPU{i + 1}' for i in range(nucleos)] if nucleos > 1 else [], ['LISTO'], ['SO']]
+
+def titulo_tabla(algoritmo, quantum):
+    titulo = f"ALGORITMO: {algoritmo}"
+    if algoritmo in ALGORITMOS_CON_QUANTUM:
+        titulo += f" (Quantum: {quantum})"
+    return titulo
+
 class TablaProcesos:
     def __init__(self):
         self.tiempo_actual = 0
-        self.columnas_tiempo = []
-        self.datos = {k: [] for k in ['BLOQUEADOS', 'P1', 'P2', 'P3', 'P4', 'LISTO', 'SO']}
+        self.linea_tiempo = LineaTiempo(self._nombres_filas())
         self.procesos = []
         self.algoritmo = None
         self.quantum = 0
-        self.eventos_log = []
+        self.motor = 'eventos'
+        self.limite_slots = None
+        self.nucleos = 1
+        self.colas_por_nucleo = False
+        self.capacidad_eventos = None
+        self.eventos_log = RegistroEventos()
+        self.guardar_linea_tiempo = True
+        self.acumulador = None
+        self.max_terminados = None
+        # Duración de un slot en unidades de tiempo
+        self.unidad = UNIDAD_TIEMPO
+        # Nombre -> capacidad de los dispositivos de E/S; el motor deja su estado en uso_dispositivos
+        self.dispositivos = {}
+        self.uso_dispositivos = {}
+        # (directorio, cada_slots) para guardar puntos de control periódicos
+        self.puntos_control = None
+        # Lista donde la simulación en flujo recoge los eventos del último paso
+        self.pendientes = None
+        # PerfilSimulacion opcional que mide las fases de cada paso de los motores
+        self.perfil = None
+        # CostosSO opcional (solo motor por eventos) y el tiempo de CPU que consumió
+        self.costos_so = None
+        self.cpu_so = 0
+
+    def log_evento(self, tiempo, proceso, desde, hacia, motivo=None, valor=0):
+        self.eventos_log.registrar(tiempo, proceso.nombre, desde, hacia, motivo, valor)
+        if self.pendientes is not None:
+            self.pendientes.append((tiempo, proceso.nombre, NOMBRES_ESTADO_EVENTO[desde], NOMBRES_ESTADO_EVENTO[hacia],
+                                    motivo or None, valor))
+        if self.acumulador is not None:
+            self.acumulador.transicion(tiempo, proceso, desde, hacia)
+
+    def _nombres_filas(self, procesos=(), nucleos=1, dispositivos=()):
+        return ['BLOQUEADOS'] + [f'BLOQ:{d}' for d in dispositivos] + [p.nombre for p in procesos] + self._filas_nucleos(nucleos) + ['LISTO', 'SO']
+
+    def _filas_nucleos(self, nucleos=None):
+        if nucleos is None:
+            nucleos = self.nucleos
+        return [f'CPU{i + 1}' for i in range(nucleos)] if nucleos > 1 else []
 
-    def log_evento(self, evento):
-        self.eventos_log.append(f"t={self.tiempo_actual}: {evento}")
+    @property
+    def columnas_tiempo(self):
+        return range(self.unidad, (self.linea_tiempo.longitud + 1) * self.unidad, self.unidad)
 
-    def agregar_tiempo(self, incremento=10):
-        self.tiempo_actual += incremento
-        self.columnas_tiempo.append(self.tiempo_actual)
-        for fila in self.datos:
-            self.datos[fila].append('')
+    @property
+    def datos(self):
+        linea = self.linea_tiempo
+        return {fila: linea.valores(fila, 0, linea.longitud) for fila in linea.filas}
+
+    def agregar_tiempo(self, incremento=None):
+        self.tiempo_actual += self.unidad if incremento is None else incremento
+        self.linea_tiempo.extender_hasta(self.linea_tiempo.longitud + 1)
 
     def configurar_simulacion(self, algoritmo, quantum=0):
         self.algoritmo = algoritmo
-        self.quantum = validar_multiplo_10(quantum, "el quantum") if quantum > 0 else 0
+        self.quantum = validar_multiplo_10(quantum, "el quantum", 10) if algoritmo in ALGORITMOS_CON_QUANTUM else 0
         self.procesos = []
-        self.eventos_log = []
+        self.eventos_log = RegistroEventos(self.capacidad_eventos)
 
     def pedir_rafagas_proceso(self, nombre):
         rafagas = []
@@ -115,9 +1085,15 @@ class TablaProcesos:
         except:
             print("ERROR: Tiempo de llegada inválido")
             return False
+        prioridad = 0
+        if self.algoritmo in ALGORITMOS_CON_PRIORIDAD:
+            try:
+                prioridad = int(input(f"{nombre} - Prioridad (menor = más prioritario): "))
+            except ValueError:
+                print("ERROR: Prioridad inválida, se usa 0")
         rafagas = self.pedir_rafagas_proceso(nombre)
         if rafagas:
-            proceso = Proceso(nombre, llegada, rafagas)
+            proceso = Proceso(nombre, llegada, rafagas, prioridad)
             self.procesos.append(proceso)
             print(f"✅ Proceso {nombre} creado con {len(rafagas)} ráfagas")
             secuencia_str = " → ".join([f"{tipo}({tiempo})" for tipo, tiempo in rafagas])
@@ -127,76 +1103,104 @@ class TablaProcesos:
             print(f"ADVERTENCIA: Proceso {nombre} no se creó (sin ráfagas)")
             return False
 
-    def agregar_proceso_predefinido(self, nombre, tiempo_llegada, rafagas):
-        proceso = Proceso(nombre, tiempo_llegada, rafagas)
+    def agregar_proceso_predefinido(self, nombre, tiempo_llegada, rafagas, prioridad=0):
+        proceso = Proceso(nombre, tiempo_llegada, rafagas, prioridad)
         self.procesos.append(proceso)
 
+    def preparar_ejecucion(self):
+        self.tiempo_actual = 0
+        self.cpu_so = 0
+        self.eventos_log = RegistroEventos(self.capacidad_eventos)
+        # Sin filas la línea de tiempo solo lleva la cuenta de slots y no guarda tramos
+        filas = self._nombres_filas(self.procesos, self.nucleos, self.dispositivos) if self.guardar_linea_tiempo else []
+        self.linea_tiempo = LineaTiempo(filas)
+        if self.acumulador is not None:
+            self.acumulador.reiniciar()
+
+    def ejecutar(self):
+        self.preparar_ejecucion()
+        if self.motor == 'ticks':
+            if self.algoritmo not in ('FIFO', 'RR') or self.nucleos != 1 or self.dispositivos:
+                raise ValueError("El motor por ticks solo soporta FIFO y RR con un núcleo y sin dispositivos de E/S")
+            if self.costos_so is not None:
+                raise ValueError("El costo del SO requiere el motor por eventos")
+            motivo = self._simular(alg=self.algoritmo)
+            if self.perfil is not None:
+                self.perfil.terminar(self)
+            return motivo
+        return self._simular_eventos(alg=self.algoritmo)
+
     def ejecutar_simulacion(self):
         if not self.procesos or not self.algoritmo:
             print("ERROR: Configura la simulación primero")
             return
-        self.tiempo_actual = 0
-        self.columnas_tiempo = []
-        self.eventos_log = []
-        for fila in self.datos: self.datos[fila] = []
-        for i in range(20):
-            self.agregar_tiempo()
         print(f"🚀 Ejecutando simulación {self.algoritmo}...")
-        if self.algoritmo == 'FIFO':
-            self._simular(alg='FIFO')
-        elif self.algoritmo == 'RR':
-            self._simular(alg='RR')
+        motivo = self.ejecutar()
+        if motivo in MENSAJES_FIN:
+            print(MENSAJES_FIN[motivo])
         print("✅ Simulación completada!")
         self.mostrar_tabla_interactiva()
 
     def _expandir_tabla_si_necesario(self, tiempo_simulacion):
-        while tiempo_simulacion >= len(self.columnas_tiempo):
-            self.agregar_tiempo()
-            for fila in self.datos:
-                if len(self.datos[fila])>0:
-                    self.datos[fila][-1] = ''
+        if tiempo_simulacion >= self.linea_tiempo.longitud:
+            self.linea_tiempo.extender_hasta(tiempo_simulacion + 1)
+            self.tiempo_actual = self.linea_tiempo.longitud * self.unidad
 
     def _limpiar_filas_tiempo(self, tiempo_simulacion, filas=None):
         if filas is None:
-            filas = ['BLOQUEADOS','P1','P2','P3','P4','LISTO','SO']
+            filas = self.linea_tiempo.filas
         for fila in filas:
-            if fila in self.datos and tiempo_simulacion < len(self.datos[fila]):
-                self._actualizar_tabla(fila, tiempo_simulacion, '')
+            self._actualizar_tabla(fila, tiempo_simulacion, '')
 
     def _simular(self, alg='FIFO'):
         cola_listos, cola_bloqueados = [], []
         proceso_actual = None
         tiempo_quantum_restante = 0
         tiempo_simulacion = 0
+        unidad = self.unidad
+        perfil = self.perfil
         procesos_esperando_so_a_listo = []
         procesos_ordenados = sorted(self.procesos, key=lambda p: p.tiempo_llegada)
         for p in procesos_ordenados:
             if p.secuencia_ejecucion:
                 p.tiempo_restante_fase = p.secuencia_ejecucion[0][1]
         while True:
-            tiempo_actual = (tiempo_simulacion + 1) * 10
+            tiempo_actual = (tiempo_simulacion + 1) * unidad
+            if perfil is not None:
+                perfil.paso(tiempo_simulacion)
+                perfil.fase('expandir')
             self._expandir_tabla_si_necesario(tiempo_simulacion)
+            if perfil is not None:
+                perfil.fase('limpiar')
             self._limpiar_filas_tiempo(tiempo_simulacion)
+            if perfil is not None:
+                perfil.fase('so_a_listos')
             for proceso in procesos_esperando_so_a_listo[:]:
                 proceso.estado = Estado.LISTO
                 cola_listos.append(proceso)
                 procesos_esperando_so_a_listo.remove(proceso)
-                self.log_evento(f"{proceso.nombre} SO → LISTO")
+                self.log_evento(tiempo_actual, proceso, EV_SO, EV_LISTO)
+            if perfil is not None:
+                perfil.fase('cola_listos')
             if cola_listos:
                 nombres_listos = [p.nombre for p in cola_listos if p.estado == Estado.LISTO]
                 if nombres_listos:
-                    self._actualizar_tabla('LISTO', tiempo_simulacion, ', '.join(nombres_listos))
+                    self._actualizar_tabla('LISTO', tiempo_simulacion, _texto_cola(nombres_listos))
+            if perfil is not None:
+                perfil.fase('llegadas')
             for proceso in procesos_ordenados:
-                if proceso.tiempo_llegada == tiempo_actual and proceso.estado == Estado.NUEVO:
+                if proceso.tiempo_llegada <= tiempo_actual and proceso.estado == Estado.NUEVO:
                     proceso.veces_en_so += 1
                     proceso.estado = Estado.EN_SO
                     procesos_esperando_so_a_listo.append(proceso)
                     info_so = f"{proceso.veces_en_so}{proceso.nombre}"
                     self._actualizar_tabla('SO', tiempo_simulacion, info_so)
-                    self.log_evento(f"{proceso.nombre} NUEVO → SO ({info_so})")
+                    self.log_evento(tiempo_actual, proceso, EV_NUEVO, EV_SO, valor=proceso.veces_en_so)
+            if perfil is not None:
+                perfil.fase('desbloqueos')
             procesos_desbloqueados = []
             for proceso in cola_bloqueados[:]:
-                proceso.tiempo_bloqueo_restante -= 10
+                proceso.tiempo_bloqueo_restante -= unidad
                 if proceso.tiempo_bloqueo_restante <= 0:
                     procesos_desbloqueados.append(proceso)
             for proceso in procesos_desbloqueados:
@@ -208,36 +1212,41 @@ class TablaProcesos:
                     procesos_esperando_so_a_listo.append(proceso)
                     info_so = f"{proceso.veces_en_so}{proceso.nombre}"
                     self._actualizar_tabla('SO', tiempo_simulacion, info_so)
-                    self.log_evento(f"{proceso.nombre} BLOQUEADO → SO ({info_so})")
+                    self.log_evento(tiempo_actual, proceso, EV_BLOQUEADO, EV_SO, valor=proceso.veces_en_so)
                     fase = proceso.obtener_fase_actual()
                     if fase:
                         proceso.tiempo_restante_fase = fase[1]
                 else:
                     proceso.estado = Estado.TERMINADO
-                    self.log_evento(f"{proceso.nombre} BLOQUEADO → TERMINADO")
+                    proceso.tiempo_fin = tiempo_actual
+                    self.log_evento(tiempo_actual, proceso, EV_BLOQUEADO, EV_TERMINADO)
+            if perfil is not None:
+                perfil.fase('planificar')
             if alg == 'RR' and proceso_actual and tiempo_quantum_restante <= 0:
                 if not proceso_actual.esta_terminado():
                     proceso_actual.estado = Estado.LISTO
                     cola_listos.append(proceso_actual)
-                    self.log_evento(f"{proceso_actual.nombre} EXPROPIADO (Quantum agotado) → LISTO")
+                    self.log_evento(tiempo_actual, proceso_actual, EV_EJECUCION, EV_LISTO, "Quantum agotado")
                     if cola_listos:
                         nombres_listos = [p.nombre for p in cola_listos if p.estado == Estado.LISTO]
                         if nombres_listos:
-                            self._actualizar_tabla('LISTO', tiempo_simulacion, ', '.join(nombres_listos))
+                            self._actualizar_tabla('LISTO', tiempo_simulacion, _texto_cola(nombres_listos))
                 proceso_actual = None
                 tiempo_quantum_restante = 0
             if proceso_actual is None and cola_listos:
                 proceso_actual = cola_listos.pop(0)
                 proceso_actual.estado = Estado.EJECUCION
                 tiempo_quantum_restante = self.quantum if alg == 'RR' else 0
-                self.log_evento(f"{proceso_actual.nombre} LISTO → EJECUCIÓN" + (f" (Quantum: {self.quantum})" if alg=='RR' else ""))
+                self.log_evento(tiempo_actual, proceso_actual, EV_LISTO, EV_EJECUCION, f"(Quantum: {self.quantum})" if alg=='RR' else None)
+            if perfil is not None:
+                perfil.fase('ejecutar')
             if proceso_actual:
                 fase_actual = proceso_actual.obtener_fase_actual()
                 if fase_actual and fase_actual[0] == 'CPU':
                     self._actualizar_tabla(proceso_actual.nombre, tiempo_simulacion, 'x')
-                    proceso_actual.tiempo_restante_fase -= 10
+                    proceso_actual.tiempo_restante_fase -= unidad
                     if alg == 'RR':
-                        tiempo_quantum_restante -= 10
+                        tiempo_quantum_restante -= unidad
                     if proceso_actual.tiempo_restante_fase <= 0:
                         proceso_actual.avanzar_fase()
                         nueva_fase = proceso_actual.obtener_fase_actual()
@@ -246,82 +1255,100 @@ class TablaProcesos:
                                 proceso_actual.estado = Estado.BLOQUEADO
                                 proceso_actual.tiempo_bloqueo_restante = nueva_fase[1]
                                 cola_bloqueados.append(proceso_actual)
-                                self.log_evento(f"{proceso_actual.nombre} EJECUCIÓN → BLOQUEADO (E/S: {nueva_fase[1]})")
+                                self.log_evento(tiempo_actual, proceso_actual, EV_EJECUCION, EV_BLOQUEADO, valor=nueva_fase[1])
                                 proceso_actual = None
                                 tiempo_quantum_restante = 0
                             else:
                                 proceso_actual.tiempo_restante_fase = nueva_fase[1]
                         else:
                             proceso_actual.estado = Estado.TERMINADO
-                            self.log_evento(f"{proceso_actual.nombre} EJECUCIÓN → TERMINADO")
+                            proceso_actual.tiempo_fin = tiempo_actual
+                            self.log_evento(tiempo_actual, proceso_actual, EV_EJECUCION, EV_TERMINADO)
                             proceso_actual = None
                             tiempo_quantum_restante = 0
+            if perfil is not None:
+                perfil.fase('cola_listos')
             if cola_listos:
                 nombres_listos = [p.nombre for p in cola_listos if p.estado == Estado.LISTO]
                 if nombres_listos:
-                    self._actualizar_tabla('LISTO', tiempo_simulacion, ', '.join(nombres_listos))
+                    self._actualizar_tabla('LISTO', tiempo_simulacion, _texto_cola(nombres_listos))
+            if perfil is not None:
+                perfil.fase('bloqueados')
             if cola_bloqueados:
                 nombres_bloqueados = [p.nombre for p in cola_bloqueados]
-                self._actualizar_tabla('BLOQUEADOS', tiempo_simulacion, ', '.join(nombres_bloqueados))
+                self._actualizar_tabla('BLOQUEADOS', tiempo_simulacion, _texto_cola(nombres_bloqueados))
+            if perfil is not None:
+                perfil.fase('control')
             tiempo_simulacion += 1
             if (all(p.estado == Estado.TERMINADO for p in self.procesos) and not cola_listos and not cola_bloqueados and proceso_actual is None and not procesos_esperando_so_a_listo):
-                break
-            if tiempo_simulacion > 500:
-                print("ADVERTENCIA: Simulación detenida: tiempo máximo alcanzado")
-                break
+                return FIN_COMPLETA
+            if self.max_terminados is not None and sum(p.estado == Estado.TERMINADO for p in self.procesos) >= self.max_terminados:
+                return FIN_TERMINADOS
+            if (not procesos_esperando_so_a_listo and not cola_bloqueados and all(p.estado != Estado.NUEVO for p in procesos_ordenados)
+                    and _sin_progreso([proceso_actual], cola_listos, [tiempo_quantum_restante if alg == 'RR' else None])):
+                return FIN_SIN_PROGRESO
+            if self.limite_slots is not None and tiempo_simulacion > self.limite_slots:
+                return FIN_LIMITE
+
+    def motor_eventos(self, alg='FIFO'):
+        return MotorEventos(self, alg, self.limite_slots, self.nucleos, self.colas_por_nucleo)
+
+    def _simular_eventos(self, alg='FIFO'):
+        motor = self.motor_eventos(alg)
+        if self.puntos_control is None:
+            return motor.ejecutar()
+        directorio, cada = self.puntos_control
+        proximo = cada
+        for _ in motor.pasos():
+            if motor.rellenado >= proximo:
+                PuntoControl(motor).guardar(ruta_punto_control(directorio, motor.rellenado))
+                proximo = motor.rellenado + cada
+        # El último permite retomar una corrida que llegó al límite
+        PuntoControl(motor).guardar(ruta_punto_control(directorio, motor.rellenado))
+        return motor.motivo_fin
 
     def _actualizar_tabla(self, fila, columna, valor):
-        if fila in self.datos and columna < len(self.datos[fila]):
-            self.datos[fila][columna] = valor
+        linea = self.linea_tiempo
+        if self.acumulador is not None:
+            if valor == 'x':
+                self.acumulador.ocupado += self.unidad
+            elif fila == 'LISTO' and columna < linea.longitud:
+                self.acumulador.cola_listos(columna * self.unidad, (columna + 1) * self.unidad, _largo_cola(valor))
+        if columna < linea.longitud and fila in linea.filas:
+            linea.pintar(fila, columna, columna + 1, valor)
+
+    def _rellenar_tabla(self, fila, desde, hasta, valor):
+        if self.acumulador is not None:
+            if valor == 'x':
+                self.acumulador.ocupado += self.unidad * (hasta - desde)
+            elif fila == 'LISTO':
+                self.acumulador.cola_listos(desde * self.unidad, hasta * self.unidad, _largo_cola(valor))
+        if fila in self.linea_tiempo:
+            self.linea_tiempo.pintar(fila, desde, hasta, valor)
+
+    def vista(self):
+        # Se arma una vez por línea de tiempo y la reutilizan todas las ventanas. En
+        # pantalla la tabla muestra al menos MIN_TIEMPO_TABLA unidades de tiempo; la
+        # línea de tiempo (y con ella las métricas) termina donde terminó la corrida
+        vista = getattr(self, '_vista', None)
+        if vista is None or vista.linea_tiempo is not self.linea_tiempo:
+            vista = self._vista = VistaTabla(self.linea_tiempo, secciones_tabla(self.procesos, self.nucleos, self.dispositivos),
+                                             self.unidad, titulo_tabla(self.algoritmo, self.quantum),
+                                             columnas_minimas=-(-MIN_TIEMPO_TABLA // self.unidad))
+        return vista
 
     def mostrar_tabla(self, inicio_col=0, cols_visibles=6):
         if not self.columnas_tiempo:
             print("ERROR: La tabla está vacía.")
             return
-        ancho_fila = 12
-        ancho_col = 10
-        fin_col = min(inicio_col + cols_visibles, len(self.columnas_tiempo))
-        columnas_mostrar = self.columnas_tiempo[inicio_col:fin_col]
-        if not columnas_mostrar:
+        vista = self.vista()
+        fin_col = min(inicio_col + cols_visibles, vista.columnas)
+        if inicio_col >= fin_col:
             print("ERROR: No hay más columnas para mostrar")
             return
-        ancho_total = ancho_fila + (ancho_col + 1) * len(columnas_mostrar) + 1
-        print("\n" + "="*ancho_total)
-        titulo = f"ALGORITMO: {self.algoritmo}"
-        if self.algoritmo == 'RR':
-            titulo += f" (Quantum: {self.quantum})"
-        print(f"{titulo:^{ancho_total}}")
-        print("="*ancho_total)
-        def fila_str(nombre):
-            s = f"│{nombre:^{ancho_fila}}"
-            for j in range(inicio_col, fin_col):
-                if j < len(self.datos[nombre]):
-                    valor = self.datos[nombre][j]
-                    if valor == 'X': valor = 'x'
-                    if nombre == 'LISTO' and len(str(valor)) > ancho_col:
-                        valor = str(valor)[:ancho_col-2] + ".."
-                else:
-                    valor = ''
-                s += f"│{str(valor):^{ancho_col}}"
-            s += "│"
-            return s
-        print(fila_str('BLOQUEADOS'))
-        print("├" + "─"*ancho_fila + "┼" + "┼".join(["─"*ancho_col]*len(columnas_mostrar)) + "┤")
-        for p in ['P1','P2','P3','P4']:
-            print(fila_str(p))
-        print("├" + "─"*ancho_fila + "┼" + "┼".join(["─"*ancho_col]*len(columnas_mostrar)) + "┤")
-        print(fila_str('LISTO'))
-        print("├" + "─"*ancho_fila + "┼" + "┼".join(["─"*ancho_col]*len(columnas_mostrar)) + "┤")
-        print(fila_str('SO'))
-        print("├" + "─"*ancho_fila + "┼" + "┼".join(["─"*ancho_col]*len(columnas_mostrar)) + "┤")
-        tiempo_str = f"│{'TIEMPO':^{ancho_fila}}"
-        for tiempo in columnas_mostrar:
-            tiempo_str += f"│{tiempo:^{ancho_col}}"
-        tiempo_str += "│"
-        print(tiempo_str)
-        print("└" + "─"*ancho_fila + "┴" + "┴".join(["─"*ancho_col]*len(columnas_mostrar)) + "┘")
-        if inicio_col > 0 or fin_col < len(self.columnas_tiempo):
-            print(f"\n Mostrando columnas {inicio_col+1}-{fin_col} de {len(self.columnas_tiempo)}")
+        print("\n" + vista.ventana(inicio_col, fin_col - inicio_col))
+        if inicio_col > 0 or fin_col < vista.columnas:
+            print(f"\n Mostrando columnas {inicio_col+1}-{fin_col} de {vista.columnas}")
 
     def mostrar_tabla_interactiva(self):
         import os
@@ -337,20 +1364,33 @@ class TablaProcesos:
             print("║" + " "*20 + "SIMULACIÓN DE PLANIFICACIÓN DE CPU" + " "*16 + "║")
             print("╚" + "═"*70 + "╝")
             self.mostrar_tabla(inicio_col, cols_visibles)
-            if len(self.columnas_tiempo) <= cols_visibles:
+            total_cols = self.vista().columnas
+            if total_cols <= cols_visibles:
                 self._mostrar_menu_resultados()
                 break
             print(f"\n{'─'*50}")
             print("CONTROLES:")
-            print("  (a) ← Anterior | (d) → Siguiente | (c) Completa | (r) Resultados | (q) Salir")
+            print("  (a) ← Anterior | (d) → Siguiente | (t) Ir a tiempo | (c) Completa | (g) Guardar")
+            print("  (r) Resultados | (q) Salir")
             print("─"*50)
             tecla = input("Opción: ").lower().strip()
             if tecla == 'a' and inicio_col > 0:
                 inicio_col = max(0, inicio_col - cols_visibles)
-            elif tecla == 'd' and inicio_col + cols_visibles < len(self.columnas_tiempo):
-                inicio_col = min(len(self.columnas_tiempo) - cols_visibles, inicio_col + cols_visibles)
+            elif tecla == 'd' and inicio_col + cols_visibles < total_cols:
+                inicio_col = min(total_cols - cols_visibles, inicio_col + cols_visibles)
+            elif tecla == 't':
+                try:
+                    tiempo = int(input("Tiempo: "))
+                except ValueError:
+                    print("ERROR: El tiempo debe ser un número entero")
+                    input("Presiona Enter para continuar...")
+                    continue
+                columna = self.vista().columna_de_tiempo(tiempo)
+                inicio_col = max(0, min(columna, total_cols - cols_visibles))
             elif tecla == 'c':
                 self._mostrar_tabla_completa()
+            elif tecla == 'g':
+                self._guardar_tabla()
             elif tecla == 'r':
                 self._mostrar_menu_resultados()
                 break
@@ -363,15 +1403,27 @@ class TablaProcesos:
         print("║" + " "*25 + "TABLA COMPLETA" + " "*31 + "║")
         print("╚" + "═"*70 + "╝")
         cols_por_segmento = 8
-        total_cols = len(self.columnas_tiempo)
+        total_cols = self.vista().columnas
         for inicio in range(0, total_cols, cols_por_segmento):
             fin = min(inicio + cols_por_segmento, total_cols)
             print(f"\n SEGMENTO: Columnas {inicio+1} - {fin}")
             self.mostrar_tabla(inicio, cols_por_segmento)
             if fin < total_cols:
-                input("\n⏯️  Presiona Enter para ver el siguiente segmento...")
+                # Con miles de columnas conviene cortar aquí y guardarla con (g)
+                if input("\n⏯️  Presiona Enter para ver el siguiente segmento (q para volver)...").lower().strip() == 'q':
+                    return
         input("\n Tabla completa mostrada. Presiona Enter para continuar...")
 
+    def _guardar_tabla(self):
+        ruta = input("Archivo donde guardar la tabla completa: ").strip()
+        if ruta:
+            try:
+                self.vista().escribir(ruta)
+                print(f"✅ Tabla guardada en {ruta}")
+            except OSError as e:
+                print(f"ERROR: No se pudo guardar la tabla: {e}")
+        input("Presiona Enter para continuar...")
+
     def _mostrar_menu_resultados(self):
         while True:
             limpiar_pantalla()
@@ -403,9 +1455,11 @@ class TablaProcesos:
         limpiar_pantalla()
         print("ESTADÍSTICAS POR PROCESO")
         print("="*50)
-        for proceso in self.procesos:
+        for proceso, e in zip(self.procesos, estadisticas_procesos(self.procesos, self.linea_tiempo, self.unidad)):
             print(f"\n🔷 PROCESO {proceso.nombre}:")
             print(f"   • Tiempo de llegada: {proceso.tiempo_llegada}")
+            if e['fin'] is not None:
+                print(f"   • Fin: {e['fin']} | Retorno: {e['retorno']} | Espera: {e['espera']} | Respuesta: {e['respuesta']}")
             print(f"   • Veces en SO: {proceso.veces_en_so}")
             print(f"   • Estado final: {proceso.estado}")
             print(f"   • Tiempo total CPU: {proceso.calcular_tiempo_total_cpu()}")
@@ -424,17 +1478,14 @@ class TablaProcesos:
             print("ERROR: No hay eventos registrados")
             input("Presiona Enter para continuar...")
             return
-        eventos_criticos = [e for e in self.eventos_log if any(x in e for x in ['LLEGA', 'TERMINADO', 'EXPROPIADO'])]
+        eventos_criticos = list(islice(self.eventos_log.filtrar('LLEGADA', 'TERMINADO', 'EXPROPIACION'), 20))
         if eventos_criticos:
             print("🎯 EVENTOS CRÍTICOS:")
-            for evento in eventos_criticos[:20]:
-                if 'LLEGA' in evento:
-                    print(f"    {evento}")
-                elif 'TERMINADO' in evento:
-                    print(f"    {evento}")
-                elif 'EXPROPIADO' in evento:
-                    print(f"    {evento}")
+            for evento in eventos_criticos:
+                print(f"    {evento}")
         print(f"\n📋 TODOS LOS EVENTOS ({len(self.eventos_log)} total):")
+        if self.eventos_log.descartados:
+            print(f"   (se descartaron los {self.eventos_log.descartados} eventos más antiguos)")
         eventos_por_pagina = 15
         pagina = 0
         total_paginas = (len(self.eventos_log) + eventos_por_pagina - 1) // eventos_por_pagina
@@ -466,66 +1517,1905 @@ class TablaProcesos:
         limpiar_pantalla()
         print("⏱  LÍNEA DE TIEMPO COMPACTA")
         print("="*50)
-        secuencia = []
-        proceso_anterior = None
-        tiempo_inicio = 0
-        for i, tiempo in enumerate(self.columnas_tiempo):
-            proceso_actual = "LIBRE"
-            for nombre_proceso in ['P1', 'P2', 'P3', 'P4']:
-                if (nombre_proceso in self.datos and i < len(self.datos[nombre_proceso]) and self.datos[nombre_proceso][i] == '█'):
-                    proceso_actual = nombre_proceso
-                    break
-            if proceso_actual != proceso_anterior:
-                if proceso_anterior is not None:
-                    duracion = tiempo - tiempo_inicio
-                    if proceso_anterior == "LIBRE":
-                        secuencia.append(f"💤 CPU LIBRE: t={tiempo_inicio}-{tiempo} ({duracion})")
-                    else:
-                        secuencia.append(f"⚡ {proceso_anterior}: t={tiempo_inicio}-{tiempo} ({duracion})")
-                tiempo_inicio = tiempo
-                proceso_anterior = proceso_actual
-        if proceso_anterior is not None:
-            tiempo_final = self.columnas_tiempo[-1] if self.columnas_tiempo else 0
-            duracion = tiempo_final - tiempo_inicio + 10
-            if proceso_anterior == "LIBRE":
-                secuencia.append(f"💤 CPU LIBRE: t={tiempo_inicio}-{tiempo_final + 10} ({duracion})")
-            else:
-                secuencia.append(f"⚡ {proceso_anterior}: t={tiempo_inicio}-{tiempo_final + 10} ({duracion})")
-        for seg in secuencia:
-            print(f"   {seg}")
+        filas_nucleos = [f for f in self._filas_nucleos() if f in self.linea_tiempo]
+        if filas_nucleos:
+            for fila in filas_nucleos:
+                print(f"\n {fila}:")
+                for seg in self._secuencia_cpu(list(self.linea_tiempo.segmentos(fila))):
+                    print(f"   {seg}")
+        else:
+            tramos = sorted((inicio, fin, p.nombre) for p in self.procesos if p.nombre in self.linea_tiempo
+                            for inicio, fin, valor in self.linea_tiempo.segmentos(p.nombre) if valor == 'x')
+            for seg in self._secuencia_cpu(tramos):
+                print(f"   {seg}")
         input("\n Presiona Enter para continuar...")
 
+    def _secuencia_cpu(self, tramos):
+        secuencia = []
+        columna = 0
+        u = self.unidad
+        for inicio, fin, nombre in tramos + [(self.linea_tiempo.longitud, self.linea_tiempo.longitud, None)]:
+            if inicio > columna:
+                secuencia.append(f"💤 CPU LIBRE: t={(columna + 1) * u}-{(inicio + 1) * u} ({(inicio - columna) * u})")
+            if nombre is not None:
+                secuencia.append(f"⚡ {nombre}: t={(inicio + 1) * u}-{(fin + 1) * u} ({(fin - inicio) * u})")
+            columna = max(columna, fin)
+        return secuencia
+
+    def metricas_sistema(self, estadisticas=None):
+        linea = self.linea_tiempo
+        tiempo_total = linea.longitud * self.unidad
+        tramos = tramos_filas(linea, [p.nombre for p in self.procesos])
+        # El tiempo de CPU del SO no está en las filas de los procesos
+        tiempo_cpu_ocupado = _sumar_tramos(*tramos) * self.unidad + self.cpu_so
+        procesos_terminados = sum(1 for p in self.procesos if p.estado == Estado.TERMINADO)
+        capacidad = tiempo_total * self.nucleos
+        utilizacion = (tiempo_cpu_ocupado / capacidad * 100) if capacidad > 0 else 0
+        filas_nucleos = [f for f in self._filas_nucleos() if f in self.linea_tiempo]
+        if filas_nucleos:
+            utilizacion_nucleos = [(linea.ocupado(fila) * self.unidad / tiempo_total * 100) if tiempo_total > 0 else 0
+                                   for fila in filas_nucleos]
+        else:
+            utilizacion_nucleos = [utilizacion]
+        if estadisticas is None:
+            estadisticas = estadisticas_procesos(self.procesos, linea, self.unidad)
+        inicios, fines, largos = serie_cola_listos(linea) if 'LISTO' in linea else (array('q'), array('q'), array('q'))
+        if np is not None and len(largos) > UMBRAL_NUMPY:
+            cola_acumulada = int(np.dot(_vector(largos), _vector(fines) - _vector(inicios)))
+        else:
+            cola_acumulada = sum(largo * (fin - inicio) for inicio, fin, largo in zip(inicios, fines, largos))
+        ocupados = tramos
+        if self.cpu_so and 'SO' in linea:
+            # El trabajo del SO también ocupa la CPU
+            ocupados = array('q', tramos[0]), array('q', tramos[1])
+            for inicio, fin, valor in linea.segmentos('SO'):
+                if MARCA_SO in valor:
+                    ocupados[0].append(inicio)
+                    ocupados[1].append(fin)
+        ociosos = intervalos_ociosos(linea, tramos=ocupados)
+        return {
+            'tiempo_total': tiempo_total,
+            'nucleos': self.nucleos,
+            'cpu_ocupado': tiempo_cpu_ocupado,
+            'cpu_libre': capacidad - tiempo_cpu_ocupado,
+            'utilizacion': utilizacion,
+            'utilizacion_nucleos': utilizacion_nucleos,
+            'cpu_so': self.cpu_so,
+            'sobrecarga_so': _sobrecarga(self.cpu_so, tiempo_cpu_ocupado),
+            'terminados': procesos_terminados,
+            'throughput': _throughput(procesos_terminados, tiempo_total),
+            'retorno_medio': _media(e['retorno'] for e in estadisticas),
+            'espera_media': _media(e['espera'] for e in estadisticas),
+            'respuesta_media': _media(e['respuesta'] for e in estadisticas),
+            'cola_listos_media': cola_acumulada / linea.longitud if linea.longitud else 0,
+            'cola_listos_max': max(largos, default=0),
+            'intervalos_ociosos': len(ociosos),
+            'mayor_intervalo_ocioso': max((fin - inicio for inicio, fin in ociosos), default=0) * self.unidad,
+        }
+
     def _mostrar_utilizacion_sistema(self):
         limpiar_pantalla()
         print("  UTILIZACIÓN DEL SISTEMA")
         print("="*50)
-        tiempo_total = len(self.columnas_tiempo) * 10 if self.columnas_tiempo else 0
-        tiempo_cpu_ocupado = 0
-        for nombre_proceso in ['P1', 'P2', 'P3', 'P4']:
-            if nombre_proceso in self.datos:
-                tiempo_cpu_ocupado += sum(1 for x in self.datos[nombre_proceso] if x == 'x') * 10
-        tiempo_cpu_libre = tiempo_total - tiempo_cpu_ocupado
-        utilizacion_cpu = (tiempo_cpu_ocupado / tiempo_total * 100) if tiempo_total > 0 else 0
+        m = self.metricas_sistema()
         print(f" MÉTRICAS GENERALES:")
-        print(f"   • Tiempo total de simulación: {tiempo_total}")
-        print(f"   • Tiempo CPU ocupado: {tiempo_cpu_ocupado}")
-        print(f"   • Tiempo CPU libre: {tiempo_cpu_libre}")
-        print(f"   • Utilización de CPU: {utilizacion_cpu:.1f}%")
+        print(f"   • Tiempo total de simulación: {m['tiempo_total']}")
+        print(f"   • Tiempo CPU ocupado: {m['cpu_ocupado']}")
+        print(f"   • Tiempo CPU libre: {m['cpu_libre']}")
+        print(f"   • Utilización de CPU: {m['utilizacion']:.1f}%")
+        if m['nucleos'] > 1:
+            for i, u in enumerate(m['utilizacion_nucleos']):
+                print(f"     - CPU{i + 1}: {u:.1f}%")
         print(f"\n CONFIGURACIÓN:")
         print(f"   • Algoritmo: {self.algoritmo}")
-        if self.algoritmo == 'RR':
+        if self.algoritmo in ALGORITMOS_CON_QUANTUM:
             print(f"   • Quantum: {self.quantum}")
+        if self.nucleos > 1:
+            print(f"   • Núcleos: {self.nucleos}" + (" (colas por núcleo con robo de trabajo)" if self.colas_por_nucleo else ""))
         print(f"   • Total de procesos: {len(self.procesos)}")
-        procesos_terminados = sum(1 for p in self.procesos if p.estado == Estado.TERMINADO)
-        throughput = (procesos_terminados / (tiempo_total / 10)) if tiempo_total > 0 else 0
         print(f"\n RENDIMIENTO:")
-        print(f"   • Procesos terminados: {procesos_terminados}/{len(self.procesos)}")
-        print(f"   • Throughput: {throughput:.3f} procesos/unidad de tiempo")
+        print(f"   • Procesos terminados: {m['terminados']}/{len(self.procesos)}")
+        print(f"   • Throughput: {m['throughput']:.3f} procesos/unidad de tiempo")
+        for clave, texto in (('retorno_medio', 'Retorno medio'), ('espera_media', 'Espera media'), ('respuesta_media', 'Respuesta media')):
+            if m[clave] is not None:
+                print(f"   • {texto}: {m[clave]:.1f}")
+        print(f"   • Cola de listos: media {m['cola_listos_media']:.2f}, máximo {m['cola_listos_max']}")
+        print(f"   • Intervalos con CPU ociosa: {m['intervalos_ociosos']} (el mayor: {m['mayor_intervalo_ocioso']})")
         input("\n Presiona Enter para continuar...")
 
-def limpiar_pantalla():
+def _slots(duracion, unidad=UNIDAD_TIEMPO):
+    return max(1, -(-duracion // unidad))
+
+class PoliticaFIFO:
+    expropiativa = False
+
+    def __init__(self, quantum=0):
+        self.quantum = quantum
+        self.cola = deque()
+
+    def __len__(self):
+        return len(self.cola)
+
+    def __iter__(self):
+        return iter(self.cola)
+
+    def agregar(self, proceso):
+        self.cola.append(proceso)
+
+    def extraer(self):
+        return self.cola.popleft()
+
+    def primeros(self, n):
+        return list(islice(self.cola, n))
+
+    def quantum_para(self, proceso):
+        return None
+
+    def detalle_despacho(self, proceso, quantum):
+        return ""
+
+    def expropia(self, actual):
+        return False
+
+    def al_agotar_quantum(self, proceso):
+        pass
+
+    def retirar(self, proceso):
+        pass
+
+    def clonar_vacia(self):
+        return type(self)(self.quantum)
+
+class PoliticaRR(PoliticaFIFO):
+    def quantum_para(self, proceso):
+        return self.quantum
+
+    def detalle_despacho(self, proceso, quantum):
+        return f" (Quantum: {quantum})"
+
+class _PoliticaHeap:
+    # Cola ordenada por clave(proceso) (menor primero, empates por orden de
+    # llegada a la cola). Cada subclase pasa su clave.
+    expropiativa = False
+    motivo_expropiacion = ""
+
+    def __init__(self, clave, quantum=0):
+        self.clave = clave
+        self.quantum = quantum
+        self.heap = []
+        self.orden = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (p for _, _, p in self.heap)
+
+    def agregar(self, proceso):
+        heapq.heappush(self.heap, (self.clave(proceso), self.orden, proceso))
+        self.orden += 1
+
+    def extraer(self):
+        return heapq.heappop(self.heap)[2]
+
+    def primeros(self, n):
+        # Recorre el heap por niveles en orden de clave: O(n log n) sin copiar la cola.
+        heap = self.heap
+        resultado = []
+        frontera = [(heap[0], 0)] if heap else []
+        while frontera and len(resultado) < n:
+            entrada, i = heapq.heappop(frontera)
+            resultado.append(entrada[2])
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(heap):
+                    heapq.heappush(frontera, (heap[hijo], hijo))
+        return resultado
+
+    def quantum_para(self, proceso):
+        return None
+
+    def detalle_despacho(self, proceso, quantum):
+        return f" ({self.etiqueta}: {self.clave(proceso)})"
+
+    def expropia(self, actual):
+        return bool(self.heap) and self.heap[0][0] < self.clave(actual)
+
+    def al_agotar_quantum(self, proceso):
+        pass
+
+    def retirar(self, proceso):
+        pass
+
+    def clonar_vacia(self):
+        return type(self)(self.quantum)
+
+class PoliticaSJF(_PoliticaHeap):
+    etiqueta = "Ráfaga"
+
+    def __init__(self, quantum=0):
+        super().__init__(attrgetter('tiempo_restante_fase'), quantum)
+
+class PoliticaSRTF(PoliticaSJF):
+    expropiativa = True
+    motivo_expropiacion = "Ráfaga restante menor"
+
+class PoliticaPrioridad(_PoliticaHeap):
+    etiqueta = "Prioridad"
+
+    def __init__(self, quantum=0):
+        super().__init__(attrgetter('prioridad'), quantum)
+
+class PoliticaPrioridadExpropiativa(PoliticaPrioridad):
+    expropiativa = True
+    motivo_expropiacion = "Mayor prioridad"
+
+NIVELES_MLFQ = 3
+
+def _quantums_mlfq(quantum, niveles):
+    base = quantum if quantum > 0 else UNIDAD_TIEMPO
+    return [base * 2 ** i for i in range(niveles - 1)] + [None]
+
+class PoliticaMLFQ:
+    # Cada nivel es una cola FIFO; el quantum se duplica por nivel y el último
+    # nivel no tiene quantum. Agotar el quantum baja un nivel; volver de E/S
+    # conserva el nivel.
+    expropiativa = True
+    motivo_expropiacion = "Nivel superior listo"
+
+    def __init__(self, quantum=0, niveles=NIVELES_MLFQ):
+        self.quantum = quantum
+        self.quantums = _quantums_mlfq(quantum, niveles)
+        self.colas = [deque() for _ in range(niveles)]
+        self.nivel = {}
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        for cola in self.colas:
+            yield from cola
+
+    def agregar(self, proceso):
+        self.colas[self.nivel.setdefault(proceso, 0)].append(proceso)
+        self.total += 1
+
+    def extraer(self):
+        for cola in self.colas:
+            if cola:
+                self.total -= 1
+                return cola.popleft()
+        raise IndexError("cola de listos vacía")
+
+    def primeros(self, n):
+        return list(islice(self, n))
+
+    def quantum_para(self, proceso):
+        return self.quantums[self.nivel.get(proceso, 0)]
+
+    def detalle_despacho(self, proceso, quantum):
+        nivel = self.nivel.get(proceso, 0) + 1
+        return f" (Quantum: {quantum}, Nivel: {nivel})" if quantum is not None else f" (Nivel: {nivel})"
+
+    def expropia(self, actual):
+        nivel = self.nivel.get(actual, 0)
+        return any(self.colas[i] for i in range(nivel))
+
+    def al_agotar_quantum(self, proceso):
+        self.nivel[proceso] = min(self.nivel.get(proceso, 0) + 1, len(self.colas) - 1)
+
+    def retirar(self, proceso):
+        self.nivel.pop(proceso, None)
+
+    def clonar_vacia(self):
+        clon = type(self)(self.quantum, len(self.colas))
+        clon.nivel = self.nivel
+        return clon
+
+POLITICAS = {
+    'FIFO': PoliticaFIFO,
+    'RR': PoliticaRR,
+    'SJF': PoliticaSJF,
+    'SRTF': PoliticaSRTF,
+    'PRIORIDAD': PoliticaPrioridad,
+    'PRIORIDAD_EXP': PoliticaPrioridadExpropiativa,
+    'MLFQ': PoliticaMLFQ,
+}
+
+class ColaCompartida:
+    def __init__(self, politica):
+        self.base = politica
+
+    def __len__(self):
+        return len(self.base)
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def primeros(self, n):
+        return self.base.primeros(n)
+
+    def politica(self, nucleo):
+        return self.base
+
+    def agregar(self, proceso, nucleo=None):
+        self.base.agregar(proceso)
+
+    def tomar(self, nucleo):
+        return self.base.extraer(), None
+
+    def retirar(self, proceso):
+        # Olvida lo que la política recuerda de un proceso terminado
+        self.base.retirar(proceso)
+
+class ColasPorNucleo:
+    # Una cola por núcleo: un proceso vuelve a la cola del último núcleo donde
+    # corrió y los nuevos van a la cola más corta. Un núcleo ocioso con la
+    # cola vacía roba de la cola más larga.
+    def __init__(self, politica, nucleos):
+        self.colas = [politica] + [politica.clonar_vacia() for _ in range(nucleos - 1)]
+        self.afinidad = {}
+
+    def __len__(self):
+        return sum(len(c) for c in self.colas)
+
+    def __iter__(self):
+        for cola in self.colas:
+            yield from cola
+
+    def primeros(self, n):
+        resultado = []
+        for cola in self.colas:
+            if len(resultado) >= n:
+                break
+            resultado.extend(cola.primeros(n - len(resultado)))
+        return resultado
+
+    def politica(self, nucleo):
+        return self.colas[nucleo]
+
+    def agregar(self, proceso, nucleo=None):
+        if nucleo is None:
+            nucleo = self.afinidad.get(proceso)
+        if nucleo is None:
+            nucleo = min(range(len(self.colas)), key=lambda i: len(self.colas[i]))
+        self.colas[nucleo].agregar(proceso)
+
+    def tomar(self, nucleo):
+        robado_de = None
+        cola = self.colas[nucleo]
+        if not cola:
+            robado_de = max(range(len(self.colas)), key=lambda i: len(self.colas[i]))
+            cola = self.colas[robado_de]
+        proceso = cola.extraer()
+        self.afinidad[proceso] = nucleo
+        return proceso, robado_de
+
+    def retirar(self, proceso):
+        self.afinidad.pop(proceso, None)
+        for cola in self.colas:
+            cola.retirar(proceso)
+
+class MotorEventos:
+    # Reproduce slot a slot la semántica de TablaProcesos._simular, pero solo
+    # ejecuta los slots donde ocurre algo (llegada, fin de ráfaga CPU, fin de
+    # E/S, quantum agotado, despacho) y rellena en bloque los intermedios.
+    def __init__(self, tabla, alg='FIFO', limite=None, nucleos=1, colas_por_nucleo=False):
+        self.tabla = tabla
+        self.alg = alg
+        self.quantum = tabla.quantum
+        self.limite = limite
+        self.nucleos = nucleos
+        self.procesos_ordenados = sorted(tabla.procesos, key=lambda p: p.tiempo_llegada)
+        self.siguiente_llegada = 0
+        politica = POLITICAS[alg](tabla.quantum)
+        self.cola_listos = ColasPorNucleo(politica, nucleos) if colas_por_nucleo and nucleos > 1 else ColaCompartida(politica)
+        self.bloqueados = {}
+        self.fin_es = []
+        self.orden_bloqueo = 0
+        self.esperando_so = []
+        self.actuales = [None] * nucleos
+        self.con_quantum = [False] * nucleos
+        self.quantum_restante = [0] * nucleos
+        self.terminados = 0
+        self.unidad = tabla.unidad
+        self.dispositivos = {nombre: Dispositivo(nombre, capacidad) for nombre, capacidad in tabla.dispositivos.items()}
+        tabla.uso_dispositivos = self.dispositivos
+        self.max_terminados = tabla.max_terminados
+        self.motivo_fin = None
+        # Próximo slot con eventos y primer slot aún sin pintar: entre ambos solo
+        # quedan slots tranquilos. Con esto el motor se puede guardar y retomar.
+        self.slot = None
+        self.rellenado = 0
+        self._texto_listos = None
+        self._texto_bloqueados = None
+        # Slots de trabajo del SO pendientes en cada núcleo (ver CostosSO), qué
+        # muestran en la fila SO, el último proceso que corrió en cada núcleo y
+        # los despachados que todavía no ejecutaron (nombre -> proceso)
+        self.costos = tabla.costos_so
+        self.sobrecarga = [0] * nucleos
+        self.texto_sobrecarga = [''] * nucleos
+        self.ultimo_en_cpu = [None] * nucleos
+        self.por_responder = {}
+        if self.costos is not None and tabla.acumulador is not None:
+            tabla.acumulador.diferir_respuestas = True
+
+    def ejecutar(self):
+        for _ in self.pasos():
+            pass
+        return self.motivo_fin
+
+    def pasos(self):
+        # Generador: procesa un slot con eventos por vuelta y lo entrega antes de
+        # rellenar los slots tranquilos que siguen. Entre vueltas todo el estado
+        # está en el objeto (ver PuntoControl); al agotarse, motivo_fin dice por
+        # qué paró. Llamarlo de nuevo tras FIN_LIMITE con un límite mayor sigue.
+        if self.motivo_fin == FIN_COMPLETA:
+            return
+        if self.slot is None:
+            for p in self.procesos_ordenados:
+                if p.secuencia_ejecucion:
+                    p.tiempo_restante_fase = p.secuencia_ejecucion[0][1]
+            self.slot = 0
+        self.motivo_fin = None
+        perfil = self.tabla.perfil
+        try:
+            while True:
+                if self.limite is not None and self.slot > self.limite:
+                    self._detener_en_limite()
+                    return
+                if perfil is not None:
+                    perfil.paso(self.slot)
+                    perfil.fase('rellenar')
+                self._rellenar(self.rellenado, self.slot)
+                slot = self.slot
+                if perfil is not None:
+                    perfil.fase('expandir')
+                self.tabla._expandir_tabla_si_necesario(slot)
+                self._paso(slot)
+                self.slot = self.rellenado = slot + 1
+                if perfil is not None:
+                    perfil.fase('control')
+                if self._finalizado():
+                    self.motivo_fin = FIN_COMPLETA
+                    return
+                if self.max_terminados is not None and self.terminados >= self.max_terminados:
+                    self._pausar_es(slot)
+                    self.motivo_fin = FIN_TERMINADOS
+                    return
+                if self._estancado():
+                    self.motivo_fin = FIN_SIN_PROGRESO
+                    return
+                if perfil is not None:
+                    perfil.fase('siguiente_evento')
+                self.slot = self._siguiente_evento(slot)
+                if perfil is not None:
+                    perfil.fase(None)
+                yield slot
+        finally:
+            # También al cortar un flujo a mitad: el perfil cubre lo simulado
+            if perfil is not None:
+                perfil.terminar(self.tabla)
+
+    def reconfigurar(self, algoritmo=None, quantum=None, limite=False, max_terminados=False):
+        # Para bifurcar un punto de control. La cola de listos pasa en orden a la
+        # nueva política y lo que está en CPU empieza una porción de quantum nueva.
+        # limite y max_terminados usan False para "sin cambios" porque None es "sin tope".
+        if algoritmo is not None or quantum is not None:
+            algoritmo = algoritmo or self.alg
+            quantum = self.quantum if quantum is None else quantum
+            if algoritmo not in ALGORITMOS:
+                raise ValueError(f"Algoritmo desconocido '{algoritmo}' (use {', '.join(ALGORITMOS)})")
+            if algoritmo not in ALGORITMOS_CON_QUANTUM:
+                quantum = 0
+            elif not es_multiplo(quantum, self.unidad) or quantum == 0:
+                raise ValueError(f"El quantum debe ser múltiplo de {self.unidad} (la duración del slot) y mayor que 0")
+            por_nucleo = isinstance(self.cola_listos, ColasPorNucleo)
+            viejas = self.cola_listos.colas if por_nucleo else [self.cola_listos.base]
+            politica = POLITICAS[algoritmo](quantum)
+            nuevas = [politica] + [politica.clonar_vacia() for _ in viejas[1:]]
+            for vieja, nueva in zip(viejas, nuevas):
+                for proceso in vieja.primeros(len(vieja)):
+                    nueva.agregar(proceso)
+            if por_nucleo:
+                self.cola_listos.colas = nuevas
+            else:
+                self.cola_listos.base = politica
+            for nucleo, actual in enumerate(self.actuales):
+                if actual:
+                    q = self.cola_listos.politica(nucleo).quantum_para(actual)
+                    self.con_quantum[nucleo] = q is not None
+                    self.quantum_restante[nucleo] = q if q is not None else 0
+            self.alg = self.tabla.algoritmo = algoritmo
+            self.quantum = self.tabla.quantum = quantum
+            self._texto_listos = None
+        if limite is not False:
+            if limite is not None and limite < self.rellenado - 1:
+                raise ValueError(f"El límite no puede ser anterior al punto de control (slot {self.rellenado - 1})")
+            self.limite = self.tabla.limite_slots = limite
+        if max_terminados is not False:
+            self.max_terminados = self.tabla.max_terminados = max_terminados
+
+    def _detener_en_limite(self):
+        self._rellenar(self.rellenado, self.limite + 1)
+        self.rellenado = max(self.rellenado, self.limite + 1)
+        self._pausar_es(self.limite)
+        self.motivo_fin = FIN_LIMITE
+
+    def _pausar_es(self, hasta):
+        # Descuenta lo ya bloqueado hasta el slot `hasta` y corre ahí el inicio del
+        # bloqueo para no descontarlo dos veces al retomar; (fin, orden) no cambia,
+        # así que sigue siendo un heap
+        fin_es = []
+        for fin, orden, bloqueo, proceso in self.fin_es:
+            if bloqueo < hasta:
+                proceso.tiempo_bloqueo_restante -= self.unidad * (hasta - bloqueo)
+                dispositivo = self._dispositivo(proceso)
+                if dispositivo is not None:
+                    dispositivo.ocupado += hasta - bloqueo
+                bloqueo = hasta
+            fin_es.append((fin, orden, bloqueo, proceso))
+        self.fin_es = fin_es
+
+    def _dispositivo(self, proceso):
+        # Dispositivo de la ráfaga de E/S en curso del proceso, si tiene
+        if not self.dispositivos:
+            return None
+        return self.dispositivos.get(dispositivo_de(proceso.obtener_fase_actual()[0]))
+
+    def _finalizado(self):
+        return (self.terminados == self.siguiente_llegada and not self.cola_listos and not self.esperando_so
+                and not self.bloqueados and not any(self.actuales) and not any(self.sobrecarga) and self._proxima_llegada() is None)
+
+    def _estancado(self):
+        return (not self.esperando_so and not self.fin_es and not any(self.sobrecarga) and self._proxima_llegada() is None
+                and _sin_progreso(self.actuales, self.cola_listos,
+                                  [q if c else None for q, c in zip(self.quantum_restante, self.con_quantum)]))
+
+    def _listos(self):
+        if self._texto_listos is None:
+            primeros = self.cola_listos.primeros(MAX_NOMBRES_COLA + 1)
+            self._texto_listos = _texto_cola([p.nombre for p in primeros], len(self.cola_listos))
+        return self._texto_listos
+
+    def _nombres_bloqueados(self):
+        if self._texto_bloqueados is None:
+            self._texto_bloqueados = _texto_cola([p.nombre for p in islice(self.bloqueados, MAX_NOMBRES_COLA + 1)], len(self.bloqueados))
+        return self._texto_bloqueados
+
+    def _encolar_listo(self, proceso, nucleo=None):
+        proceso.estado = Estado.LISTO
+        self.cola_listos.agregar(proceso, nucleo)
+        self._texto_listos = None
+
+    def _bloquear(self, proceso, slot, duracion):
+        proceso.estado = Estado.BLOQUEADO
+        proceso.tiempo_bloqueo_restante = duracion
+        self.bloqueados[proceso] = None
+        self._texto_bloqueados = None
+        dispositivo = self._dispositivo(proceso)
+        if dispositivo is None:
+            self._iniciar_es(proceso, slot, duracion)
+        elif dispositivo.libre():
+            dispositivo.atender(proceso, 0)
+            self._iniciar_es(proceso, slot, duracion)
+        else:
+            dispositivo.encolar(proceso, slot)
+
+    def _iniciar_es(self, proceso, slot, duracion):
+        heapq.heappush(self.fin_es, (slot + _slots(duracion, self.unidad), self.orden_bloqueo, slot, proceso))
+        self.orden_bloqueo += 1
+
+    def _a_so(self, proceso, slot, tiempo, origen):
+        proceso.veces_en_so += 1
+        proceso.estado = Estado.EN_SO
+        self.esperando_so.append(proceso)
+        info_so = f"{proceso.veces_en_so}{proceso.nombre}"
+        self.tabla._actualizar_tabla('SO', slot, info_so)
+        self.tabla.log_evento(tiempo, proceso, origen, EV_SO, valor=proceso.veces_en_so)
+
+    def _llegadas(self, slot, tiempo):
+        ordenados = self.procesos_ordenados
+        while self.siguiente_llegada < len(ordenados) and ordenados[self.siguiente_llegada].tiempo_llegada <= tiempo:
+            proceso = ordenados[self.siguiente_llegada]
+            self.siguiente_llegada += 1
+            if proceso.estado == Estado.NUEVO:
+                self._a_so(proceso, slot, tiempo, EV_NUEVO)
+
+    def _proxima_llegada(self):
+        if self.siguiente_llegada < len(self.procesos_ordenados):
+            return self.procesos_ordenados[self.siguiente_llegada].tiempo_llegada
+        return None
+
+    def _terminar(self, proceso, tiempo, desde):
+        proceso.estado = Estado.TERMINADO
+        proceso.tiempo_fin = tiempo
+        self.terminados += 1
+        self.tabla.log_evento(tiempo, proceso, desde, EV_TERMINADO)
+
+    def _liberar_cpu(self, nucleo):
+        self.actuales[nucleo] = None
+        self.con_quantum[nucleo] = False
+        self.quantum_restante[nucleo] = 0
+
+    def _paso(self, slot):
+        tabla = self.tabla
+        cola = self.cola_listos
+        perfil = tabla.perfil
+        tiempo = (slot + 1) * self.unidad
+        if perfil is not None:
+            perfil.fase('so_a_listos')
+        for proceso in self.esperando_so:
+            self._encolar_listo(proceso)
+            tabla.log_evento(tiempo, proceso, EV_SO, EV_LISTO)
+        self.esperando_so = []
+        if perfil is not None:
+            perfil.fase('cola_listos')
+        if cola:
+            tabla._actualizar_tabla('LISTO', slot, self._listos())
+        if perfil is not None:
+            perfil.fase('llegadas')
+        self._llegadas(slot, tiempo)
+        if perfil is not None:
+            perfil.fase('desbloqueos')
+        while self.fin_es and self.fin_es[0][0] <= slot:
+            _, _, bloqueo, proceso = heapq.heappop(self.fin_es)
+            del self.bloqueados[proceso]
+            self._texto_bloqueados = None
+            proceso.tiempo_bloqueo_restante -= self.unidad * (slot - bloqueo)
+            dispositivo = self._dispositivo(proceso)
+            if dispositivo is not None:
+                dispositivo.liberar(proceso, slot - bloqueo)
+                if dispositivo.cola:
+                    siguiente, llegada = dispositivo.cola.popleft()
+                    dispositivo.atender(siguiente, slot - llegada)
+                    self._iniciar_es(siguiente, slot, siguiente.tiempo_bloqueo_restante)
+            if self.costos is not None and self.costos.interrupcion_es:
+                libre = next((n for n in range(self.nucleos) if not self.actuales[n] and not self.sobrecarga[n]), 0)
+                self._cargar_sobrecarga(libre, self.costos.interrupcion_es, f"{MARCA_SO}E/S:{proceso.nombre}")
+            proceso.avanzar_fase()
+            if not proceso.esta_terminado():
+                self._a_so(proceso, slot, tiempo, EV_BLOQUEADO)
+                fase = proceso.obtener_fase_actual()
+                if fase:
+                    proceso.tiempo_restante_fase = fase[1]
+            else:
+                self._terminar(proceso, tiempo, EV_BLOQUEADO)
+        if perfil is not None:
+            perfil.fase('planificar')
+        for nucleo in range(self.nucleos):
+            self._planificar_nucleo(nucleo, slot, tiempo)
+        if perfil is not None:
+            perfil.fase('ejecutar')
+        for nucleo in range(self.nucleos):
+            self._ejecutar_nucleo(nucleo, slot, tiempo)
+        if perfil is not None:
+            perfil.fase('cola_listos')
+        if cola:
+            tabla._actualizar_tabla('LISTO', slot, self._listos())
+        if perfil is not None:
+            perfil.fase('bloqueados')
+        if self.bloqueados:
+            tabla._actualizar_tabla('BLOQUEADOS', slot, self._nombres_bloqueados())
+            for dispositivo in self.dispositivos.values():
+                if dispositivo:
+                    tabla._actualizar_tabla(dispositivo.fila, slot, dispositivo.texto())
+
+    def _planificar_nucleo(self, nucleo, slot, tiempo):
+        tabla = self.tabla
+        cola = self.cola_listos
+        politica = cola.politica(nucleo)
+        actual = self.actuales[nucleo]
+        if actual and self.con_quantum[nucleo] and self.quantum_restante[nucleo] <= 0:
+            if not actual.esta_terminado():
+                politica.al_agotar_quantum(actual)
+                self._encolar_listo(actual, nucleo)
+                tabla.log_evento(tiempo, actual, EV_EJECUCION, EV_LISTO, "Quantum agotado")
+                tabla._actualizar_tabla('LISTO', slot, self._listos())
+            self._liberar_cpu(nucleo)
+            actual = None
+        elif actual and politica.expropiativa and politica and politica.expropia(actual):
+            self._encolar_listo(actual, nucleo)
+            tabla.log_evento(tiempo, actual, EV_EJECUCION, EV_LISTO, politica.motivo_expropiacion)
+            tabla._actualizar_tabla('LISTO', slot, self._listos())
+            self._liberar_cpu(nucleo)
+            actual = None
+        if actual is None and cola:
+            actual, robado_de = cola.tomar(nucleo)
+            self._texto_listos = None
+            actual.estado = Estado.EJECUCION
+            quantum = cola.politica(nucleo).quantum_para(actual)
+            self.con_quantum[nucleo] = quantum is not None
+            self.quantum_restante[nucleo] = quantum if quantum is not None else 0
+            detalle = politica.detalle_despacho(actual, quantum)
+            if self.nucleos > 1:
+                detalle += f" [CPU{nucleo + 1}" + (f", robado de CPU{robado_de + 1}]" if robado_de is not None else "]")
+            tabla.log_evento(tiempo, actual, EV_LISTO, EV_EJECUCION, detalle.strip())
+            if self.costos is not None:
+                costo = self.costos.despacho_para(self.ultimo_en_cpu[nucleo] is not actual, len(cola))
+                self._cargar_sobrecarga(nucleo, costo, f"{MARCA_SO}{actual.nombre}")
+                acumulador = tabla.acumulador
+                if acumulador is not None and acumulador.diferida is not None:
+                    # La respuesta se cuenta cuando el proceso ejecuta de verdad
+                    self.por_responder[actual.nombre] = acumulador.diferida
+                    acumulador.diferida = None
+            self.ultimo_en_cpu[nucleo] = actual
+        self.actuales[nucleo] = actual
+
+    def _cargar_sobrecarga(self, nucleo, costo, texto):
+        slots = -(-costo // self.unidad)
+        if slots:
+            self.sobrecarga[nucleo] += int(slots)
+            self.texto_sobrecarga[nucleo] = texto
+
+    def _pintar_sobrecarga(self, nucleo, desde, hasta):
+        # El núcleo hace trabajo del SO en [desde, hasta): se ve en la fila SO
+        # (junto a lo que ya haya en ese slot) y en la del núcleo
+        tabla = self.tabla
+        texto = self.texto_sobrecarga[nucleo]
+        if 'SO' in tabla.linea_tiempo:
+            previo = tabla.linea_tiempo.valor('SO', desde)
+            tabla.linea_tiempo.pintar('SO', desde, hasta, f"{previo} {texto}" if previo else texto)
+        if self.nucleos > 1:
+            tabla._rellenar_tabla(f'CPU{nucleo + 1}', desde, hasta, texto)
+        self.sobrecarga[nucleo] -= hasta - desde
+        tiempo = self.unidad * (hasta - desde)
+        tabla.cpu_so += tiempo
+        if tabla.acumulador is not None:
+            tabla.acumulador.ocupado += tiempo
+            tabla.acumulador.ocupado_so += tiempo
+
+    def _responder(self, proceso, slot):
+        # Primera ejecución de un proceso despachado con costo del SO
+        if self.por_responder.pop(proceso.nombre, None) is not None:
+            self.tabla.acumulador.responder(proceso, (slot + 1) * self.unidad)
+
+    def _ejecutar_nucleo(self, nucleo, slot, tiempo):
+        tabla = self.tabla
+        if self.sobrecarga[nucleo]:
+            self._pintar_sobrecarga(nucleo, slot, slot + 1)
+            return
+        actual = self.actuales[nucleo]
+        if not actual:
+            return
+        fase_actual = actual.obtener_fase_actual()
+        if fase_actual and fase_actual[0] == 'CPU':
+            if self.por_responder:
+                self._responder(actual, slot)
+            tabla._actualizar_tabla(actual.nombre, slot, 'x')
+            if self.nucleos > 1:
+                tabla._actualizar_tabla(f'CPU{nucleo + 1}', slot, actual.nombre)
+            actual.tiempo_restante_fase -= self.unidad
+            if self.con_quantum[nucleo]:
+                self.quantum_restante[nucleo] -= self.unidad
+            if actual.tiempo_restante_fase <= 0:
+                actual.avanzar_fase()
+                nueva_fase = actual.obtener_fase_actual()
+                if nueva_fase:
+                    if nueva_fase[0] != 'CPU':
+                        self._bloquear(actual, slot, nueva_fase[1])
+                        tabla.log_evento(tiempo, actual, EV_EJECUCION, EV_BLOQUEADO, valor=nueva_fase[1])
+                        self._liberar_cpu(nucleo)
+                    else:
+                        actual.tiempo_restante_fase = nueva_fase[1]
+                else:
+                    self._terminar(actual, tiempo, EV_EJECUCION)
+                    self._liberar_cpu(nucleo)
+
+    def _siguiente_evento(self, slot):
+        if self.esperando_so or (self.cola_listos and not all(self.actuales)):
+            return slot + 1
+        # Mientras el SO ocupa un núcleo no pasa nada más en él
+        candidatos = [slot + 1 + pendiente for pendiente in self.sobrecarga if pendiente] if self.costos is not None else []
+        llegada = self._proxima_llegada()
+        if llegada is not None:
+            candidatos.append(max(slot + 1, -(-llegada // self.unidad) - 1))
+        if self.fin_es:
+            candidatos.append(self.fin_es[0][0])
+        for nucleo, actual in enumerate(self.actuales):
+            if not actual:
+                continue
+            en_cpu = _en_cpu(actual)
+            if en_cpu:
+                candidatos.append(slot + _slots(actual.tiempo_restante_fase, self.unidad))
+            restante = self.quantum_restante[nucleo]
+            if self.con_quantum[nucleo] and (en_cpu or restante <= 0):
+                candidatos.append(slot + 1 + max(0, -(-restante // self.unidad)))
+        return min(candidatos) if candidatos else float('inf')
+
+    def agotara_quantum(self):
+        # Si el próximo paso agota la porción de quantum de algún núcleo. Hasta
+        # ese paso, una corrida con quantum mayor es idéntica a esta
+        if self.slot is None or self.slot == float('inf'):
+            return False
+        for nucleo, actual in enumerate(self.actuales):
+            # Con trabajo del SO pendiente el quantum no corre hasta el próximo paso
+            if actual and self.con_quantum[nucleo] and not actual.esta_terminado() and not self.sobrecarga[nucleo]:
+                restante = self.quantum_restante[nucleo]
+                if _en_cpu(actual):
+                    restante -= self.unidad * (self.slot - self.rellenado)
+                if restante <= 0:
+                    return True
+        return False
+
+    def cambiar_quantum(self, quantum):
+        # A diferencia de reconfigurar, lo que está en CPU conserva la parte de la
+        # porción ya usada: el motor queda como si hubiera corrido con este quantum
+        # desde el principio (válido si hasta acá ninguna porción se agotó)
+        cola = self.cola_listos
+        anteriores = [cola.politica(nucleo).quantum_para(actual) if actual and self.con_quantum[nucleo] else None
+                      for nucleo, actual in enumerate(self.actuales)]
+        for politica in (cola.colas if isinstance(cola, ColasPorNucleo) else [cola.base]):
+            politica.quantum = quantum
+            if isinstance(politica, PoliticaMLFQ):
+                # El quantum de cada nivel sale del base
+                politica.quantums = _quantums_mlfq(quantum, len(politica.colas))
+        for nucleo, anterior in enumerate(anteriores):
+            if anterior is not None:
+                self.quantum_restante[nucleo] += cola.politica(nucleo).quantum_para(self.actuales[nucleo]) - anterior
+        self.quantum = self.tabla.quantum = quantum
+        if self.slot is not None and self.rellenado:
+            self.slot = self._siguiente_evento(self.rellenado - 1)
+
+    def _rellenar(self, desde, hasta):
+        if desde >= hasta:
+            return
+        tabla = self.tabla
+        tabla._expandir_tabla_si_necesario(hasta - 1)
+        if self.cola_listos:
+            tabla._rellenar_tabla('LISTO', desde, hasta, self._listos())
+        if self.bloqueados:
+            tabla._rellenar_tabla('BLOQUEADOS', desde, hasta, self._nombres_bloqueados())
+            for dispositivo in self.dispositivos.values():
+                if dispositivo:
+                    tabla._rellenar_tabla(dispositivo.fila, desde, hasta, dispositivo.texto())
+        for nucleo, actual in enumerate(self.actuales):
+            if self.sobrecarga[nucleo]:
+                self._pintar_sobrecarga(nucleo, desde, hasta)
+            elif actual and _en_cpu(actual):
+                if self.por_responder:
+                    self._responder(actual, desde)
+                tabla._rellenar_tabla(actual.nombre, desde, hasta, 'x')
+                if self.nucleos > 1:
+                    tabla._rellenar_tabla(f'CPU{nucleo + 1}', desde, hasta, actual.nombre)
+                actual.tiempo_restante_fase -= self.unidad * (hasta - desde)
+                if self.con_quantum[nucleo]:
+                    self.quantum_restante[nucleo] -= self.unidad * (hasta - desde)
+
+def _requisito_tiempo(unidad):
+    return f"múltiplo de {unidad} y mayor o igual a 0" if unidad is not None else "un entero mayor o igual a 0"
+
+def _requisito_quantum(unidad):
+    return f"múltiplo de {unidad} y mayor que 0" if unidad is not None else "un entero mayor que 0"
+
+def crear_procesos(definiciones, dispositivos=None, unidad=UNIDAD_TIEMPO):
+    # Con unidad=None se acepta cualquier entero no negativo (la unidad sale después de la carga)
+    procesos = []
+    errores = []
+    nombres = set()
+    # Ráfagas iguales comparten la misma tupla en toda la carga
+    rafagas_vistas = {}
+    for i, (nombre, llegada, rafagas, *resto) in enumerate(definiciones):
+        prioridad = resto[0] if resto else 0
+        if not isinstance(prioridad, int):
+            errores.append(f"{nombre}: la prioridad debe ser un entero")
+        if nombre in nombres:
+            errores.append(f"proceso {i + 1}: nombre repetido '{nombre}'")
+        nombres.add(nombre)
+        if not es_multiplo(llegada, unidad):
+            errores.append(f"{nombre}: el tiempo de llegada debe ser {_requisito_tiempo(unidad)}")
+        if not rafagas:
+            errores.append(f"{nombre}: no tiene ráfagas")
+        for j, (tipo, duracion) in enumerate(rafagas):
+            if tipo not in ('CPU', 'ES') and not (isinstance(tipo, str) and tipo.startswith('ES:')):
+                errores.append(f"{nombre}: ráfaga {j + 1} de tipo desconocido '{tipo}'")
+            elif tipo[:3] == 'ES:' and tipo[3:] not in (dispositivos or {}):
+                errores.append(f"{nombre}: ráfaga {j + 1} en un dispositivo no configurado '{tipo[3:]}'")
+            elif not es_multiplo(duracion, unidad):
+                errores.append(f"{nombre}: la ráfaga {j + 1} ({tipo}) debe ser {_requisito_tiempo(unidad)}")
+        secuencia = []
+        for tipo, duracion in rafagas:
+            rafaga = (tipo, duracion)
+            secuencia.append(rafagas_vistas.setdefault(rafaga, rafaga))
+        procesos.append(Proceso(nombre, llegada, secuencia, prioridad))
+    if errores:
+        raise ValueError("Carga de trabajo inválida:\n  " + "\n  ".join(errores))
+    return procesos
+
+def unidad_tiempo(procesos):
+    # Mayor duración de slot que representa exactamente todas las llegadas y
+    # ráfagas: el MCD, la que menos slots simula. El paso por SO dura un slot,
+    # así que una carga que ya cabe en la grilla de UNIDAD_TIEMPO la conserva y
+    # da los mismos resultados de siempre. El quantum no entra: achicaría el
+    # slot y con él el paso por SO, y la misma carga daría otros tiempos según
+    # el quantum; tiene que ser múltiplo del slot que sale de la carga.
+    from math import gcd
+    valores = set()
+    for p in procesos:
+        valores.add(p.tiempo_llegada)
+        valores.update(duracion for _, duracion in p.secuencia_ejecucion)
+    unidad = gcd(*valores)
+    return UNIDAD_TIEMPO if unidad % UNIDAD_TIEMPO == 0 else unidad
+
+class ResultadoSimulacion:
+    def __init__(self, tabla, motivo_fin):
+        self.algoritmo = tabla.algoritmo
+        self.quantum = tabla.quantum
+        self.nucleos = tabla.nucleos
+        self.unidad = tabla.unidad
+        self.linea_tiempo = tabla.linea_tiempo
+        self.eventos = tabla.eventos_log
+        self.procesos = tabla.procesos
+        self.motivo_fin = motivo_fin
+        self.perfil = tabla.perfil
+        self.costos_so = tabla.costos_so
+        self.dispositivos = {nombre: d.a_dict(self.linea_tiempo.longitud, self.unidad) for nombre, d in tabla.uso_dispositivos.items()}
+        self._estadisticas = estadisticas_procesos(self.procesos, self.linea_tiempo, self.unidad)
+        self.resumen = None
+        if tabla.acumulador is not None:
+            self.resumen = tabla.acumulador.resumen(self.linea_tiempo.longitud * self.unidad, self.nucleos)
+        # Sin línea de tiempo las métricas salen del acumulador
+        self.metricas = tabla.metricas_sistema(self._estadisticas) if tabla.guardar_linea_tiempo else self.resumen
+
+    def estadisticas(self):
+        return self._estadisticas
+
+    def vista(self):
+        secciones = secciones_tabla(self.procesos, self.nucleos, self.dispositivos)
+        return VistaTabla(self.linea_tiempo, secciones, self.unidad, titulo_tabla(self.algoritmo, self.quantum))
+
+    def a_dict(self, incluir_eventos=True, incluir_linea_tiempo=True):
+        resultado = {
+            'algoritmo': self.algoritmo,
+            'quantum': self.quantum,
+            'nucleos': self.nucleos,
+            'unidad': self.unidad,
+            'motivo_fin': self.motivo_fin,
+            'metricas': self.metricas,
+            'procesos': self.estadisticas(),
+        }
+        if self.resumen is not None and self.resumen is not self.metricas:
+            resultado['resumen'] = self.resumen
+        if self.dispositivos:
+            resultado['dispositivos'] = self.dispositivos
+        if self.costos_so is not None:
+            resultado['costos_so'] = self.costos_so.a_dict()
+        if incluir_eventos:
+            resultado['eventos'] = list(self.eventos)
+        if incluir_linea_tiempo:
+            resultado['linea_tiempo'] = {
+                'columnas': self.linea_tiempo.longitud,
+                'filas': {fila: [list(s) for s in self.linea_tiempo.segmentos(fila)] for fila in self.linea_tiempo.filas},
+            }
+        return resultado
+
+CADA_SLOTS_PUNTO_CONTROL = 10000
+
+# Cambiarla invalida los resultados guardados por versiones anteriores
+VERSION_CACHE = 8
+MAX_BYTES_CACHE = 256 * 1024 * 1024
+
+class CargaCanonica(tuple):
+    # Carga inmutable de tuplas (nombre, llegada, ((tipo, duración), ...), prioridad):
+    # la misma carga da la misma forma venga de JSON, de una traza o de objetos
+    # Proceso. La huella se calcula una sola vez, así que consultar la caché con
+    # una CargaCanonica ya armada no vuelve a recorrer los procesos.
+    def __new__(cls, definiciones):
+        import hashlib, marshal
+        if isinstance(definiciones, CargaCanonica):
+            return definiciones
+        carga = super().__new__(cls, ((nombre, llegada, tuple((tipo, duracion) for tipo, duracion in rafagas), resto[0] if resto else 0)
+                                      for nombre, llegada, rafagas, *resto in map(_definicion, definiciones)))
+        # marshal versión 2 no usa referencias: los mismos valores dan los mismos bytes
+        carga.huella = hashlib.blake2b(marshal.dumps(tuple(carga), 2), digest_size=16).hexdigest()
+        return carga
+
+def huella_simulacion(algoritmo, carga, quantum=0, **opciones):
+    import hashlib
+    if algoritmo not in ALGORITMOS_CON_QUANTUM:
+        quantum = 0
+    texto = repr((VERSION_CACHE, algoritmo, quantum, sorted(opciones.items()), CargaCanonica(carga).huella))
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+class CacheResultados:
+    # Resultados ya simulados indexados por huella_simulacion. Un nivel en memoria
+    # (LRU de `capacidad` entradas) y, con `directorio`, otro en disco que pueden
+    # compartir varios procesos: cada resultado es un pickle que se escribe con
+    # os.replace (atómico) y, al pasar de `max_bytes`, se borran primero los
+    # archivos usados hace más tiempo. Los resultados devueltos son compartidos.
+    def __init__(self, capacidad=128, directorio=None, max_bytes=MAX_BYTES_CACHE):
+        import os
+        if not isinstance(capacidad, int) or capacidad < 0:
+            raise ValueError("La capacidad de la caché debe ser un entero mayor o igual a 0")
+        self.capacidad = capacidad
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.memoria = OrderedDict()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+
+    def __len__(self):
+        return len(self.memoria)
+
+    def configuracion(self):
+        return (self.capacidad, self.directorio, self.max_bytes)
+
+    def _ruta(self, clave):
+        import os
+        return os.path.join(self.directorio, clave + '.pkl')
+
+    def obtener(self, clave):
+        resultado = self.memoria.get(clave)
+        if resultado is not None:
+            self.memoria.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+        if self.directorio is not None:
+            resultado = self._leer(clave)
+            if resultado is not None:
+                self.aciertos_disco += 1
+                self._recordar(clave, resultado)
+                return resultado
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, resultado):
+        self._recordar(clave, resultado)
+        if self.directorio is not None:
+            self._escribir(clave, resultado)
+
+    def vaciar(self):
+        import os
+        self.memoria.clear()
+        if self.directorio is not None:
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith('.pkl'):
+                    try:
+                        os.remove(os.path.join(self.directorio, nombre))
+                    except FileNotFoundError:
+                        pass
+
+    def _recordar(self, clave, resultado):
+        if self.capacidad == 0:
+            return
+        self.memoria[clave] = resultado
+        self.memoria.move_to_end(clave)
+        while len(self.memoria) > self.capacidad:
+            self.memoria.popitem(last=False)
+
+    def _leer(self, clave):
+        import os, pickle
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                resultado = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Archivo de otra versión o ilegible: cuenta como ausente y se reescribe
+            return None
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return resultado
+
+    def _escribir(self, clave, resultado):
+        import os, pickle, sys, tempfile
+        datos = pickle.dumps(resultado, pickle.HIGHEST_PROTOCOL)
+        if len(datos) > self.max_bytes:
+            return
+        temporal = None
+        try:
+            fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, self._ruta(clave))
+        except OSError as e:
+            print(f"ADVERTENCIA: no se pudo guardar el resultado en la caché: {e}", file=sys.stderr)
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+            return
+        self._desalojar()
+
+    def _desalojar(self):
+        import os
+        archivos = []
+        total = 0
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                if not entrada.name.endswith('.pkl'):
+                    continue
+                try:
+                    info = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                archivos.append((info.st_mtime, info.st_size, entrada.path))
+                total += info.st_size
+        if total <= self.max_bytes:
+            return
+        archivos.sort()
+        for _, tamano, ruta in archivos:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                # Otro proceso lo desalojó primero
+                pass
+            total -= tamano
+
+def _crear_tabla(algoritmo, definiciones, quantum, motor, limite_slots, nucleos, colas_por_nucleo,
+                 capacidad_eventos, acumular, guardar_linea_tiempo, max_terminados, puntos_control=None, cada_slots=None,
+                 dispositivos=None, unidad=None, perfil=None, plantilla=None, costos_so=None):
+    # plantilla: procesos ya validados que se copian en lugar de leer definiciones (ver comparar)
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconocido '{algoritmo}' (use {', '.join(ALGORITMOS)})")
+    if unidad is not None and (not isinstance(unidad, int) or unidad < 1):
+        raise ValueError("La duración del slot debe ser un entero mayor o igual a 1")
+    if algoritmo in ALGORITMOS_CON_QUANTUM and (not es_multiplo(quantum, unidad) or quantum == 0):
+        # Con quantum 0 RR y MLFQ no expropiarían nunca: serían FIFO con otro nombre
+        raise ValueError(f"El quantum de {algoritmo} debe ser {_requisito_quantum(unidad)}")
+    tabla = TablaProcesos()
+    tabla.algoritmo = algoritmo
+    tabla.quantum = quantum if algoritmo in ALGORITMOS_CON_QUANTUM else 0
+    tabla.motor = motor
+    if not isinstance(nucleos, int) or nucleos < 1:
+        raise ValueError("La cantidad de núcleos debe ser un entero mayor o igual a 1")
+    tabla.limite_slots = limite_slots
+    tabla.nucleos = nucleos
+    tabla.colas_por_nucleo = colas_por_nucleo
+    tabla.capacidad_eventos = capacidad_eventos
+    tabla.guardar_linea_tiempo = guardar_linea_tiempo
+    if max_terminados is not None and (not isinstance(max_terminados, int) or max_terminados < 1):
+        raise ValueError("La cantidad de procesos terminados debe ser un entero mayor o igual a 1")
+    tabla.max_terminados = max_terminados
+    if dispositivos:
+        if motor != 'eventos':
+            raise ValueError("Los dispositivos de E/S requieren el motor por eventos")
+        for nombre, capacidad in dispositivos.items():
+            if not nombre or not isinstance(capacidad, int) or capacidad < 1:
+                raise ValueError(f"Dispositivo '{nombre}': la capacidad debe ser un entero mayor o igual a 1")
+        tabla.dispositivos = dict(dispositivos)
+    if puntos_control is not None:
+        import os
+        if motor != 'eventos':
+            raise ValueError("Los puntos de control requieren el motor por eventos")
+        if not isinstance(cada_slots, int) or cada_slots < 1:
+            raise ValueError("El intervalo entre puntos de control debe ser un entero mayor o igual a 1")
+        os.makedirs(puntos_control, exist_ok=True)
+        tabla.puntos_control = (puntos_control, cada_slots)
+    if costos_so is not None:
+        if motor != 'eventos':
+            raise ValueError("El costo del SO requiere el motor por eventos")
+        if not isinstance(costos_so, CostosSO):
+            raise ValueError("costos_so debe ser un CostosSO")
+        tabla.costos_so = costos_so
+    if acumular or not guardar_linea_tiempo:
+        tabla.acumulador = AcumuladorMetricas()
+    tabla.perfil = perfil
+    if plantilla is not None:
+        tabla.procesos = [p.copia() for p in plantilla]
+    else:
+        tabla.procesos = crear_procesos(definiciones, dispositivos, unidad)
+    # Sin unidad explícita, el slot es el MCD de los tiempos de la carga
+    tabla.unidad = unidad or unidad_tiempo(tabla.procesos)
+    if not es_multiplo(tabla.quantum, tabla.unidad):
+        raise ValueError(f"El quantum debe ser múltiplo de {tabla.unidad} (la duración del slot) y mayor que 0")
+    return tabla
+
+def simular(algoritmo, definiciones, quantum=0, motor='eventos', limite_slots=None, nucleos=1, colas_por_nucleo=False,
+            capacidad_eventos=None, acumular=False, guardar_linea_tiempo=True, max_terminados=None, cache=None,
+            puntos_control=None, cada_slots=CADA_SLOTS_PUNTO_CONTROL, dispositivos=None, unidad=None, perfil=None,
+            costos_so=None):
+    if perfil is not None or puntos_control is not None:
+        # Un resultado de la caché no dice nada del costo de simular ni deja
+        # los puntos de control en el directorio
+        cache = None
+    if cache is not None:
+        definiciones = CargaCanonica(definiciones)
+        clave = huella_simulacion(algoritmo, definiciones, quantum, motor=motor, limite_slots=limite_slots, nucleos=nucleos,
+                                  colas_por_nucleo=colas_por_nucleo, capacidad_eventos=capacidad_eventos, acumular=acumular,
+                                  guardar_linea_tiempo=guardar_linea_tiempo, max_terminados=max_terminados,
+                                  dispositivos=tuple(sorted(dispositivos.items())) if dispositivos else None, unidad=unidad,
+                                  costos_so=costos_so)
+        resultado = cache.obtener(clave)
+        if resultado is not None:
+            return resultado
+    tabla = _crear_tabla(algoritmo, definiciones, quantum, motor, limite_slots, nucleos, colas_por_nucleo,
+                         capacidad_eventos, acumular, guardar_linea_tiempo, max_terminados, puntos_control, cada_slots,
+                         dispositivos, unidad, perfil, costos_so=costos_so)
+    motivo = tabla.ejecutar()
+    resultado = ResultadoSimulacion(tabla, motivo)
+    if cache is not None:
+        cache.guardar(clave, resultado)
+    return resultado
+
+class FlujoSimulacion:
+    # Simulación que avanza a medida que se la itera: entrega cada evento
+    # (tiempo, proceso, desde, hacia, motivo, valor) apenas el motor lo produce.
+    # Dejar de iterar detiene el motor sin calcular el resto; resultado() arma
+    # el ResultadoSimulacion de lo simulado hasta ese momento.
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.motivo_fin = None
+        self._eventos = self._generar()
+
+    def __iter__(self):
+        return self._eventos
+
+    def _generar(self):
+        tabla = self.tabla
+        tabla.preparar_ejecucion()
+        motor = tabla.motor_eventos(tabla.algoritmo)
+        pendientes = tabla.pendientes = []
+        try:
+            for _ in motor.pasos():
+                if pendientes:
+                    yield from pendientes
+                    pendientes.clear()
+            # Eventos del último paso, que termina sin entregar el slot
+            yield from pendientes
+        finally:
+            tabla.pendientes = None
+        self.motivo_fin = motor.motivo_fin
+
+    def resultado(self):
+        self._eventos.close()
+        return ResultadoSimulacion(self.tabla, self.motivo_fin or FIN_INTERRUMPIDA)
+
+def simular_flujo(algoritmo, definiciones, quantum=0, limite_slots=None, max_terminados=None, nucleos=1,
+                  colas_por_nucleo=False, capacidad_eventos=CAPACIDAD_EVENTOS_FLUJO, guardar_linea_tiempo=False,
+                  dispositivos=None, unidad=None, perfil=None, costos_so=None):
+    # Por defecto no guarda línea de tiempo y acota la bitácora: la memoria no
+    # crece con el horizonte simulado
+    tabla = _crear_tabla(algoritmo, definiciones, quantum, 'eventos', limite_slots, nucleos, colas_por_nucleo,
+                         capacidad_eventos, True, guardar_linea_tiempo, max_terminados, dispositivos=dispositivos, unidad=unidad,
+                         perfil=perfil, costos_so=costos_so)
+    return FlujoSimulacion(tabla)
+
+class MotorAbierto(MotorEventos):
+    # Sistema abierto: los procesos salen de un iterable de definiciones
+    # ordenadas por llegada (puede no terminar nunca). Cada uno se crea recién
+    # al necesitar su llegada y se retira al terminar: el motor solo guarda los
+    # que están en el sistema y la próxima llegada. Sin puntos de control.
+    def __init__(self, tabla, llegadas, alg='FIFO', limite=None, nucleos=1, colas_por_nucleo=False):
+        super().__init__(tabla, alg, limite, nucleos, colas_por_nucleo)
+        self.llegadas = iter(llegadas)
+        self.proximo = None
+        self._tomar_proximo()
+
+    def _tomar_proximo(self):
+        definicion = next(self.llegadas, None)
+        if definicion is None:
+            self.proximo = None
+            return
+        proceso, = crear_procesos([definicion], self.tabla.dispositivos, self.unidad)
+        if self.proximo is not None and proceso.tiempo_llegada < self.proximo.tiempo_llegada:
+            raise ValueError(f"{proceso.nombre}: las llegadas deben venir ordenadas por tiempo"
+                             f" ({proceso.tiempo_llegada} después de {self.proximo.tiempo_llegada})")
+        proceso.tiempo_restante_fase = proceso.secuencia_ejecucion[0][1]
+        self.proximo = proceso
+
+    def _llegadas(self, slot, tiempo):
+        while self.proximo is not None and self.proximo.tiempo_llegada <= tiempo:
+            proceso = self.proximo
+            self._tomar_proximo()
+            self.siguiente_llegada += 1
+            self._a_so(proceso, slot, tiempo, EV_NUEVO)
+
+    def _proxima_llegada(self):
+        return self.proximo.tiempo_llegada if self.proximo is not None else None
+
+    def _terminar(self, proceso, tiempo, desde):
+        super()._terminar(proceso, tiempo, desde)
+        self.cola_listos.retirar(proceso)
+
+    def en_sistema(self):
+        return self.siguiente_llegada - self.terminados
+
+class ResultadoAbierto:
+    # Estado estacionario de una simulación abierta: las métricas cubren solo
+    # la ventana de medición (lo que terminó en ella, el tiempo de CPU y las
+    # colas dentro de ella); lo que quedó en el sistema al cerrarla no cuenta
+    def __init__(self, tabla, motor, calentamiento, en_sistema):
+        self.algoritmo = tabla.algoritmo
+        self.quantum = tabla.quantum
+        self.nucleos = tabla.nucleos
+        self.unidad = tabla.unidad
+        self.motivo_fin = motor.motivo_fin
+        self.eventos = tabla.eventos_log
+        self.perfil = tabla.perfil
+        self.costos_so = tabla.costos_so
+        self.calentamiento = calentamiento
+        fin = motor.rellenado * tabla.unidad
+        self.ventana = max(0, fin - calentamiento)
+        self.metricas = tabla.acumulador.resumen(max(fin, calentamiento), tabla.nucleos)
+        # Los que llegaron: el próximo ya está creado pero todavía no entró
+        self.metricas.update(en_sistema, procesos_creados=motor.siguiente_llegada, en_sistema_final=motor.en_sistema())
+        slots = self.ventana // tabla.unidad
+        self.dispositivos = {nombre: d.a_dict(slots, tabla.unidad) for nombre, d in motor.dispositivos.items()}
+
+    def a_dict(self, incluir_eventos=False):
+        resultado = {
+            'algoritmo': self.algoritmo,
+            'quantum': self.quantum,
+            'nucleos': self.nucleos,
+            'unidad': self.unidad,
+            'motivo_fin': self.motivo_fin,
+            'calentamiento': self.calentamiento,
+            'ventana': self.ventana,
+            'metricas': self.metricas,
+        }
+        if self.dispositivos:
+            resultado['dispositivos'] = self.dispositivos
+        if self.costos_so is not None:
+            resultado['costos_so'] = self.costos_so.a_dict()
+        if incluir_eventos:
+            resultado['eventos'] = list(self.eventos)
+        return resultado
+
+def simular_abierto(algoritmo, llegadas, quantum=0, ventana=None, calentamiento=0, nucleos=1, colas_por_nucleo=False,
+                    dispositivos=None, unidad=UNIDAD_TIEMPO, capacidad_eventos=CAPACIDAD_EVENTOS_FLUJO, perfil=None,
+                    costos_so=None):
+    # llegadas: definiciones ordenadas por llegada, p. ej. generar_carga(None)
+    # (sin fin) o leer_traza(ruta). Se simula hasta calentamiento + ventana y se
+    # mide solo la ventana; la memoria depende de los procesos en el sistema y
+    # de capacidad_eventos, no de cuántos llegaron. La unidad no se puede
+    # deducir de una carga que no se conoce entera: por defecto es UNIDAD_TIEMPO.
+    if unidad is None or not isinstance(unidad, int) or unidad < 1:
+        raise ValueError("La duración del slot debe ser un entero mayor o igual a 1")
+    if ventana is None or not es_multiplo(ventana, unidad) or ventana <= 0:
+        raise ValueError(f"La ventana de medición debe ser un múltiplo de {unidad} mayor que 0")
+    if not es_multiplo(calentamiento, unidad):
+        raise ValueError(f"El calentamiento debe ser {_requisito_tiempo(unidad)}")
+    fin = calentamiento + ventana
+    tabla = _crear_tabla(algoritmo, (), quantum, 'eventos', fin // unidad - 1, nucleos, colas_por_nucleo, capacidad_eventos,
+                         True, False, None, dispositivos=dispositivos, unidad=unidad, perfil=perfil, costos_so=costos_so)
+    tabla.preparar_ejecucion()
+    motor = MotorAbierto(tabla, llegadas, algoritmo, tabla.limite_slots, nucleos, colas_por_nucleo)
+    inicio = calentamiento // unidad
+    midiendo = inicio == 0
+    # Procesos en el sistema (llegados y no terminados), integrado en el tiempo;
+    # solo cambia en los pasos del motor
+    area = maximo = 0
+    anterior, desde = 0, calentamiento
+    for slot in motor.pasos():
+        tiempo = (slot + 1) * unidad
+        if midiendo:
+            area += anterior * (tiempo - desde)
+            desde = tiempo
+        anterior = motor.en_sistema()
+        if midiendo:
+            maximo = max(maximo, anterior)
+        elif motor.slot >= inicio:
+            # Los slots tranquilos hasta el corte son del calentamiento
+            motor._rellenar(motor.rellenado, inicio)
+            motor.rellenado = max(motor.rellenado, inicio)
+            tabla.acumulador.descartar_hasta(calentamiento)
+            for dispositivo in motor.dispositivos.values():
+                dispositivo.reiniciar_medicion()
+            midiendo = True
+            maximo = anterior
+    final = max(motor.rellenado * unidad, calentamiento)
+    if midiendo:
+        area += anterior * (final - desde)
+    else:
+        tabla.acumulador.descartar_hasta(calentamiento)
+    duracion = final - calentamiento
+    en_sistema = {'en_sistema_media': area / duracion if duracion else 0, 'en_sistema_max': maximo}
+    return ResultadoAbierto(tabla, motor, calentamiento, en_sistema)
+
+def imprimir_abierto(resultado, mostrar_eventos=False):
+    titulo = f"SISTEMA ABIERTO: {resultado.algoritmo}"
+    if resultado.algoritmo in ALGORITMOS_CON_QUANTUM:
+        titulo += f" (Quantum: {resultado.quantum})"
+    if resultado.nucleos > 1:
+        titulo += f" | Núcleos: {resultado.nucleos}"
+    if resultado.unidad != UNIDAD_TIEMPO:
+        titulo += f" | Slot: {resultado.unidad}"
+    print(titulo)
+    m = resultado.metricas
+    if resultado.motivo_fin != FIN_LIMITE:
+        print(f"ADVERTENCIA: Las llegadas se agotaron antes del fin de la ventana (t={m['tiempo_total']})")
+    print(f"Calentamiento: {resultado.calentamiento} | Ventana: {resultado.ventana} | Procesos creados: {m['procesos_creados']}"
+          f" | En el sistema al cerrar: {m['en_sistema_final']}")
+    print(f"Llegadas: {m['llegadas']} | Terminados: {m['terminados']} | Throughput: {m['throughput']:.3f}"
+          f" | Utilización: {m['utilizacion']:.1f}%")
+    if resultado.costos_so is not None:
+        print(f"Tiempo de CPU del SO: {m['cpu_so']} ({m['sobrecarga_so']:.1f}% de la CPU ocupada)")
+    print(f"En el sistema: media {m['en_sistema_media']:.2f}, máx {m['en_sistema_max']}"
+          f" | Cola de listos: media {m['cola_listos_media']:.2f}, máx {m['cola_listos_max']}")
+    for clave in ('retorno', 'espera', 'respuesta'):
+        if m[clave]['n']:
+            print(f"{clave.capitalize()}: media {m[clave]['media']:.1f} | p50 {m[clave]['p50']:.0f} | p90 {m[clave]['p90']:.0f}"
+                  f" | p99 {m[clave]['p99']:.0f} | máx {m[clave]['max']}")
+    print(f"Despachos: {m['despachos']} | Cambios de contexto: {m['cambios_contexto']} | Expropiaciones: {m['expropiaciones']}"
+          f" | Bloqueos por E/S: {m['bloqueos']}")
+    for nombre, d in resultado.dispositivos.items():
+        espera = '-' if d['espera_media'] is None else f"{d['espera_media']:.1f}"
+        print(f"Dispositivo {nombre} (x{d['capacidad']}): utilización {d['utilizacion']:.1f}% | atendidos {d['atendidos']}"
+              f" | espera en cola: media {espera}, máx {d['espera_max']} | cola máx {d['cola_max']}")
+    if mostrar_eventos:
+        print(f"\nÚLTIMOS EVENTOS ({len(resultado.eventos)} de {resultado.eventos.total}):")
+        for evento in resultado.eventos:
+            print(f"  {evento}")
+
+class PuntoControl:
+    # Foto del motor por eventos entre dos pasos: colas, bloqueados, núcleos,
+    # quantum restante, la fase de cada Proceso, la línea de tiempo, la bitácora
+    # y el acumulador, serializados con pickle. Cada reanudación parte de una
+    # copia nueva, así que el mismo punto se puede bifurcar varias veces.
+    def __init__(self, motor):
+        import pickle
+        self.slot = motor.rellenado
+        self.algoritmo = motor.alg
+        self.quantum = motor.quantum
+        self.motivo_fin = motor.motivo_fin
+        self.datos = pickle.dumps(motor, pickle.HIGHEST_PROTOCOL)
+
+    def guardar(self, ruta):
+        import os, pickle, tempfile
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        fd, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    def restaurar(self):
+        import pickle
+        return pickle.loads(self.datos)
+
+    def reanudar(self, algoritmo=None, quantum=None, limite_slots=False, max_terminados=False):
+        # Sin argumentos sigue igual que la corrida original; con ellos es una
+        # continuación "qué pasaría si" (ver MotorEventos.reconfigurar)
+        motor = self.restaurar()
+        motor.reconfigurar(algoritmo, quantum, limite_slots, max_terminados)
+        motor.ejecutar()
+        return ResultadoSimulacion(motor.tabla, motor.motivo_fin)
+
+    def bifurcar(self, variantes):
+        return [self.reanudar(**cambios) for cambios in variantes]
+
+def ruta_punto_control(directorio, slot):
+    import os
+    return os.path.join(directorio, f"punto_{slot:012d}.pkl")
+
+def listar_puntos_control(directorio):
     import os
-    os.system('cls' if os.name == 'nt' else 'clear')
+    return sorted(os.path.join(directorio, n) for n in os.listdir(directorio) if n.startswith('punto_') and n.endswith('.pkl'))
+
+def cargar_punto_control(ruta):
+    # Con un directorio se toma el punto más avanzado
+    import os, pickle
+    if os.path.isdir(ruta):
+        rutas = listar_puntos_control(ruta)
+        if not rutas:
+            raise ValueError(f"No hay puntos de control en {ruta}")
+        ruta = rutas[-1]
+    with open(ruta, 'rb') as f:
+        punto = pickle.load(f)
+    if not isinstance(punto, PuntoControl):
+        raise ValueError(f"{ruta} no es un punto de control")
+    return punto
+
+def _definicion(p):
+    return (p.nombre, p.tiempo_llegada, list(p.secuencia_original), p.prioridad) if isinstance(p, Proceso) else p
+
+def _definiciones(procesos):
+    return [_definicion(p) for p in procesos]
+
+def resumen_resultado(resultado):
+    m = resultado.metricas
+    return {
+        'algoritmo': resultado.algoritmo,
+        'quantum': resultado.quantum,
+        'utilizacion': m['utilizacion'],
+        'throughput': m['throughput'],
+        'retorno_medio': m['retorno_medio'],
+        'espera_media': m['espera_media'],
+        'respuesta_media': m['respuesta_media'],
+        'sobrecarga_so': m['sobrecarga_so'],
+        'terminados': m['terminados'],
+        'tiempo_total': m['tiempo_total'],
+        'motivo_fin': resultado.motivo_fin,
+    }
+
+_carga_barrido = None
+
+def _iniciar_trabajador_barrido(definiciones, opciones, cache=None):
+    global _carga_barrido
+    # Cada trabajador tiene su propio nivel en memoria; el de disco se comparte
+    if cache is not None:
+        opciones = dict(opciones, cache=CacheResultados(*cache))
+    _carga_barrido = (definiciones, opciones)
+
+def _ejecutar_configuracion(configuracion):
+    definiciones, opciones = _carga_barrido
+    algoritmo, quantum = configuracion
+    return resumen_resultado(simular(algoritmo, definiciones, quantum, **opciones))
+
+def configuraciones_barrido(algoritmos=('FIFO', 'RR'), quantums=()):
+    configuraciones = []
+    for algoritmo in algoritmos:
+        if algoritmo in ALGORITMOS_CON_QUANTUM:
+            configuraciones.extend((algoritmo, q) for q in quantums)
+        else:
+            configuraciones.append((algoritmo, 0))
+    return configuraciones
+
+def _procesos_comunes(definiciones, quantums, dispositivos, unidad):
+    # Valida la carga una vez y fija una sola granularidad para todas las
+    # configuraciones, así las corridas son comparables
+    if not all(es_multiplo(q, unidad) and q > 0 for q in quantums):
+        raise ValueError(f"Todos los quantum deben ser {_requisito_quantum(unidad)}")
+    procesos = crear_procesos(definiciones, dispositivos, unidad)
+    unidad = unidad or unidad_tiempo(procesos)
+    if not all(es_multiplo(q, unidad) for q in quantums):
+        raise ValueError(f"Todos los quantum deben ser múltiplos de {unidad} (la duración del slot)")
+    return procesos, unidad
+
+def _repartir(funcion, configuraciones, carga, opciones, trabajadores=None, cache=None):
+    # Corre funcion(configuracion) en un pool de procesos; la carga y las opciones
+    # llegan una sola vez a cada trabajador (ver _iniciar_trabajador_barrido)
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    trabajadores = max(1, min(trabajadores, len(configuraciones)))
+    if trabajadores == 1:
+        _iniciar_trabajador_barrido(carga, opciones if cache is None else dict(opciones, cache=cache))
+        return [funcion(c) for c in configuraciones]
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador_barrido,
+                             initargs=(carga, opciones, cache and cache.configuracion())) as pool:
+        return list(pool.map(funcion, configuraciones))
+
+def barrido(procesos, quantums, algoritmos=('FIFO', 'RR'), trabajadores=None, motor='eventos', limite_slots=None,
+            nucleos=1, colas_por_nucleo=False, cache=None, dispositivos=None, unidad=None, costos_so=None):
+    definiciones = _definiciones(procesos)
+    con_quantum = any(a in ALGORITMOS_CON_QUANTUM for a in algoritmos)
+    _, unidad = _procesos_comunes(definiciones, quantums if con_quantum else (), dispositivos, unidad)
+    if cache is not None:
+        definiciones = CargaCanonica(definiciones)
+    # El resumen no usa los eventos ni la línea de tiempo: alcanza con el acumulador
+    opciones = {'motor': motor, 'limite_slots': limite_slots, 'nucleos': nucleos, 'colas_por_nucleo': colas_por_nucleo,
+                'capacidad_eventos': 1, 'guardar_linea_tiempo': False, 'dispositivos': dispositivos, 'unidad': unidad,
+                'costos_so': costos_so}
+    return _repartir(_ejecutar_configuracion, configuraciones_barrido(algoritmos, quantums), definiciones, opciones,
+                     trabajadores, cache)
+
+def imprimir_barrido(filas):
+    def fmt(valor, decimales=1):
+        return '-' if valor is None else f"{valor:.{decimales}f}"
+    # La columna del SO solo aparece si alguna corrida tuvo costo del SO
+    con_so = any(f['sobrecarga_so'] for f in filas)
+    print(f"{'ALGORITMO':>13} {'QUANTUM':>8} {'UTIL %':>8} {'THROUGHPUT':>11} {'RETORNO':>9} {'ESPERA':>9} {'RESPUESTA':>9} {'TERMINADOS':>11}"
+          + (f" {'SO %':>7}" if con_so else ""))
+    for f in filas:
+        quantum = f['quantum'] if f['algoritmo'] in ALGORITMOS_CON_QUANTUM else '-'
+        print(f"{f['algoritmo']:>13} {quantum:>8} {fmt(f['utilizacion']):>8} {fmt(f['throughput'], 4):>11} "
+              f"{fmt(f['retorno_medio']):>9} {fmt(f['espera_media']):>9} {fmt(f['respuesta_media']):>9} {f['terminados']:>11}"
+              + (f" {fmt(f['sobrecarga_so']):>7}" if con_so else ""))
+    rr = [f for f in filas if f['algoritmo'] == 'RR' and f['retorno_medio'] is not None]
+    if rr:
+        mejor = min(rr, key=lambda f: f['retorno_medio'])
+        print(f"\nMejor quantum RR por retorno medio: {mejor['quantum']} ({mejor['retorno_medio']:.1f})")
+
+COLUMNAS_COMPARACION = 12
+METRICAS_COMPARACION = ('utilizacion', 'throughput', 'espera_media', 'retorno_medio', 'respuesta_media', 'cambios_contexto')
+
+def leer_configuraciones(texto):
+    # "FIFO,RR:20,RR:50" -> [('FIFO', 0), ('RR', 20), ('RR', 50)]
+    configuraciones = []
+    for parte in texto.split(','):
+        if parte.strip():
+            algoritmo, _, quantum = parte.partition(':')
+            algoritmo = algoritmo.strip().upper()
+            if algoritmo not in ALGORITMOS:
+                raise ValueError(f"Algoritmo desconocido '{algoritmo}' (use {', '.join(ALGORITMOS)})")
+            configuraciones.append((algoritmo, int(quantum) if quantum.strip() else 0))
+    return configuraciones
+
+def etiqueta_configuracion(algoritmo, quantum):
+    return f"{algoritmo} q={quantum}" if algoritmo in ALGORITMOS_CON_QUANTUM else algoritmo
+
+def _ejecutar_comparacion(configuracion):
+    plantilla, opciones = _carga_barrido
+    algoritmo, quantum = configuracion
+    tabla = _crear_tabla(algoritmo, None, quantum, plantilla=plantilla, **opciones)
+    return ResultadoSimulacion(tabla, tabla.ejecutar())
+
+def comparar(procesos, configuraciones, trabajadores=None, motor='eventos', limite_slots=None, nucleos=1,
+             colas_por_nucleo=False, dispositivos=None, unidad=None, costos_so=None):
+    # Corre cada (algoritmo, quantum) sobre la misma carga, en paralelo, y devuelve
+    # los ResultadoSimulacion completos en el mismo orden. La carga se valida una
+    # sola vez; cada corrida copia los procesos de esa plantilla (Proceso.copia),
+    # que comparten las secuencias de ráfagas en lugar de volver a leerlas.
+    configuraciones = [(a, q if a in ALGORITMOS_CON_QUANTUM else 0) for a, q in configuraciones]
+    quantums = [q for a, q in configuraciones if a in ALGORITMOS_CON_QUANTUM]
+    plantilla, unidad = _procesos_comunes(_definiciones(procesos), quantums, dispositivos, unidad)
+    # Los eventos no se comparan; el acumulador aporta los cambios de contexto
+    opciones = {'motor': motor, 'limite_slots': limite_slots, 'nucleos': nucleos, 'colas_por_nucleo': colas_por_nucleo,
+                'capacidad_eventos': 1, 'acumular': True, 'guardar_linea_tiempo': True, 'max_terminados': None,
+                'dispositivos': dispositivos, 'unidad': unidad, 'costos_so': costos_so}
+    return _repartir(_ejecutar_comparacion, configuraciones, plantilla, opciones, trabajadores)
+
+def _tramos_cpu(resultado):
+    # Por núcleo, los tramos (inicio, fin, proceso) en que ejecuta algo
+    linea = resultado.linea_tiempo
+    if resultado.nucleos > 1:
+        return [list(linea.segmentos(f'CPU{i + 1}')) for i in range(resultado.nucleos)]
+    tramos = [(a, b, p.nombre) for p in resultado.procesos if p.nombre in linea
+              for a, b, v in linea.segmentos(p.nombre) if v == 'x']
+    return [sorted(tramos)]
+
+def vista_comparacion(resultados):
+    # Una fila por configuración (y núcleo) con el proceso en CPU en cada slot,
+    # sobre el mismo eje de tiempo
+    filas = []
+    for r in resultados:
+        etiqueta = etiqueta_configuracion(r.algoritmo, r.quantum)
+        tramos = _tramos_cpu(r)
+        filas.extend((etiqueta if len(tramos) == 1 else f"{etiqueta} CPU{i + 1}", t) for i, t in enumerate(tramos))
+    linea = LineaTiempo([nombre for nombre, _ in filas], max((r.linea_tiempo.longitud for r in resultados), default=0))
+    for nombre, tramos in filas:
+        for a, b, valor in tramos:
+            linea.pintar(nombre, a, b, valor)
+    ancho = max([12] + [len(nombre) + 2 for nombre, _ in filas])
+    unidad = resultados[0].unidad if resultados else UNIDAD_TIEMPO
+    return VistaTabla(linea, [[nombre for nombre, _ in filas]], unidad, "COMPARACIÓN: PROCESO EN CPU", ancho_fila=ancho)
+
+def filas_comparacion(resultados):
+    # Métricas de cada configuración y su diferencia con la primera
+    filas = []
+    for r in resultados:
+        m = dict(r.metricas, cambios_contexto=r.resumen['cambios_contexto'] if r.resumen else None)
+        filas.append({'configuracion': etiqueta_configuracion(r.algoritmo, r.quantum), 'algoritmo': r.algoritmo,
+                      'quantum': r.quantum, 'terminados': m['terminados'], 'tiempo_total': m['tiempo_total'],
+                      'motivo_fin': r.motivo_fin, **{c: m[c] for c in METRICAS_COMPARACION}})
+    for f in filas:
+        f['diferencias'] = {c: None if f[c] is None or filas[0][c] is None else f[c] - filas[0][c] for c in METRICAS_COMPARACION}
+    return filas
+
+def imprimir_comparacion(resultados, columnas=COLUMNAS_COMPARACION):
+    def fmt(valor, decimales=1, signo=''):
+        return '-' if valor is None else f"{valor:{signo}.{decimales}f}"
+    vista = vista_comparacion(resultados)
+    if vista.columnas:
+        print(vista.ventana(0, columnas))
+        if vista.columnas > columnas:
+            print(f" Mostrando columnas 1-{columnas} de {vista.columnas} (--tabla RUTA para la tabla completa)")
+        print()
+    filas = filas_comparacion(resultados)
+    ancho = max([13] + [len(f['configuracion']) for f in filas])
+    decimales = {'throughput': 4, 'cambios_contexto': 0}
+    print(f"{'CONFIGURACIÓN':>{ancho}} " + " ".join(f"{c.upper():>16}" for c in METRICAS_COMPARACION))
+    for i, f in enumerate(filas):
+        celdas = []
+        for c in METRICAS_COMPARACION:
+            d = decimales.get(c, 1)
+            delta = f" ({fmt(f['diferencias'][c], d, '+')})" if i else ""
+            celdas.append(f"{fmt(f[c], d) + delta:>16}")
+        print(f"{f['configuracion']:>{ancho}} " + " ".join(celdas))
+    if len(filas) > 1:
+        print(f"\nEntre paréntesis, la diferencia con {filas[0]['configuracion']}")
+
+OBJETIVOS_QUANTUM = ('retorno_medio', 'respuesta_p95', 'cambios_contexto')
+# Cada cuántos pasos una rama ya separada de las demás compara su cota con el mejor valor
+PASOS_COTA_QUANTUM = 64
+
+def _percentil_exacto(valores, p):
+    # Por rango más cercano: el menor valor que deja al menos p de la muestra debajo o igual
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    return ordenados[max(0, -(-int(p * 100) * len(ordenados) // 100) - 1)]
+
+def _valor_objetivo(objetivo, suma, n, cambios, respuestas):
+    if objetivo == 'retorno_medio':
+        return suma / n if n else None
+    if objetivo == 'respuesta_p95':
+        return _percentil_exacto(respuestas, 0.95)
+    return cambios
+
+def _sistema_vacio(motor):
+    # Sin procesos en el sistema lo que sigue solo depende de las llegadas
+    # pendientes y del quantum (ver optimizar_quantum)
+    return (not motor.cola_listos and not motor.esperando_so and not motor.bloqueados and not motor.fin_es
+            and not any(motor.actuales) and not any(d.cola or d.en_servicio for d in motor.dispositivos.values()))
+
+def _trabajo_restante(proceso):
+    # Tiempo de CPU y E/S que le falta como mínimo (sin la E/S en curso)
+    if proceso.estado == Estado.NUEVO:
+        return proceso.total_cpu + proceso.total_es
+    fases = proceso.secuencia_ejecucion
+    resto = sum(d for _, d in fases[proceso.indice_actual + 1:])
+    if proceso.indice_actual < len(fases) and proceso.estado != Estado.BLOQUEADO:
+        resto += proceso.tiempo_restante_fase
+    return resto
+
+def _cota_objetivo(objetivo, motor, salteado, trabajo_futuro):
+    # Cota inferior del valor final de la corrida en curso; vale si todos los
+    # procesos terminan (optimizar_quantum solo poda en ese caso). salteado es
+    # lo que aportaron los períodos que la corrida no simuló y trabajo_futuro[k],
+    # el trabajo de los procesos que llegan desde el k-ésimo
+    acumulador = motor.tabla.acumulador
+    suma, _, cambios, respuestas = salteado
+    if objetivo == 'cambios_contexto':
+        return acumulador.cambios_contexto + cambios
+    ahora = motor.rellenado * motor.unidad
+    # Los que todavía no llegaron aportan al menos su trabajo (retorno) o 0 (respuesta)
+    en_sistema = [p for p in dict.fromkeys(chain(motor.cola_listos, motor.actuales, motor.bloqueados, motor.esperando_so))
+                  if p is not None and p.estado != Estado.TERMINADO]
+    if objetivo == 'retorno_medio':
+        total = (acumulador.retorno.suma + suma + trabajo_futuro[motor.siguiente_llegada]
+                 + sum(max(ahora, p.tiempo_llegada) + _trabajo_restante(p) - p.tiempo_llegada for p in en_sistema))
+        return total / len(motor.procesos_ordenados)
+    despachados = acumulador._despachados
+    futuros = len(motor.procesos_ordenados) - motor.siguiente_llegada
+    return _percentil_exacto(acumulador.respuestas + respuestas + [0] * futuros
+                             + [max(0, ahora - p.tiempo_llegada) for p in en_sistema
+                                if p.nombre not in despachados or p.nombre in motor.por_responder], 0.95)
+
+def _saltar_periodo(motor, desde, periodo):
+    # Deja al motor como al final del período ocupado que empieza con la llegada
+    # `desde`, sin simularlo: el sistema está vacío antes y después
+    hasta, slot, rellenado = periodo[:3]
+    for proceso in motor.procesos_ordenados[desde:hasta]:
+        proceso.estado = Estado.TERMINADO
+    motor.terminados += hasta - desde
+    motor.siguiente_llegada = hasta
+    motor.slot, motor.rellenado = slot, rellenado
+
+def _mejor(valor, otro):
+    return otro is None or (valor is not None and valor < otro)
+
+def optimizar_quantum(procesos, objetivo='retorno_medio', quantums=None, nucleos=1, colas_por_nucleo=False,
+                      dispositivos=None, unidad=None, podar=True, costos_so=None):
+    # Mejor quantum de RR para la carga según el objetivo. Corridas con quantum
+    # distinto son idénticas hasta que la de menor quantum agota una porción, así
+    # que los quantum se recorren de menor a mayor en una sola cadena: cada corrida
+    # guarda un punto de control justo antes de su primera porción agotada y las
+    # de quantum mayor siguen desde ahí (MotorEventos.cambiar_quantum). Si una
+    # corrida nunca agota una porción, todos los quantum mayores dan lo mismo; un
+    # quantum mayor que la ráfaga de CPU más larga equivale a ese máximo.
+    # Lo mismo vale por período ocupado: con el sistema vacío antes de la llegada
+    # k, lo que pasa hasta que se vuelve a vaciar solo depende de k y del quantum,
+    # y si una corrida lo atravesó sin agotar ninguna porción, las de quantum
+    # mayor lo repiten igual. Esos períodos se guardan en `periodos` y se saltan.
+    # Una vez separada, una corrida cuya cota inferior ya supera al mejor valor
+    # también se corta.
+    if objetivo not in OBJETIVOS_QUANTUM:
+        raise ValueError(f"Objetivo desconocido '{objetivo}' (opciones: {', '.join(OBJETIVOS_QUANTUM)})")
+    if quantums is not None and not all(isinstance(q, int) and q > 0 for q in quantums):
+        raise ValueError("Los quantum a evaluar deben ser enteros mayores que 0")
+    definiciones = _definiciones(procesos)
+    plantilla, unidad = _procesos_comunes(definiciones, quantums or (), dispositivos, unidad)
+    rafaga_max = max((d for p in plantilla for t, d in p.secuencia_ejecucion if t == 'CPU'), default=0)
+    tope = max(1, _slots(rafaga_max, unidad)) * unidad
+    candidatos = sorted(set(quantums)) if quantums is not None else list(range(unidad, tope + 1, unidad))
+    pendientes = sorted({min(q, tope) for q in candidatos})
+    # Un proceso que empieza por E/S o con dos E/S seguidas deja la corrida sin
+    # progreso (no todos terminan) y las cotas no valen
+    podar = podar and all(p.secuencia_ejecucion[0][0] == 'CPU' and
+                          all(a[0] == 'CPU' or b[0] == 'CPU' for a, b in zip(p.secuencia_ejecucion, p.secuencia_ejecucion[1:]))
+                          for p in plantilla)
+    guardar_respuestas = objetivo == 'respuesta_p95'
+    tabla = _crear_tabla('RR', None, pendientes[0] if pendientes else unidad, 'eventos', None, nucleos, colas_por_nucleo,
+                         1, False, False, None, dispositivos=dispositivos, unidad=unidad, plantilla=plantilla,
+                         costos_so=costos_so)
+    tabla.acumulador = AcumuladorMetricas(guardar_respuestas=guardar_respuestas)
+    tabla.preparar_ejecucion()
+    motor = tabla.motor_eventos('RR')
+    trabajo_futuro = list(accumulate((p.total_cpu + p.total_es for p in reversed(motor.procesos_ordenados)), initial=0))[::-1]
+    # Lo aportado por los períodos salteados: suma de retornos, terminados,
+    # cambios de contexto y respuestas
+    salteado = (0, 0, 0, [])
+    # Período en curso: (llegada que lo abrió, suma, terminados, cambios, respuestas, expropiaciones)
+    abierto = None
+    valores, cotas, periodos = {}, {}, {}
+    mejor = None
+    pasos_totales = corridas = saltados = 0
+    while pendientes:
+        quantum = pendientes.pop(0)
+        if motor.quantum != quantum:
+            motor.cambiar_quantum(quantum)
+        corridas += 1
+        rama = None
+        acumulador = tabla.acumulador
+        pasos = motor.pasos()
+        contador = 0
+        while True:
+            if rama is None and pendientes and motor.agotara_quantum():
+                rama = (PuntoControl(motor), salteado, abierto)
+            if motor.siguiente_llegada < len(motor.procesos_ordenados) and _sistema_vacio(motor):
+                k = motor.siguiente_llegada
+                if abierto is None or abierto[0] != k:
+                    # En RR toda expropiación es una porción agotada
+                    if abierto is not None and abierto[5] == acumulador.expropiaciones and abierto[0] not in periodos:
+                        desde_k, suma_k, n_k, cambios_k, respuestas_k, _ = abierto
+                        periodos[desde_k] = (k, motor.slot, motor.rellenado, acumulador.retorno.suma - suma_k,
+                                             acumulador.retorno.n - n_k, acumulador.cambios_contexto - cambios_k,
+                                             acumulador.respuestas[respuestas_k:] if guardar_respuestas else [])
+                    periodo = periodos.get(k)
+                    if periodo is not None:
+                        _saltar_periodo(motor, k, periodo)
+                        salteado = tuple(a + b for a, b in zip(salteado, periodo[3:]))
+                        abierto = None
+                        saltados += 1
+                        continue
+                    abierto = (k, acumulador.retorno.suma, acumulador.retorno.n, acumulador.cambios_contexto,
+                               len(acumulador.respuestas) if guardar_respuestas else 0, acumulador.expropiaciones)
+            if podar and mejor is not None and (rama is not None or not pendientes) and contador % PASOS_COTA_QUANTUM == 0:
+                cota = _cota_objetivo(objetivo, motor, salteado, trabajo_futuro)
+                if cota > valores[mejor]:
+                    cotas[quantum] = cota
+                    break
+            if next(pasos, None) is None:
+                break
+            contador += 1
+        pasos_totales += contador
+        if quantum not in cotas:
+            suma, n, cambios, respuestas = salteado
+            valores[quantum] = _valor_objetivo(objetivo, acumulador.retorno.suma + suma, acumulador.retorno.n + n,
+                                               acumulador.cambios_contexto + cambios, acumulador.respuestas + respuestas
+                                               if guardar_respuestas else None)
+            if mejor is None or _mejor(valores[quantum], valores[mejor]):
+                mejor = quantum
+            if rama is None:
+                # Nunca agotó una porción: los quantum mayores siguen el mismo camino
+                for q in pendientes:
+                    valores[q] = valores[quantum]
+                pendientes = []
+        if rama is not None:
+            punto, salteado, abierto = rama
+            motor = punto.restaurar()
+            tabla = motor.tabla
+    curva = []
+    for q in candidatos:
+        efectivo = min(q, tope)
+        curva.append({'quantum': q, 'valor': valores.get(efectivo), 'cota': cotas.get(efectivo), 'podado': efectivo in cotas})
+    # El máximo se informa como el menor candidato que lo alcanza
+    mejor_quantum = next((q for q in candidatos if min(q, tope) == mejor), None)
+    return {
+        'objetivo': objetivo,
+        'unidad': unidad,
+        'mejor_quantum': mejor_quantum,
+        'mejor_valor': valores.get(mejor),
+        'curva': curva,
+        'corridas': corridas,
+        'periodos_salteados': saltados,
+        'pasos': pasos_totales,
+    }
+
+def imprimir_optimizacion(informe):
+    def fmt(valor):
+        return '-' if valor is None else f"{valor:.2f}"
+    print(f"{'QUANTUM':>8} {informe['objetivo'].upper():>16}")
+    for punto in informe['curva']:
+        valor = f"≥ {fmt(punto['cota'])} (podado)" if punto['podado'] else fmt(punto['valor'])
+        marca = "  <- mejor" if punto['quantum'] == informe['mejor_quantum'] else ""
+        print(f"{punto['quantum']:>8} {valor:>16}{marca}")
+    print(f"\nMejor quantum RR por {informe['objetivo']}: {informe['mejor_quantum']} ({fmt(informe['mejor_valor'])})"
+          f" | {informe['corridas']} ramas, {informe['periodos_salteados']} períodos ocupados sin simular,"
+          f" {informe['pasos']} pasos del motor")
+
+def limpiar_pantalla():
+    import os, sys
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        print("\033[2J\033[H", end="", flush=True)
 
 def menu_principal():
     tabla = TablaProcesos()
@@ -538,11 +3428,12 @@ def menu_principal():
             print("\n CONFIGURACIÓN INICIAL:")
             print("1. Configurar simulación FIFO")
             print("2. Configurar simulación Round Robin")
-            print("3. Usar ejemplo predefinido")
-            print("4. Salir")
+            print("3. Configurar otra política (SJF, SRTF, Prioridad, MLFQ)")
+            print("4. Usar ejemplo predefinido")
+            print("5. Salir")
         elif len(tabla.procesos) == 0:
             print(f"\n Algoritmo configurado: {tabla.algoritmo}")
-            if tabla.algoritmo == 'RR':
+            if tabla.algoritmo in ALGORITMOS_CON_QUANTUM:
                 print(f"   Quantum: {tabla.quantum}")
             print("\nCONFIGURACIÓN DE PROCESOS:")
             print("1. Agregar procesos manualmente")
@@ -551,7 +3442,7 @@ def menu_principal():
         else:
             print(f"\n✅ Configuración completada:")
             print(f"   • Algoritmo: {tabla.algoritmo}")
-            if tabla.algoritmo == 'RR':
+            if tabla.algoritmo in ALGORITMOS_CON_QUANTUM:
                 print(f"   • Quantum: {tabla.quantum}")
             print(f"   • Procesos: {len(tabla.procesos)}")
             print("\n EJECUCIÓN:")
@@ -575,8 +3466,10 @@ def menu_principal():
                         print("ERROR: Por favor ingresa un número válido para el quantum.")
                         input("Presiona Enter para continuar...")
                 elif opcion == '3':
-                    usar_ejemplo_predefinido(tabla)
+                    configurar_otra_politica(tabla)
                 elif opcion == '4':
+                    usar_ejemplo_predefinido(tabla)
+                elif opcion == '5':
                     print("👋 ¡Hasta luego!")
                     break
             elif len(tabla.procesos) == 0:
@@ -608,6 +3501,24 @@ def menu_principal():
             print(f"ERROR: {e}")
             input("Presiona Enter para continuar...")
 
+def configurar_otra_politica(tabla):
+    otras = [a for a in ALGORITMOS if a not in ('FIFO', 'RR')]
+    algoritmo = input(f"Selecciona política ({'/'.join(otras)}): ").upper().strip()
+    if algoritmo not in otras:
+        print("ERROR: Política no válida")
+        input("Presiona Enter para continuar...")
+        return
+    quantum = 0
+    if algoritmo in ALGORITMOS_CON_QUANTUM:
+        try:
+            quantum = int(input("Ingresa el quantum del primer nivel (múltiplo de 10): "))
+        except ValueError:
+            print("ERROR: Por favor ingresa un número válido para el quantum.")
+            input("Presiona Enter para continuar...")
+            return
+    tabla.configurar_simulacion(algoritmo, quantum)
+    input(f" Política {algoritmo} configurada. Presiona Enter para continuar...")
+
 def usar_ejemplo_predefinido(tabla):
     limpiar_pantalla()
     print("📖 EJEMPLO PREDEFINIDO - FIFO PUNTO 1")
@@ -616,21 +3527,24 @@ def usar_ejemplo_predefinido(tabla):
     print("   • P1: Llegada=0, Secuencia=CPU(10)→E/S(10)→CPU(10)→E/S(30)→CPU(10)")
     print("   • P2: Llegada=0, Secuencia=CPU(10)→E/S(50)→CPU(10)→E/S(20)→CPU(10)")
     print("   • P3: Llegada=110, Secuencia=CPU(10)")
-    algoritmo = input("\nSelecciona algoritmo (FIFO/RR): ").upper().strip()
-    if algoritmo == 'RR':
+    print("   • Prioridades (PRIORIDAD/PRIORIDAD_EXP): P1=2, P2=1, P3=0")
+    algoritmo = input(f"\nSelecciona algoritmo ({'/'.join(ALGORITMOS)}): ").upper().strip()
+    if algoritmo in ALGORITMOS_CON_QUANTUM:
         try:
             quantum = int(input("Ingresa quantum (múltiplo de 10): "))
-            tabla.configurar_simulacion('RR', quantum)
+            tabla.configurar_simulacion(algoritmo, quantum)
         except:
             print("ERROR Quantum inválido, usando FIFO")
             tabla.configurar_simulacion('FIFO')
+    elif algoritmo in ALGORITMOS:
+        tabla.configurar_simulacion(algoritmo)
     else:
         tabla.configurar_simulacion('FIFO')
-    tabla.agregar_proceso_predefinido('P1', 0, [('CPU', 10), ('ES', 10), ('CPU', 10), ('ES', 30), ('CPU', 10)])
-    tabla.agregar_proceso_predefinido('P2', 0, [('CPU', 10), ('ES', 50), ('CPU', 10), ('ES', 20), ('CPU', 10)])
-    tabla.agregar_proceso_predefinido('P3', 110, [('CPU', 10)])
+    tabla.agregar_proceso_predefinido('P1', 0, [('CPU', 10), ('ES', 10), ('CPU', 10), ('ES', 30), ('CPU', 10)], 2)
+    tabla.agregar_proceso_predefinido('P2', 0, [('CPU', 10), ('ES', 50), ('CPU', 10), ('ES', 20), ('CPU', 10)], 1)
+    tabla.agregar_proceso_predefinido('P3', 110, [('CPU', 10)], 0)
     print(f"✅ Ejemplo cargado con algoritmo {tabla.algoritmo}")
-    if tabla.algoritmo == 'RR':
+    if tabla.algoritmo in ALGORITMOS_CON_QUANTUM:
         print(f"   Quantum: {tabla.quantum}")
     input("Presiona Enter para continuar...")
 
@@ -639,13 +3553,12 @@ def configurar_procesos_manual(tabla):
     print("CONFIGURACIÓN MANUAL DE PROCESOS")
     print("="*50)
     print(f"Algoritmo: {tabla.algoritmo}")
-    if tabla.algoritmo == 'RR':
+    if tabla.algoritmo in ALGORITMOS_CON_QUANTUM:
         print(f"Quantum: {tabla.quantum}")
-    nombres_disponibles = ['P1', 'P2', 'P3', 'P4']
     try:
-        cantidad = int(input("\n¿Cuántos procesos quieres agregar? (1-4): "))
-        if cantidad < 1 or cantidad > 4:
-            print("ERROR Cantidad debe ser entre 1 y 4")
+        cantidad = int(input("\n¿Cuántos procesos quieres agregar?: "))
+        if cantidad < 1:
+            print("ERROR Cantidad debe ser al menos 1")
             input("Presiona Enter para continuar...")
             return
     except:
@@ -653,10 +3566,8 @@ def configurar_procesos_manual(tabla):
         input("Presiona Enter para continuar...")
         return
     procesos_agregados = 0
-    for nombre in nombres_disponibles:
-        if procesos_agregados >= cantidad:
-            break
-        if tabla.agregar_proceso_manual(nombre):
+    for i in range(cantidad):
+        if tabla.agregar_proceso_manual(f"P{i + 1}"):
             procesos_agregados += 1
         else:
             break
@@ -676,7 +3587,7 @@ def mostrar_configuracion_actual(tabla):
     print(" CONFIGURACIÓN ACTUAL")
     print("="*50)
     print(f"🔧 ALGORITMO: {tabla.algoritmo}")
-    if tabla.algoritmo == 'RR':
+    if tabla.algoritmo in ALGORITMOS_CON_QUANTUM:
         print(f"   Quantum: {tabla.quantum} unidades")
     print(f"\n PROCESOS ({len(tabla.procesos)} total):")
     for p in tabla.procesos:
@@ -692,5 +3603,706 @@ def mostrar_configuracion_actual(tabla):
     print("="*50)
     input("Presiona Enter para continuar...")
 
+def cargar_carga_json(ruta):
+    import json
+    with open(ruta, encoding='utf-8') as f:
+        contenido = json.load(f)
+    config = {}
+    if isinstance(contenido, dict):
+        config = {k: contenido[k] for k in ('algoritmo', 'quantum', 'unidad', 'dispositivos', 'costos_so') if k in contenido}
+        contenido = contenido.get('procesos', [])
+    definiciones = [(p['nombre'], p['llegada'], [tuple(r) for r in p['rafagas']], p.get('prioridad', 0)) for p in contenido]
+    return definiciones, config
+
+MAX_ERRORES_CARGA = 50
+
+def _lineas_archivo(ruta, usar_mmap=False):
+    # Produce (número de línea, texto) sin leer el archivo completo en memoria
+    if usar_mmap:
+        import mmap
+        with open(ruta, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                for numero, linea in enumerate(iter(mapa.readline, b''), 1):
+                    yield numero, linea.decode('utf-8')
+    else:
+        with open(ruta, encoding='utf-8', newline='') as f:
+            yield from enumerate(f, 1)
+
+def _definiciones_csv(lineas, errores):
+    # Una fila por ráfaga: nombre,llegada,tipo,duracion[,prioridad]. Las filas
+    # consecutivas con el mismo nombre forman un proceso.
+    import csv
+    lector = csv.reader(linea for _, linea in lineas)
+    actual = None
+    for campos in lector:
+        if len(campos) == 4:
+            campos.append('')
+        elif len(campos) != 5:
+            if any(c.strip() for c in campos):
+                errores.append(f"línea {lector.line_num}: se esperaban 4 o 5 columnas (nombre,llegada,tipo,duracion[,prioridad])")
+            continue
+        nombre, llegada, tipo, duracion, prioridad = campos
+        nombre = nombre.strip()
+        if lector.line_num == 1 and nombre.lower() == 'nombre':
+            continue
+        if tipo not in ('CPU', 'ES'):
+            # El nombre del dispositivo ('ES:disco') se respeta tal cual
+            prefijo, separador, dispositivo = tipo.strip().partition(':')
+            tipo = prefijo.upper() + separador + dispositivo
+        try:
+            llegada = int(llegada)
+            duracion = int(duracion)
+            prioridad = int(prioridad) if prioridad else 0
+        except ValueError:
+            errores.append(f"línea {lector.line_num}: llegada, duración y prioridad deben ser enteros")
+            continue
+        if actual is not None and actual[0] == nombre:
+            if actual[1] != llegada or actual[3] != prioridad:
+                errores.append(f"línea {lector.line_num}: {nombre} cambia de llegada o prioridad entre ráfagas")
+            actual[2].append((tipo, duracion))
+            continue
+        if actual is not None:
+            yield actual
+        actual = (nombre, llegada, [(tipo, duracion)], prioridad)
+    if actual is not None:
+        yield actual
+
+def _definiciones_jsonl(lineas, errores):
+    # Un objeto JSON por línea con el mismo formato que los procesos de cargar_carga_json
+    import json
+    for numero, linea in lineas:
+        if not linea.strip():
+            continue
+        try:
+            p = json.loads(linea)
+            yield (p['nombre'], p['llegada'], [(tipo, duracion) for tipo, duracion in p['rafagas']], p.get('prioridad', 0))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errores.append(f"línea {numero}: {type(e).__name__}: {e}")
+
+def leer_traza(ruta, formato=None, usar_mmap=False, errores=None):
+    if formato is None:
+        formato = 'jsonl' if ruta.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+    if formato not in ('csv', 'jsonl'):
+        raise ValueError(f"Formato de traza desconocido: {formato}")
+    if errores is None:
+        errores = []
+    lineas = _lineas_archivo(ruta, usar_mmap)
+    if formato == 'csv':
+        return _definiciones_csv(lineas, errores)
+    return _definiciones_jsonl(lineas, errores)
+
+def cargar_traza(ruta, formato=None, usar_mmap=False):
+    import gc
+    errores = []
+    # Sin ciclos que recolectar: pausar el GC evita recorrer millones de tuplas recién creadas
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        definiciones = list(leer_traza(ruta, formato, usar_mmap, errores))
+    finally:
+        if gc_activo:
+            gc.enable()
+    if errores:
+        extra = len(errores) - MAX_ERRORES_CARGA
+        mensaje = "\n  ".join(errores[:MAX_ERRORES_CARGA]) + (f"\n  ... y {extra} errores más" if extra > 0 else "")
+        raise ValueError(f"Traza inválida ({len(errores)} errores):\n  " + mensaje)
+    return definiciones
+
+def cargar_carga(ruta, usar_mmap=False):
+    if ruta.lower().endswith(('.csv', '.jsonl', '.ndjson')):
+        return cargar_traza(ruta, usar_mmap=usar_mmap), {}
+    return cargar_carga_json(ruta)
+
+LLEGADAS_SINTETICAS = ('poisson', 'rafagas')
+DISTRIBUCIONES_SINTETICAS = ('exponencial', 'pareto')
+
+def _redondear(valor, unidad=UNIDAD_TIEMPO, minimo=None):
+    return max(unidad if minimo is None else minimo, int(round(valor / unidad)) * unidad)
+
+def _muestra(rng, distribucion, media, alfa):
+    if distribucion == 'exponencial':
+        return rng.expovariate(1 / media)
+    # Pareto con la misma media: escala xm = media * (alfa - 1) / alfa
+    return media * (alfa - 1) / alfa * rng.paretovariate(alfa)
+
+def generar_carga(cantidad, semilla=None, llegadas='poisson', media_llegada=100, tamano_rafaga=10,
+                  distribucion='exponencial', media_cpu=30, media_es=40, fases_cpu=(1, 4), alfa=1.5, prioridad_max=0,
+                  dispositivos=None, unidad=UNIDAD_TIEMPO):
+    # Los tiempos se redondean a múltiplos de unidad (mínimo una unidad por ráfaga)
+    if llegadas not in LLEGADAS_SINTETICAS:
+        raise ValueError(f"Proceso de llegadas desconocido: {llegadas} (opciones: {', '.join(LLEGADAS_SINTETICAS)})")
+    if distribucion not in DISTRIBUCIONES_SINTETICAS:
+        raise ValueError(f"Distribución desconocida: {distribucion} (opciones: {', '.join(DISTRIBUCIONES_SINTETICAS)})")
+    if distribucion == 'pareto' and alfa <= 1:
+        raise ValueError("El parámetro alfa de Pareto debe ser mayor que 1 para que la media exista")
+    import random
+    rng = random.Random(semilla)
+    tipos_es = [f'ES:{d}' for d in dispositivos] if dispositivos else None
+    reloj = 0.0
+    restantes_rafaga = 0
+    # Con cantidad=None la carga no termina (simular_abierto)
+    for i in (range(cantidad) if cantidad is not None else count()):
+        if llegadas == 'poisson':
+            reloj += rng.expovariate(1 / media_llegada) if i else 0
+        else:
+            # Grupos de llegadas muy juntas (a 1/10 del intervalo medio) separados por
+            # pausas largas, de modo que la tasa media se mantiene cerca de 1/media_llegada
+            if restantes_rafaga == 0:
+                restantes_rafaga = 1 + (int(rng.expovariate(1 / (tamano_rafaga - 1))) if tamano_rafaga > 1 else 0)
+                pausa = media_llegada * (tamano_rafaga - (tamano_rafaga - 1) / 10)
+                reloj += rng.expovariate(1 / pausa) if i else 0
+            else:
+                reloj += rng.expovariate(10 / media_llegada)
+            restantes_rafaga -= 1
+        rafagas = []
+        for fase in range(rng.randint(*fases_cpu)):
+            if fase:
+                # Sin dispositivos no se sortea nada: la carga es la misma que antes para cada semilla
+                tipo = rng.choice(tipos_es) if tipos_es else 'ES'
+                rafagas.append((tipo, _redondear(_muestra(rng, distribucion, media_es, alfa), unidad)))
+            rafagas.append(('CPU', _redondear(_muestra(rng, distribucion, media_cpu, alfa), unidad)))
+        yield (f"P{i + 1}", _redondear(reloj, unidad, 0), rafagas, rng.randint(0, prioridad_max))
+
+def escribir_traza(definiciones, ruta, formato=None):
+    import csv, json
+    if formato is None:
+        formato = 'jsonl' if ruta.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+    if formato not in ('csv', 'jsonl'):
+        raise ValueError(f"Formato de traza desconocido: {formato}")
+    cantidad = 0
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        if formato == 'csv':
+            escritor = csv.writer(f)
+            escritor.writerow(('nombre', 'llegada', 'tipo', 'duracion', 'prioridad'))
+            for nombre, llegada, rafagas, *resto in map(_definicion, definiciones):
+                prioridad = resto[0] if resto else 0
+                escritor.writerows((nombre, llegada, tipo, duracion, prioridad) for tipo, duracion in rafagas)
+                cantidad += 1
+        else:
+            for nombre, llegada, rafagas, *resto in map(_definicion, definiciones):
+                f.write(json.dumps({'nombre': nombre, 'llegada': llegada, 'rafagas': rafagas,
+                                    'prioridad': resto[0] if resto else 0}, ensure_ascii=False) + "\n")
+                cantidad += 1
+    return cantidad
+
+FORMATOS_EXPORTACION = ('npz', 'csv')
+VERSION_EXPORTACION = 1
+# Campos por proceso que se exportan como enteros; None se guarda como NULO_EXPORTADO
+CAMPOS_NUMERICOS_PROCESO = ('llegada', 'prioridad', 'fin', 'retorno', 'espera', 'respuesta', 'cpu', 'es', 'veces_en_so')
+NULO_EXPORTADO = -1
+
+def _tablas_resultado(resultado):
+    eventos = resultado.eventos
+    linea, filas, textos = resultado.linea_tiempo.columnas()
+    estadisticas = resultado.estadisticas()
+    procesos = {c: array('q', [NULO_EXPORTADO if e[c] is None else e[c] for e in estadisticas]) for c in CAMPOS_NUMERICOS_PROCESO}
+    procesos['nombre'] = [e['nombre'] for e in estadisticas]
+    procesos['estado'] = [e['estado'] for e in estadisticas]
+    return {
+        'eventos': eventos.columnas(),
+        'nombres': {'nombre': eventos.nombres},
+        'motivos': {'motivo': eventos.textos_motivo},
+        'linea_tiempo': linea,
+        'filas': {'fila': filas},
+        'valores': {'valor': textos},
+        'procesos': procesos,
+    }
+
+def exportar_resultado(resultado, ruta, formato=None):
+    # Eventos, línea de tiempo y estadísticas en columnas. 'npz' (NumPy) es un solo
+    # archivo sin comprimir, con una escritura en bloque por columna; 'csv' es un
+    # directorio con un CSV por tabla y metadatos.json
+    import json
+    if formato is None:
+        formato = 'npz' if np is not None else 'csv'
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato de exportación desconocido: {formato} (opciones: {', '.join(FORMATOS_EXPORTACION)})")
+    if formato == 'npz' and np is None:
+        raise ValueError("El formato npz requiere NumPy; use formato='csv'")
+    tablas = _tablas_resultado(resultado)
+    metadatos = {
+        'version': VERSION_EXPORTACION,
+        'algoritmo': resultado.algoritmo,
+        'quantum': resultado.quantum,
+        'nucleos': resultado.nucleos,
+        'unidad': resultado.unidad,
+        'motivo_fin': resultado.motivo_fin,
+        'columnas': resultado.linea_tiempo.longitud,
+        'eventos_descartados': resultado.eventos.descartados,
+        'metricas': resultado.metricas,
+        'resumen': resultado.resumen,
+        'dispositivos': resultado.dispositivos,
+        'costos_so': resultado.costos_so.a_dict() if resultado.costos_so is not None else None,
+        'tipos': {t: {c: 'str' if isinstance(v, list) else v.typecode for c, v in columnas.items()} for t, columnas in tablas.items()},
+    }
+    texto = json.dumps(metadatos, ensure_ascii=False)
+    if formato == 'npz':
+        arreglos = {}
+        for t, columnas in tablas.items():
+            for c, v in columnas.items():
+                arreglos.update(_columnas_numpy(f'{t}/{c}', v))
+        arreglos['metadatos'] = np.frombuffer(texto.encode('utf-8'), dtype=np.uint8)
+        with open(ruta, 'wb') as f:
+            np.savez(f, **arreglos)
+    else:
+        import csv, os
+        os.makedirs(ruta, exist_ok=True)
+        for t, columnas in tablas.items():
+            with open(os.path.join(ruta, f'{t}.csv'), 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                escritor = csv.writer(f)
+                escritor.writerow(columnas)
+                escritor.writerows(zip(*columnas.values()))
+        with open(os.path.join(ruta, 'metadatos.json'), 'w', encoding='utf-8') as f:
+            f.write(texto)
+    return formato
+
+def _columnas_numpy(nombre, columna):
+    # Los textos van concatenados en UTF-8 con la posición donde termina cada uno
+    # (como en Arrow), no como cadenas de ancho fijo
+    if isinstance(columna, list):
+        codificados = [v.encode('utf-8') for v in columna]
+        return {nombre: _vector_tipo(b''.join(codificados), 'B'), f'{nombre}.fines': _vector_tipo(array('q', accumulate(map(len, codificados))), 'q')}
+    return {nombre: _vector_tipo(columna, columna.typecode)}
+
+def _vector_tipo(datos, tipo):
+    return np.frombuffer(datos, dtype=tipo) if len(datos) else np.zeros(0, dtype=tipo)
+
+def _textos(datos, fines):
+    texto = datos.tobytes()
+    fines = _enteros(fines)
+    return [texto[a:b].decode('utf-8') for a, b in zip([0] + fines[:-1], fines)]
+
+class ResultadoExportado:
+    # Resultado leído de exportar_resultado sin volver a simular. Las columnas
+    # numéricas (tablas[tabla][campo]) son arreglos de NumPy mapeados en memoria
+    # (npz) o array (csv), y las de texto, listas; eventos(), linea_tiempo() y
+    # estadisticas() las convierten a las formas de ResultadoSimulacion.
+    def __init__(self, metadatos, tablas, formato):
+        self.metadatos = metadatos
+        self.tablas = tablas
+        self.formato = formato
+        self.algoritmo = metadatos['algoritmo']
+        self.quantum = metadatos['quantum']
+        self.nucleos = metadatos['nucleos']
+        self.unidad = metadatos['unidad']
+        self.motivo_fin = metadatos['motivo_fin']
+        self.metricas = metadatos['metricas']
+        self.resumen = metadatos['resumen']
+        self.dispositivos = metadatos['dispositivos']
+        # Las exportaciones anteriores al costo del SO no traen la clave
+        costos = metadatos.get('costos_so')
+        self.costos_so = CostosSO(**costos) if costos else None
+
+    def __len__(self):
+        return len(self.tablas['eventos']['tiempo'])
+
+    def eventos(self):
+        # Tuplas (tiempo, proceso, desde, hacia, motivo, valor) como RegistroEventos.registros()
+        e = self.tablas['eventos']
+        nombres, motivos = list(self.tablas['nombres']['nombre']), list(self.tablas['motivos']['motivo'])
+        for tiempo, proceso, desde, hacia, motivo, valor in zip(*(_enteros(e[c]) for c in CAMPOS_EVENTO)):
+            yield (tiempo, nombres[proceso], NOMBRES_ESTADO_EVENTO[desde], NOMBRES_ESTADO_EVENTO[hacia],
+                   motivos[motivo] if motivo >= 0 else None, valor)
+
+    def linea_tiempo(self):
+        t = self.tablas['linea_tiempo']
+        filas, textos = list(self.tablas['filas']['fila']), list(self.tablas['valores']['valor'])
+        linea = LineaTiempo(filas, self.metadatos['columnas'])
+        ids = _enteros(t['fila'])
+        desde = 0
+        # Los tramos vienen agrupados por fila, en el orden de la lista de filas
+        for i, fila in enumerate(filas):
+            hasta = bisect_right(ids, i, desde)
+            inicios, fines, valores = linea.filas[fila]
+            inicios.extend(_enteros(t['inicio'][desde:hasta]))
+            fines.extend(_enteros(t['fin'][desde:hasta]))
+            valores.extend(textos[v] for v in _enteros(t['valor'][desde:hasta]))
+            desde = hasta
+        return linea
+
+    def estadisticas(self):
+        p = self.tablas['procesos']
+        columnas = {c: [None if v == NULO_EXPORTADO else v for v in _enteros(p[c])] for c in CAMPOS_NUMERICOS_PROCESO}
+        columnas['nombre'] = p['nombre']
+        columnas['estado'] = p['estado']
+        return [dict(zip(columnas, valores)) for valores in zip(*columnas.values())]
+
+    def a_dict(self, incluir_eventos=True, incluir_linea_tiempo=True):
+        resultado = {
+            'algoritmo': self.algoritmo,
+            'quantum': self.quantum,
+            'nucleos': self.nucleos,
+            'unidad': self.unidad,
+            'motivo_fin': self.motivo_fin,
+            'metricas': self.metricas,
+            'procesos': self.estadisticas(),
+        }
+        if self.resumen is not None and self.resumen != self.metricas:
+            resultado['resumen'] = self.resumen
+        if self.dispositivos:
+            resultado['dispositivos'] = self.dispositivos
+        if self.costos_so is not None:
+            resultado['costos_so'] = self.costos_so.a_dict()
+        if incluir_eventos:
+            resultado['eventos'] = [formatear_evento(e) for e in self.eventos()]
+        if incluir_linea_tiempo:
+            linea = self.linea_tiempo()
+            resultado['linea_tiempo'] = {
+                'columnas': linea.longitud,
+                'filas': {fila: [list(s) for s in linea.segmentos(fila)] for fila in linea.filas},
+            }
+        return resultado
+
+def _enteros(columna):
+    # Enteros de Python: con NumPy, tolist() convierte toda la columna de una vez
+    return columna.tolist() if np is not None and isinstance(columna, np.ndarray) else columna
+
+def cargar_resultado(ruta):
+    # Un archivo .npz se mapea en memoria (requiere NumPy); un directorio se lee como CSV
+    import os
+    if os.path.isdir(ruta):
+        return _cargar_csv(ruta)
+    if np is None:
+        raise ValueError(f"Leer {ruta} requiere NumPy")
+    return _cargar_npz(ruta)
+
+def _cargar_npz(ruta):
+    # np.savez guarda cada columna sin comprimir: se ubica su encabezado .npy
+    # dentro del zip y el arreglo queda como vista sobre un único mmap del archivo
+    import json, mmap, struct, zipfile
+    columnas = {}
+    with zipfile.ZipFile(ruta) as z, open(ruta, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for info in z.infolist():
+            if info.compress_type != zipfile.ZIP_STORED or not info.filename.endswith('.npy'):
+                raise ValueError(f"{ruta}: {info.filename} no es una columna sin comprimir")
+            f.seek(info.header_offset + 26)
+            largo_nombre, largo_extra = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+            version = np.lib.format.read_magic(f)
+            leer = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            forma, _, tipo = leer(f)
+            if tipo.hasobject or len(forma) != 1:
+                raise ValueError(f"{ruta}: {info.filename} no es una columna exportada")
+            if forma[0]:
+                columna = np.frombuffer(mapa, dtype=tipo, count=forma[0], offset=f.tell())
+            else:
+                columna = np.zeros(0, dtype=tipo)
+            columnas[info.filename[:-len('.npy')]] = columna
+    if 'metadatos' not in columnas:
+        raise ValueError(f"{ruta} no es un resultado exportado")
+    metadatos = json.loads(columnas['metadatos'].tobytes().decode('utf-8'))
+    tablas = {}
+    for tabla, tipos in metadatos['tipos'].items():
+        tablas[tabla] = {}
+        for campo, tipo in tipos.items():
+            nombre = f'{tabla}/{campo}'
+            tablas[tabla][campo] = _textos(columnas[nombre], columnas[f'{nombre}.fines']) if tipo == 'str' else columnas[nombre]
+    return ResultadoExportado(metadatos, tablas, 'npz')
+
+def _cargar_csv(ruta):
+    import csv, gc, json, os
+    with open(os.path.join(ruta, 'metadatos.json'), encoding='utf-8') as f:
+        metadatos = json.load(f)
+    tablas = {}
+    # Igual que en cargar_traza: sin el GC recorriendo las filas recién leídas
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        for tabla, tipos in metadatos['tipos'].items():
+            with open(os.path.join(ruta, f'{tabla}.csv'), encoding='utf-8', newline='') as f:
+                lector = csv.reader(f)
+                campos = next(lector)
+                columnas = list(zip(*lector)) or [()] * len(campos)
+            tablas[tabla] = {c: list(v) if tipos[c] == 'str' else array(tipos[c], map(int, v)) for c, v in zip(campos, columnas)}
+    finally:
+        if gc_activo:
+            gc.enable()
+    return ResultadoExportado(metadatos, tablas, 'csv')
+
+def imprimir_resultado(resultado, mostrar_eventos=False):
+    titulo = f"ALGORITMO: {resultado.algoritmo}"
+    if resultado.algoritmo in ALGORITMOS_CON_QUANTUM:
+        titulo += f" (Quantum: {resultado.quantum})"
+    if resultado.nucleos > 1:
+        titulo += f" | Núcleos: {resultado.nucleos}"
+    if resultado.unidad != UNIDAD_TIEMPO:
+        titulo += f" | Slot: {resultado.unidad}"
+    print(titulo)
+    if resultado.motivo_fin in MENSAJES_FIN:
+        print(MENSAJES_FIN[resultado.motivo_fin])
+    m = resultado.metricas
+    print(f"Tiempo total: {m['tiempo_total']} | CPU ocupado: {m['cpu_ocupado']} | Utilización: {m['utilizacion']:.1f}%"
+          f" | Terminados: {m['terminados']}/{len(resultado.procesos)} | Throughput: {m['throughput']:.3f}")
+    if m['retorno_medio'] is not None:
+        print(f"Retorno medio: {m['retorno_medio']:.1f} | Espera media: {m['espera_media']:.1f} | Respuesta media: {m['respuesta_media']:.1f}"
+              f" | Cola de listos: media {m['cola_listos_media']:.2f}, máx {m['cola_listos_max']}")
+    if resultado.costos_so is not None:
+        print(f"Tiempo de CPU del SO: {m['cpu_so']} ({m['sobrecarga_so']:.1f}% de la CPU ocupada) | Costos: "
+              + ", ".join(f"{c}={v}" for c, v in resultado.costos_so.a_dict().items() if v))
+    if resultado.resumen is not None:
+        r = resultado.resumen
+        for clave in ('retorno', 'espera', 'respuesta'):
+            if r[clave]['n']:
+                print(f"{clave.capitalize()}: p50 {r[clave]['p50']:.0f} | p90 {r[clave]['p90']:.0f} | p99 {r[clave]['p99']:.0f}"
+                      f" | máx {r[clave]['max']}")
+        print(f"Despachos: {r['despachos']} | Cambios de contexto: {r['cambios_contexto']} | Expropiaciones: {r['expropiaciones']}"
+              f" | Bloqueos por E/S: {r['bloqueos']}")
+    for nombre, d in resultado.dispositivos.items():
+        espera = '-' if d['espera_media'] is None else f"{d['espera_media']:.1f}"
+        print(f"Dispositivo {nombre} (x{d['capacidad']}): utilización {d['utilizacion']:.1f}% | atendidos {d['atendidos']}"
+              f" | espera en cola: media {espera}, máx {d['espera_max']} | cola máx {d['cola_max']}")
+    columnas = ['nombre', 'llegada', 'fin', 'retorno', 'espera', 'respuesta', 'cpu', 'es', 'veces_en_so', 'estado']
+    print(" ".join(f"{c.upper():>11}" for c in columnas))
+    for e in resultado.estadisticas():
+        print(" ".join(f"{'-' if e[c] is None else e[c]:>11}" for c in columnas))
+    if mostrar_eventos:
+        print("\nEVENTOS:")
+        for evento in resultado.eventos:
+            print(f"  {evento}")
+
+def main(argv=None):
+    import argparse, json, sys
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        menu_principal()
+        return 0
+    parser = argparse.ArgumentParser(description="Simulador de planificación de CPU (modo por lotes)")
+    parser.add_argument('carga', nargs='?', help="archivo con los procesos a simular (.json, o traza .csv/.jsonl)")
+    parser.add_argument('--algoritmo', choices=ALGORITMOS, help="algoritmo de planificación (por defecto el del archivo o FIFO)")
+    parser.add_argument('--quantum', type=int, help="quantum para RR")
+    parser.add_argument('--motor', choices=('eventos', 'ticks'), default='eventos')
+    parser.add_argument('--limite', type=int, default=None, help="máximo de slots a simular")
+    parser.add_argument('--unidad', type=int, default=None, help="duración de un slot (por defecto el MCD de los tiempos de la carga)")
+    parser.add_argument('--nucleos', type=int, default=1, help="cantidad de CPUs (por defecto 1)")
+    parser.add_argument('--colas-por-nucleo', action='store_true', help="una cola de listos por núcleo con robo de trabajo")
+    parser.add_argument('--dispositivos', metavar='NOMBRE=CAP,...', help="dispositivos de E/S con su capacidad (ráfagas 'ES:NOMBRE')")
+    parser.add_argument('--costos-so', metavar='COSTO=T,...', help="tiempo de CPU del SO por despacho, cambio de contexto,"
+                        " fin de E/S y proceso listo (despacho, cambio_contexto, interrupcion_es, por_listo)")
+    parser.add_argument('--formato', choices=('texto', 'json'), default='texto')
+    parser.add_argument('--eventos', action='store_true', help="incluir el registro de eventos")
+    parser.add_argument('--perfil', action='store_true', help="medir el costo de cada fase del motor (informe en la salida de errores)")
+    parser.add_argument('--tabla', metavar='RUTA', help="escribir la tabla completa de la línea de tiempo en RUTA")
+    parser.add_argument('--exportar', metavar='RUTA', help="exportar eventos, línea de tiempo y estadísticas en columnas"
+                                                          " (.npz con NumPy; si no, un directorio de CSV)")
+    parser.add_argument('--max-eventos', type=int, default=None, metavar='N', help="conservar solo los últimos N eventos")
+    parser.add_argument('--sin-linea-tiempo', action='store_true', help="no guardar la línea de tiempo; métricas calculadas en línea")
+    parser.add_argument('--max-terminados', type=int, default=None, metavar='K', help="detener la simulación al terminar K procesos")
+    parser.add_argument('--flujo', action='store_true', help="imprimir cada evento apenas ocurre (memoria constante, motor por eventos)")
+    parser.add_argument('--barrido', metavar='Q1,Q2,...', help="comparar los algoritmos con cada quantum de la lista")
+    parser.add_argument('--algoritmos', default='FIFO,RR', help="algoritmos a comparar en --barrido (por defecto FIFO,RR)")
+    parser.add_argument('--comparar', metavar='ALG[:Q],...', help="comparar configuraciones sobre la misma carga (p. ej. FIFO,RR:20,RR:50)")
+    parser.add_argument('--trabajadores', type=int, default=None, help="procesos en paralelo para --barrido y --comparar")
+    parser.add_argument('--optimizar-quantum', choices=OBJETIVOS_QUANTUM, metavar='OBJETIVO',
+                        help=f"buscar el mejor quantum de RR según {', '.join(OBJETIVOS_QUANTUM)}"
+                             " (por defecto prueba todos los múltiplos de la unidad, o los de --barrido)")
+    parser.add_argument('--abierto', action='store_true', help="sistema abierto: los procesos llegan sin parar (--generar N, o 0 sin"
+                                                                " fin, o una traza leída en streaming) y se mide el estado estacionario")
+    parser.add_argument('--ventana', type=int, metavar='T', help="con --abierto, duración de la ventana de medición")
+    parser.add_argument('--calentamiento', type=int, default=0, metavar='T', help="con --abierto, tiempo simulado antes de medir")
+    parser.add_argument('--mmap', action='store_true', help="leer las trazas .csv/.jsonl con mmap")
+    parser.add_argument('--cache', metavar='DIR', help="reutilizar resultados ya simulados guardados en DIR")
+    parser.add_argument('--puntos-control', metavar='DIR', help="guardar puntos de control en DIR durante la simulación")
+    parser.add_argument('--cada', type=int, default=CADA_SLOTS_PUNTO_CONTROL, metavar='N', help="slots entre puntos de control")
+    parser.add_argument('--reanudar', metavar='RUTA', help="seguir desde un punto de control (archivo, o el último de un directorio);"
+                                                          " --algoritmo, --quantum, --limite y --max-terminados lo bifurcan")
+    parser.add_argument('--generar', type=int, metavar='N', help="usar una carga sintética de N procesos en lugar de un archivo")
+    parser.add_argument('--semilla', type=int, default=None, help="semilla de la carga sintética")
+    parser.add_argument('--llegadas', choices=LLEGADAS_SINTETICAS, default='poisson')
+    parser.add_argument('--distribucion', choices=DISTRIBUCIONES_SINTETICAS, default='exponencial')
+    parser.add_argument('--guardar-traza', metavar='RUTA', help="escribir la carga en una traza .csv/.jsonl y salir")
+    args = parser.parse_args(argv)
+    if sum(x is not None for x in (args.carga, args.generar, args.reanudar)) != 1:
+        parser.error("indique un archivo de carga, --generar N o --reanudar RUTA (solo uno)")
+    if args.tabla and (args.sin_linea_tiempo or args.flujo):
+        parser.error("--tabla necesita la línea de tiempo (sin --sin-linea-tiempo ni --flujo)")
+    if args.comparar and (args.barrido or args.flujo or args.reanudar):
+        parser.error("--comparar no se combina con --barrido, --flujo ni --reanudar")
+    if args.optimizar_quantum and (args.comparar or args.flujo or args.reanudar):
+        parser.error("--optimizar-quantum no se combina con --comparar, --flujo ni --reanudar")
+    if args.abierto and (args.barrido or args.comparar or args.optimizar_quantum or args.flujo or args.reanudar or args.tabla
+                         or args.exportar or args.puntos_control or args.guardar_traza or args.motor != 'eventos'):
+        parser.error("--abierto solo usa el motor por eventos y no se combina con --barrido, --comparar, --optimizar-quantum,"
+                     " --flujo, --reanudar, --tabla, --exportar, --puntos-control ni --guardar-traza")
+    if args.abierto and args.ventana is None:
+        parser.error("--abierto necesita --ventana T")
+    if args.reanudar:
+        cambios = {'algoritmo': args.algoritmo, 'quantum': args.quantum}
+        if args.limite is not None:
+            cambios['limite_slots'] = args.limite
+        if args.max_terminados is not None:
+            cambios['max_terminados'] = args.max_terminados
+        try:
+            resultado = cargar_punto_control(args.reanudar).reanudar(**cambios)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+        args.flujo = False
+        return _mostrar_resultado(resultado, args)
+    try:
+        dispositivos = _leer_dispositivos(args.dispositivos) if args.dispositivos else None
+        costos_so = leer_costos_so(args.costos_so) if args.costos_so else None
+        if args.abierto:
+            return _simular_abierto_cli(args, dispositivos, costos_so)
+        if args.generar is not None:
+            definiciones = generar_carga(args.generar, args.semilla, args.llegadas, distribucion=args.distribucion,
+                                         dispositivos=dispositivos, unidad=args.unidad or UNIDAD_TIEMPO)
+            config = {}
+        else:
+            definiciones, config = cargar_carga(args.carga, args.mmap)
+        dispositivos = dispositivos or config.get('dispositivos')
+        unidad = args.unidad or config.get('unidad')
+        if costos_so is None and config.get('costos_so'):
+            costos_so = CostosSO(**config['costos_so'])
+        if args.guardar_traza:
+            cantidad = escribir_traza(definiciones, args.guardar_traza)
+            print(f"Traza guardada en {args.guardar_traza} ({cantidad} procesos)")
+            return 0
+        cache = CacheResultados(directorio=args.cache) if args.cache else None
+        if args.optimizar_quantum:
+            quantums = [int(q) for q in args.barrido.split(',') if q.strip()] if args.barrido else None
+            informe = optimizar_quantum(definiciones, args.optimizar_quantum, quantums, nucleos=args.nucleos,
+                                        colas_por_nucleo=args.colas_por_nucleo, dispositivos=dispositivos, unidad=unidad,
+                                        costos_so=costos_so)
+            if args.formato == 'json':
+                json.dump(informe, sys.stdout, ensure_ascii=False)
+                print()
+            else:
+                imprimir_optimizacion(informe)
+            return 0
+        if args.barrido:
+            quantums = [int(q) for q in args.barrido.split(',') if q.strip()]
+            algoritmos = [a.strip().upper() for a in args.algoritmos.split(',') if a.strip()]
+            desconocidos = [a for a in algoritmos if a not in ALGORITMOS]
+            if desconocidos:
+                raise ValueError(f"Algoritmos desconocidos: {', '.join(desconocidos)}")
+            filas = barrido(definiciones, quantums, algoritmos, trabajadores=args.trabajadores, motor=args.motor,
+                            limite_slots=args.limite, nucleos=args.nucleos, colas_por_nucleo=args.colas_por_nucleo, cache=cache,
+                            dispositivos=dispositivos, unidad=unidad, costos_so=costos_so)
+            if args.formato == 'json':
+                json.dump(filas, sys.stdout, ensure_ascii=False)
+                print()
+            else:
+                imprimir_barrido(filas)
+            return 0
+        if args.comparar:
+            resultados = comparar(definiciones, leer_configuraciones(args.comparar), trabajadores=args.trabajadores,
+                                  motor=args.motor, limite_slots=args.limite, nucleos=args.nucleos,
+                                  colas_por_nucleo=args.colas_por_nucleo, dispositivos=dispositivos, unidad=unidad,
+                                  costos_so=costos_so)
+            if args.tabla:
+                vista_comparacion(resultados).escribir(args.tabla)
+            if args.formato == 'json':
+                json.dump(filas_comparacion(resultados), sys.stdout, ensure_ascii=False)
+                print()
+            else:
+                imprimir_comparacion(resultados)
+            return 0
+        algoritmo = args.algoritmo or config.get('algoritmo', 'FIFO')
+        quantum = args.quantum if args.quantum is not None else config.get('quantum', 0)
+        if args.flujo:
+            if args.motor != 'eventos':
+                raise ValueError("--flujo requiere el motor por eventos")
+            flujo = simular_flujo(algoritmo, definiciones, quantum, limite_slots=args.limite, max_terminados=args.max_terminados,
+                                  nucleos=args.nucleos, colas_por_nucleo=args.colas_por_nucleo,
+                                  capacidad_eventos=args.max_eventos or CAPACIDAD_EVENTOS_FLUJO, dispositivos=dispositivos,
+                                  unidad=unidad, perfil=PerfilSimulacion() if args.perfil else None, costos_so=costos_so)
+            for evento in flujo:
+                if args.formato == 'json':
+                    print(json.dumps(dict(zip(CAMPOS_EVENTO, evento)), ensure_ascii=False))
+                else:
+                    print(formatear_evento(evento))
+            resultado = flujo.resultado()
+        else:
+            resultado = simular(algoritmo, definiciones, quantum, motor=args.motor, limite_slots=args.limite,
+                                nucleos=args.nucleos, colas_por_nucleo=args.colas_por_nucleo, capacidad_eventos=args.max_eventos,
+                                guardar_linea_tiempo=not args.sin_linea_tiempo, max_terminados=args.max_terminados,
+                                cache=cache, puntos_control=args.puntos_control, cada_slots=args.cada, dispositivos=dispositivos,
+                                unidad=unidad, perfil=PerfilSimulacion() if args.perfil else None, costos_so=costos_so)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    return _mostrar_resultado(resultado, args)
+
+def _leer_dispositivos(texto):
+    # "disco=1,red=2" -> {'disco': 1, 'red': 2}; sin "=N" la capacidad es 1
+    dispositivos = {}
+    for parte in texto.split(','):
+        if parte.strip():
+            nombre, _, capacidad = parte.partition('=')
+            dispositivos[nombre.strip()] = int(capacidad) if capacidad.strip() else 1
+    return dispositivos
+
+def _simular_abierto_cli(args, dispositivos, costos_so):
+    import json, sys
+    errores = []
+    config = {}
+    if args.generar is not None:
+        llegadas = generar_carga(args.generar or None, args.semilla, args.llegadas, distribucion=args.distribucion,
+                                 dispositivos=dispositivos, unidad=args.unidad or UNIDAD_TIEMPO)
+    elif args.carga.lower().endswith(('.csv', '.jsonl', '.ndjson')):
+        # La traza se lee a medida que llegan sus procesos
+        llegadas = leer_traza(args.carga, usar_mmap=args.mmap, errores=errores)
+    else:
+        llegadas, config = cargar_carga_json(args.carga)
+    if costos_so is None and config.get('costos_so'):
+        costos_so = CostosSO(**config['costos_so'])
+    algoritmo = args.algoritmo or config.get('algoritmo', 'FIFO')
+    quantum = args.quantum if args.quantum is not None else config.get('quantum', 0)
+    resultado = simular_abierto(algoritmo, llegadas, quantum, ventana=args.ventana, calentamiento=args.calentamiento,
+                                nucleos=args.nucleos, colas_por_nucleo=args.colas_por_nucleo,
+                                dispositivos=dispositivos or config.get('dispositivos'),
+                                unidad=args.unidad or config.get('unidad') or UNIDAD_TIEMPO,
+                                capacidad_eventos=args.max_eventos or CAPACIDAD_EVENTOS_FLUJO,
+                                perfil=PerfilSimulacion() if args.perfil else None, costos_so=costos_so)
+    if errores:
+        print(f"ADVERTENCIA: se ignoraron {len(errores)} líneas inválidas de la traza (la primera: {errores[0]})", file=sys.stderr)
+    if resultado.perfil is not None:
+        print(resultado.perfil.texto(), file=sys.stderr)
+    if args.formato == 'json':
+        json.dump(resultado.a_dict(incluir_eventos=args.eventos), sys.stdout, ensure_ascii=False)
+        print()
+    else:
+        imprimir_abierto(resultado, args.eventos)
+    return 0
+
+def _mostrar_resultado(resultado, args):
+    import json, sys
+    if args.tabla:
+        if not resultado.linea_tiempo.filas:
+            print("ERROR: --tabla necesita la línea de tiempo (sin --sin-linea-tiempo ni --flujo)", file=sys.stderr)
+            return 1
+        try:
+            resultado.vista().escribir(args.tabla)
+        except OSError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+    if args.exportar:
+        if np is None:
+            print(f"ADVERTENCIA: NumPy no está instalado; se exporta en CSV al directorio {args.exportar}", file=sys.stderr)
+        try:
+            exportar_resultado(resultado, args.exportar)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+    if resultado.perfil is not None:
+        print(resultado.perfil.texto(), file=sys.stderr)
+    if args.formato == 'json':
+        # En flujo los eventos ya salieron, uno por línea
+        json.dump(resultado.a_dict(incluir_eventos=args.eventos and not args.flujo, incluir_linea_tiempo=not args.flujo),
+                  sys.stdout, ensure_ascii=False)
+        print()
+    else:
+        if args.flujo:
+            print()
+        imprimir_resultado(resultado, args.eventos and not args.flujo)
+    return 0
+
 if __name__ == "__main__":
-    menu_principal()
+    # Se delega en el módulo importado para que lo que se guarda con pickle
+    # (caché, puntos de control) nombre a `simulacion` y no a `__main__`
+    import simulacion
+    raise SystemExit(simulacion.main())
@@ -0,0 +1,326 @@
+import json
+import os
+import random
+
+import pytest
+
+import simulacion as s
+
+
+def carga_aleatoria(rng, maximo=4):
+    definiciones = []
+    for i in range(rng.randint(1, maximo)):
+        rafagas = []
+        for k in range(rng.randint(1, 6)):
+            if k % 2:
+                rafagas.append(('ES', rng.choice([10, 20, 30, 50, 80, 150])))
+            else:
+                rafagas.append(('CPU', rng.choice([10, 20, 30, 40, 70, 120])))
+        definiciones.append((f'P{i + 1}', rng.choice([0, 10, 20, 50, 110, 300]), rafagas, rng.randint(0, 3)))
+    return definiciones
+
+
+@pytest.mark.parametrize('semilla', range(4))
+def test_motores_equivalentes(semilla):
+    # El motor por eventos reproduce al de ticks slot a slot
+    rng = random.Random(semilla)
+    for _ in range(100):
+        carga = carga_aleatoria(rng)
+        algoritmo = rng.choice(['FIFO', 'RR'])
+        quantum = rng.choice([10, 20, 30, 50]) if algoritmo == 'RR' else 0
+        ticks = s.simular(algoritmo, carga, quantum, motor='ticks')
+        eventos = s.simular(algoritmo, carga, quantum, motor='eventos')
+        assert eventos.a_dict(incluir_linea_tiempo=True) == ticks.a_dict(incluir_linea_tiempo=True), (algoritmo, quantum, carga)
+
+
+@pytest.mark.parametrize('motor', ['ticks', 'eventos'])
+def test_metricas_terminan_con_la_corrida(motor):
+    # La línea de tiempo termina en el último evento: nada de columnas de relleno
+    carga = [('P1', 0, [('CPU', 30)]), ('P2', 0, [('CPU', 20)])]
+    r = s.simular('FIFO', carga, motor=motor)
+    assert r.metricas['tiempo_total'] == list(r.eventos.registros())[-1][0] == 60
+    # La CPU solo está libre en el slot del paso por el SO
+    assert r.metricas['cpu_ocupado'] == 50
+    assert r.metricas['utilizacion'] == pytest.approx(100 * 50 / 60)
+    assert r.metricas['throughput'] == pytest.approx(2 * 10 / 60)
+    assert r.metricas['mayor_intervalo_ocioso'] == 10
+
+
+def test_dispositivo_atiende_en_orden_de_llegada():
+    # P1 ocupa el único lugar del dispositivo de 20 a 50; P2 llega a 30 y espera
+    carga = [('P1', 0, [('CPU', 10), ('ES:d', 30), ('CPU', 10)]), ('P2', 0, [('CPU', 10), ('ES:d', 20), ('CPU', 10)])]
+    r = s.simular('FIFO', carga, dispositivos={'d': 1})
+    d = r.dispositivos['d']
+    assert (d['atendidos'], d['espera_max'], d['espera_media'], d['cola_max']) == (2, 20, 10, 1)
+    # Ocupado 30 + 20 de los 80 de la corrida
+    assert r.metricas['tiempo_total'] == 80
+    assert d['utilizacion'] == pytest.approx(100 * 50 / 80)
+    filas = r.a_dict(incluir_linea_tiempo=True)['linea_tiempo']['filas']
+    assert filas['BLOQ:d'] == filas['BLOQUEADOS'] == [[1, 2, 'P1'], [2, 4, 'P1, P2'], [4, 6, 'P2']]
+    # Con capacidad 2 nadie espera
+    d = s.simular('FIFO', carga, dispositivos={'d': 2}).dispositivos['d']
+    assert (d['espera_max'], d['cola_max']) == (0, 0)
+
+
+def test_cache_acierto_igual_a_simular(tmp_path):
+    carga = list(s.generar_carga(60, semilla=5))
+    directo = s.simular('RR', carga, 20).a_dict(incluir_linea_tiempo=True)
+    cache = s.CacheResultados(directorio=str(tmp_path))
+    primero = s.simular('RR', carga, 20, cache=cache)
+    assert s.simular('RR', carga, 20, cache=cache) is primero
+    # Otro proceso con el mismo directorio lo lee del disco
+    otra = s.CacheResultados(directorio=str(tmp_path))
+    leido = s.simular('RR', carga, 20, cache=otra)
+    assert (cache.fallos, cache.aciertos, otra.aciertos_disco) == (1, 1, 1)
+    assert primero.a_dict(incluir_linea_tiempo=True) == leido.a_dict(incluir_linea_tiempo=True) == directo
+
+
+def test_cache_desaloja_el_usado_hace_mas_tiempo():
+    cache = s.CacheResultados(capacidad=2)
+    cargas = {nombre: [(nombre, 0, [('CPU', 10 * (i + 1))])] for i, nombre in enumerate('ABC')}
+    for nombre in 'ABACA':
+        s.simular('FIFO', cargas[nombre], cache=cache)
+    # C desalojó a B, no a A, que se había vuelto a usar
+    assert (cache.fallos, cache.aciertos) == (3, 2)
+    s.simular('FIFO', cargas['B'], cache=cache)
+    assert (cache.fallos, cache.aciertos) == (4, 2)
+
+
+def test_cache_en_disco_respeta_max_bytes(tmp_path):
+    cache = s.CacheResultados(capacidad=0, directorio=str(tmp_path), max_bytes=2500)
+    cache.guardar('a', b'x' * 1000)
+    cache.guardar('b', b'x' * 1000)
+    os.utime(tmp_path / 'a.pkl', (1000, 1000))
+    os.utime(tmp_path / 'b.pkl', (2000, 2000))
+    # Leer 'a' la vuelve la más reciente: al pasarse del límite sale 'b'
+    assert cache.obtener('a') == b'x' * 1000
+    cache.guardar('c', b'x' * 1000)
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'c.pkl']
+    # Un resultado que solo no entra ni se escribe
+    cache.guardar('d', b'x' * 3000)
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'c.pkl']
+
+
+def test_cache_cambio_de_version_invalida(tmp_path, monkeypatch):
+    carga = list(s.generar_carga(20, semilla=5))
+    s.simular('RR', carga, 20, cache=s.CacheResultados(directorio=str(tmp_path)))
+    monkeypatch.setattr(s, 'VERSION_CACHE', s.VERSION_CACHE + 1)
+    cache = s.CacheResultados(directorio=str(tmp_path))
+    s.simular('RR', carga, 20, cache=cache)
+    assert (cache.fallos, cache.aciertos_disco) == (1, 0)
+
+
+def despachos(resultado):
+    return [proceso for _, proceso, _, hacia, _, _ in resultado.eventos.registros() if hacia == 'EJECUCIÓN']
+
+
+@pytest.mark.parametrize('algoritmo', ['SJF', 'SRTF', 'PRIORIDAD', 'PRIORIDAD_EXP'])
+def test_politicas_heap_eligen_menor_clave(algoritmo):
+    # Los tres quedan listos juntos: P3 tiene la ráfaga más corta y la mejor prioridad
+    carga = [('P1', 0, [('CPU', 50)], 2), ('P2', 10, [('CPU', 30)], 1), ('P3', 10, [('CPU', 10)], 0)]
+    assert despachos(s.simular(algoritmo, carga)) == ['P3', 'P2', 'P1']
+
+
+@pytest.mark.parametrize('algoritmo, expropia', [('SJF', False), ('SRTF', True), ('PRIORIDAD', False),
+                                                 ('PRIORIDAD_EXP', True)])
+def test_politicas_heap_expropiacion(algoritmo, expropia):
+    # P2 queda listo con P1 ejecutando y 30 de ráfaga restante
+    carga = [('P1', 0, [('CPU', 50)], 2), ('P2', 30, [('CPU', 10)], 0)]
+    r = s.simular(algoritmo, carga, acumular=True)
+    assert despachos(r) == (['P1', 'P2', 'P1'] if expropia else ['P1', 'P2'])
+    assert r.resumen['expropiaciones'] == int(expropia)
+    # Con la misma ráfaga restante SRTF no expropia
+    carga = [('P1', 0, [('CPU', 50)], 0), ('P2', 30, [('CPU', 30)], 0)]
+    assert despachos(s.simular(algoritmo, carga)) == ['P1', 'P2']
+
+
+def test_puntos_control_no_usan_cache(tmp_path):
+    carga = list(s.generar_carga(50, semilla=1))
+    cache = s.CacheResultados()
+    s.simular('RR', carga, 20, cache=cache)
+    s.simular('RR', carga, 20, cache=cache, puntos_control=str(tmp_path), cada_slots=100)
+    assert s.listar_puntos_control(str(tmp_path))
+
+
+@pytest.mark.parametrize('opciones', [{}, {'nucleos': 2}, {'nucleos': 3, 'colas_por_nucleo': True}, {'unidad': 5},
+                                      {'costos_so': s.CostosSO(10, 10, 10)}])
+@pytest.mark.parametrize('carga', [list(s.generar_carga(300, semilla=3, dispositivos=['d'])),
+                                   [('P1', 0, [('CPU', 30), ('ES:d', 20), ('CPU', 10)]), ('P2', 10, [('CPU', 20)])]],
+                         ids=['larga', 'corta'])
+def test_cola_listos_acumulada_igual_a_linea_tiempo(opciones, carga):
+    # El acumulador mide la cola de listos igual que la fila LISTO, y el
+    # tiempo total, la utilización y el throughput igual que la línea de tiempo
+    for algoritmo in s.ALGORITMOS:
+        r = s.simular(algoritmo, carga, 20, acumular=True, dispositivos={'d': 1}, **opciones)
+        sin_linea = s.simular(algoritmo, carga, 20, acumular=True, guardar_linea_tiempo=False, dispositivos={'d': 1}, **opciones)
+        for resumen in (r.resumen, sin_linea.resumen):
+            assert resumen['cola_listos_media'] == pytest.approx(r.metricas['cola_listos_media']), algoritmo
+            assert resumen['cola_listos_max'] == r.metricas['cola_listos_max'], algoritmo
+            assert resumen['tiempo_total'] == r.metricas['tiempo_total'], algoritmo
+            assert resumen['utilizacion'] == pytest.approx(r.metricas['utilizacion']), algoritmo
+            assert resumen['throughput'] == pytest.approx(r.metricas['throughput']), algoritmo
+    if len(carga) == 2:
+        assert r.metricas['tiempo_total'] < s.MIN_TIEMPO_TABLA
+
+
+def test_unidad_no_depende_del_quantum():
+    # El slot sale solo de la carga; un quantum que no cae en él se rechaza
+    carga = [('A', 0, [('CPU', 40)], 0), ('B', 10, [('CPU', 30)], 0), ('C', 20, [('CPU', 50)], 0)]
+    assert s.simular('RR', carga, 20).unidad == 10
+    with pytest.raises(ValueError):
+        s.simular('RR', carga, 15)
+    with pytest.raises(ValueError):
+        s.barrido(carga, [10, 15])
+    assert s.simular('RR', carga, 15, unidad=5).unidad == 5
+
+
+def test_unidad_uno_sin_relleno():
+    # Con slots de 1 la línea de tiempo termina igual en el último evento
+    r = s.simular('FIFO', [('P1', 0, [('CPU', 3)]), ('P2', 0, [('CPU', 2)])])
+    assert r.unidad == 1
+    assert r.metricas['tiempo_total'] == 6
+    assert r.metricas['utilizacion'] == pytest.approx(100 * 5 / 6)
+
+
+@pytest.mark.parametrize('algoritmo', s.ALGORITMOS_CON_QUANTUM)
+def test_quantum_cero_se_rechaza(algoritmo, tmp_path):
+    carga = list(s.generar_carga(20, semilla=1))
+    with pytest.raises(ValueError):
+        s.simular(algoritmo, carga, 0)
+    with pytest.raises(ValueError):
+        s.comparar(carga, [(algoritmo, 0)], trabajadores=1)
+    # Los demás algoritmos ignoran el quantum
+    assert s.simular('FIFO', carga, 0).quantum == 0
+    s.simular(algoritmo, carga, 20, puntos_control=str(tmp_path), cada_slots=20)
+    punto = s.cargar_punto_control(s.listar_puntos_control(str(tmp_path))[0])
+    with pytest.raises(ValueError):
+        punto.bifurcar([{'quantum': 0}])
+    with pytest.raises(ValueError):
+        punto.bifurcar([{'algoritmo': 'FIFO'}, {'algoritmo': algoritmo, 'quantum': 0}])
+
+
+@pytest.mark.parametrize('algoritmo', ['RR', 'MLFQ'])
+def test_cambiar_quantum_igual_a_corrida_con_ese_quantum(algoritmo):
+    # Hasta la primera porción agotada, cambiar el quantum equivale a haber
+    # corrido con el nuevo desde el principio
+    carga = list(s.generar_carga(60, semilla=4))
+    tabla = s._crear_tabla(algoritmo, carga, 10, 'eventos', None, 1, False, None, False, True, None)
+    tabla.preparar_ejecucion()
+    motor = tabla.motor_eventos(algoritmo)
+    pasos = motor.pasos()
+    while not motor.agotara_quantum():
+        next(pasos)
+    motor.cambiar_quantum(40)
+    for _ in pasos:
+        pass
+    cambiado = s.ResultadoSimulacion(tabla, motor.motivo_fin).a_dict(incluir_linea_tiempo=True)
+    directo = s.simular(algoritmo, carga, 40).a_dict(incluir_linea_tiempo=True)
+    # Los despachos anteriores al cambio anotan el quantum viejo en la bitácora
+    del cambiado['eventos'], directo['eventos']
+    assert cambiado == directo
+
+
+def test_motor_ticks_rechaza_costos_so():
+    carga = list(s.generar_carga(10, semilla=1))
+    with pytest.raises(ValueError):
+        s.simular('RR', carga, 20, motor='ticks', costos_so=s.CostosSO(10))
+    # También si el costo se fija en la tabla sin pasar por simular
+    tabla = s._crear_tabla('RR', carga, 20, 'ticks', None, 1, False, None, False, True, None)
+    tabla.costos_so = s.CostosSO(10)
+    with pytest.raises(ValueError):
+        tabla.ejecutar()
+
+
+def test_flujo_igual_a_simular():
+    carga = list(s.generar_carga(300, semilla=3))
+    for algoritmo in s.ALGORITMOS:
+        completa = s.simular(algoritmo, carga, 20, acumular=True)
+        flujo = s.simular_flujo(algoritmo, carga, 20, capacidad_eventos=None)
+        assert list(flujo) == list(completa.eventos.registros())
+        assert flujo.resultado().metricas == completa.resumen
+
+
+@pytest.mark.parametrize('algoritmo', s.ALGORITMOS)
+def test_reanudar_igual_a_corrida_completa(algoritmo, tmp_path):
+    carga = list(s.generar_carga(150, semilla=7, dispositivos=['d']))
+    opciones = {'nucleos': 2, 'dispositivos': {'d': 1}}
+    completa = s.simular(algoritmo, carga, 20, **opciones)
+    s.simular(algoritmo, carga, 20, puntos_control=str(tmp_path), cada_slots=150, **opciones)
+    rutas = s.listar_puntos_control(str(tmp_path))
+    assert len(rutas) > 2
+    for ruta in rutas[:-1]:
+        reanudada = s.cargar_punto_control(ruta).reanudar()
+        assert reanudada.a_dict(incluir_linea_tiempo=True) == completa.a_dict(incluir_linea_tiempo=True)
+
+
+@pytest.mark.parametrize('objetivo', s.OBJETIVOS_QUANTUM)
+def test_optimizar_quantum_igual_a_fuerza_bruta(objetivo):
+    rng = random.Random(1)
+    for _ in range(8):
+        carga = list(s.generar_carga(rng.randint(1, 60), semilla=rng.randint(0, 10 ** 6)))
+        informe = s.optimizar_quantum(carga, objetivo)
+        valores = {}
+        for punto in informe['curva']:
+            r = s.simular('RR', carga, punto['quantum'], acumular=True, capacidad_eventos=1)
+            if objetivo == 'retorno_medio':
+                valores[punto['quantum']] = r.metricas['retorno_medio']
+            elif objetivo == 'cambios_contexto':
+                valores[punto['quantum']] = r.resumen['cambios_contexto']
+            else:
+                valores[punto['quantum']] = s._percentil_exacto([e['respuesta'] for e in r.estadisticas()], 0.95)
+            if punto['podado']:
+                assert valores[punto['quantum']] >= punto['cota'] - 1e-9
+            else:
+                assert valores[punto['quantum']] == pytest.approx(punto['valor'])
+        assert informe['mejor_valor'] == pytest.approx(min(valores.values()))
+
+
+def test_abierto_memoria_acotada_por_procesos_en_sistema():
+    import gc
+    vivos = []
+
+    def llegadas():
+        # Tasa estable (la CPU queda a la mitad); se cuentan los Proceso vivos
+        for i, definicion in enumerate(s.generar_carga(None, semilla=3, media_llegada=150)):
+            if i % 100 == 0:
+                gc.collect()
+                vivos.append(sum(isinstance(o, s.Proceso) for o in gc.get_objects()))
+            yield definicion
+
+    m = s.simular_abierto('RR', llegadas(), 20, ventana=300000).metricas
+    assert m['en_sistema_final'] > 0
+    assert m['procesos_creados'] - m['terminados'] == m['en_sistema_final']
+    assert m['procesos_creados'] > 1000
+    # Solo los que están en el sistema y la próxima llegada
+    assert max(vivos) <= m['en_sistema_max'] + 2
+    # Con calentamiento las métricas cubren solo la ventana
+    m = s.simular_abierto('RR', s.generar_carga(None, semilla=3, media_llegada=150), 20, ventana=280000,
+                          calentamiento=20000).metricas
+    assert m['retorno']['n'] == m['terminados']
+    assert m['llegadas'] < m['procesos_creados']
+
+
+def test_exportar_y_cargar_csv(tmp_path):
+    carga = list(s.generar_carga(80, semilla=2, dispositivos=['d']))
+    for opciones in ({'nucleos': 2}, {'capacidad_eventos': 37}, {'acumular': True}):
+        r = s.simular('RR', carga, 20, dispositivos={'d': 1}, **opciones)
+        ruta = str(tmp_path / f"r{len(os.listdir(tmp_path))}")
+        s.exportar_resultado(r, ruta, 'csv')
+        cargado = s.cargar_resultado(ruta)
+        assert json.loads(json.dumps(cargado.a_dict())) == json.loads(json.dumps(r.a_dict()))
+        assert list(cargado.eventos()) == list(r.eventos.registros())
+
+
+def test_exportar_y_cargar_npz(tmp_path):
+    np = pytest.importorskip('numpy')
+    carga = list(s.generar_carga(80, semilla=2, dispositivos=['d']))
+    for i, opciones in enumerate(({'nucleos': 2}, {'capacidad_eventos': 37}, {'acumular': True})):
+        r = s.simular('RR', carga, 20, dispositivos={'d': 1}, **opciones)
+        ruta = str(tmp_path / f"r{i}.npz")
+        s.exportar_resultado(r, ruta, 'npz')
+        cargado = s.cargar_resultado(ruta)
+        assert cargado.formato == 'npz'
+        # Las columnas son vistas sobre el archivo mapeado, no copias
+        assert not cargado.tablas['eventos']['tiempo'].flags.owndata
+        assert json.loads(json.dumps(cargado.a_dict())) == json.loads(json.dumps(r.a_dict()))
+        assert list(cargado.eventos()) == list(r.eventos.registros())